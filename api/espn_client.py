@@ -0,0 +1,341 @@
+"""Async ESPN and Odds API client.
+
+All upstream calls share one pooled httpx client: keep-alive connections,
+HTTP/2 when the h2 package is installed, per-host concurrency limits and
+uniform timeouts, so score refreshes never block the event loop or tie up
+the default thread pool.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from scoreboard_stream import STREAM_PARSE_AVAILABLE, ScoreboardParser
+from records import ParsedGolfer
+from scoring import parse_score
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ESPN_BASE = "https://site.api.espn.com/apis/site/v2/sports/golf/pga"
+ODDS_API_BASE = "https://api.the-odds-api.com/v4"
+
+def stream_parse_enabled() -> bool:
+    """Parse scoreboards as they stream in (needs ijson); ESPN_STREAM_PARSE=0 decodes
+    whole bodies instead. Read per request, as api/.env is loaded after import."""
+    return STREAM_PARSE_AVAILABLE and os.environ.get("ESPN_STREAM_PARSE", "1") != "0"
+
+# Concurrent in-flight requests allowed per upstream host
+HOST_CONCURRENCY = {"site.api.espn.com": 8, "api.the-odds-api.com": 2}
+DEFAULT_HOST_CONCURRENCY = 4
+
+# Season scans tried when neither the event's start date nor its id finds it
+FALLBACK_YEARS = (2026, 2025)
+
+# Scoreboard query that last found each ESPN event id; server.py persists these
+# as tournaments.espn_query so cold processes skip the fallbacks too
+resolved_queries: Dict[str, Dict[str, str]] = {}
+
+
+class UpstreamClient:
+    def __init__(self, timeout: float = 15, connect_timeout: float = 5):
+        self.http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60),
+            headers={"Accept": "application/json", "Accept-Encoding": "gzip, deflate"},
+        )
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).hostname or ""
+        sem = self._host_limits.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY))
+            self._host_limits[host] = sem
+        return sem
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        async with self._host_limit(url):
+            return await self.http_client.get(url, params=params)
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET and decode JSON. Non-2xx bodies are returned as-is, since ESPN and
+        the Odds API both report errors in the JSON payload."""
+        response = await self.get(url, params=params)
+        return response.json()
+
+    async def stream(self, url: str, params: Optional[Dict[str, Any]], consume: Callable[[bytes], None]) -> int:
+        """GET and hand each decoded body chunk to ``consume`` as it arrives. Returns the status code."""
+        async with self._host_limit(url):
+            async with self.http_client.stream("GET", url, params=params) as response:
+                async for chunk in response.aiter_bytes():
+                    consume(chunk)
+                return response.status_code
+
+    async def close(self):
+        await self.http_client.aclose()
+
+
+upstream = UpstreamClient()
+
+# ── ESPN Helpers ──
+async def espn_get_events(year=None):
+    try:
+        url = f"{ESPN_BASE}/scoreboard"
+        params = {}
+        if year:
+            params['dates'] = str(year)
+        data = await upstream.get_json(url, params=params)
+        result = []
+        for ev in data.get('events', []):
+            comps = ev.get('competitions', [{}])
+            comp = comps[0] if comps else {}
+            result.append({
+                'espn_id': ev.get('id', ''),
+                'name': ev.get('name', ''),
+                'short_name': ev.get('shortName', ''),
+                'date': ev.get('date', ''),
+                'end_date': ev.get('endDate', ev.get('date', '')),
+                'status': ev.get('status', {}).get('type', {}).get('name', ''),
+                'state': ev.get('status', {}).get('type', {}).get('state', ''),
+                'competitor_count': len(comp.get('competitors', []))
+            })
+        return result
+    except Exception as e:
+        logger.error(f"ESPN events: {e}")
+        return []
+
+async def espn_get_scoreboard(params, event_id=None):
+    """Fetch a scoreboard. When streaming, only event headers and ``event_id``'s
+    competitors (with the fields espn_get_field reads) are kept."""
+    url = f"{ESPN_BASE}/scoreboard"
+    if not stream_parse_enabled():
+        return await upstream.get_json(url, params=params)
+    parser = ScoreboardParser(event_id)
+    await upstream.stream(url, params, parser.feed)
+    return parser.close()
+
+def find_event(data, event_id):
+    for e in data.get('events', []):
+        if str(e.get('id','')) == str(event_id):
+            return e
+    return None
+
+def event_queries(event_id, event_date=None):
+    """Scoreboard queries that may list the event: the primary one (by start date
+    for correct season lookup, else by event id) and the fallbacks."""
+    primary = {'event': str(event_id)}
+    if event_date:
+        try:
+            dt = datetime.fromisoformat(str(event_date).replace('Z','+00:00'))
+            primary = {'dates': dt.strftime('%Y%m%d')}
+        except Exception:
+            pass
+    fallbacks = [{'event': str(event_id)}] if 'dates' in primary else []
+    fallbacks += [{'dates': str(year)} for year in FALLBACK_YEARS]
+    return primary, fallbacks
+
+async def resolve_event(event_id, event_date=None, query=None):
+    """Find an event on the scoreboard. Returns (event or None, scoreboard data, query).
+
+    The query learned earlier in this process (else the persisted ``query``) is
+    tried first, so a known event costs one upstream call. Otherwise the primary query runs, then
+    all fallbacks concurrently, preferring them in order. The query that found
+    the event is remembered in resolved_queries."""
+    event_id = str(event_id)
+    primary, fallbacks = event_queries(event_id, event_date)
+    known = resolved_queries.get(event_id) or (query if isinstance(query, dict) else None)
+    data = None
+    for q in ([known] if known else []) + ([primary] if primary != known else []):
+        result = await espn_get_scoreboard(q, event_id)
+        if data is None or q is primary:
+            data = result
+        ev = find_event(result, event_id)
+        if ev:
+            resolved_queries[event_id] = q
+            return ev, result, q
+    fallbacks = [q for q in fallbacks if q != known]
+    results = await asyncio.gather(*(espn_get_scoreboard(q, event_id) for q in fallbacks), return_exceptions=True)
+    for q, result in zip(fallbacks, results):
+        if isinstance(result, Exception):
+            logger.warning(f"ESPN scoreboard {q}: {result}")
+            continue
+        ev = find_event(result, event_id)
+        if ev:
+            resolved_queries[event_id] = q
+            return ev, result, q
+    return None, data, None
+
+async def espn_get_field(event_id, event_date=None, query=None):
+    try:
+        ev, data, _ = await resolve_event(event_id, event_date, query)
+        if not ev:
+            return [], data if data else {}
+        comps = ev.get('competitions', [])
+        if not comps:
+            return [], data
+        comp = comps[0]
+        def is_real_ls(ls):
+            # A linescore has real data if it has a non-dash display value,
+            # a non-zero stroke count, or nested hole-by-hole data.
+            # ESPN adds placeholder stubs (displayValue="-", value=0, no holes)
+            # for WD players' unplayed rounds — we exclude those from the round list.
+            return (
+                ls.get('displayValue', '-') != '-'
+                or (ls.get('value') or 0.0) > 0
+                or bool(ls.get('linescores'))
+            )
+
+        golfers = []
+        for c in comp.get('competitors', []):
+            ath = c.get('athlete', {})
+            all_ls = c.get('linescores', [])
+            real_ls = [ls for ls in all_ls if is_real_ls(ls)]
+            has_placeholder_rounds = len(all_ls) > len(real_ls) and len(real_ls) > 0
+            rounds = []
+            for ls in real_ls:
+                rounds.append({
+                    'round': ls.get('period', 0),
+                    'score': ls.get('displayValue', ''),
+                    'strokes': ls.get('value', None)
+                })
+            score_str = str(c.get('score', ''))
+            # Text-based detection: check if WD/CUT words appear in any ESPN field.
+            status_obj = c.get('status', {})
+            status_name = ''
+            status_desc = ''
+            status_short = ''
+            if isinstance(status_obj, dict):
+                type_obj = status_obj.get('type', {})
+                if isinstance(type_obj, dict):
+                    status_name = str(type_obj.get('name', ''))
+                    status_desc = str(type_obj.get('description', ''))
+                    status_short = str(type_obj.get('shortDetail', ''))
+            linescore_text = ' '.join(str(ls.get('displayValue', '')) for ls in all_ls)
+            combined_text = f"{score_str} {status_name} {status_desc} {status_short} {linescore_text}".upper()
+            is_cut_by_text = 'CUT' in combined_text
+            is_wd_by_text = any(w in combined_text for w in ('WD', 'WITHDREW', 'WITHDRAW'))
+            is_cut = is_cut_by_text or is_wd_by_text
+            is_wd = is_wd_by_text
+
+            # Derive thru and is_active from nested hole-by-hole linescores.
+            # ESPN's scoreboard API does not return a status.thru field.
+            thru_val = ''
+            is_active_val = False
+            if real_ls:
+                last_round = real_ls[-1]
+                nested_holes = last_round.get('linescores', [])
+                holes_played = len(nested_holes)
+                if holes_played >= 18:
+                    thru_val = 'F'
+                elif holes_played > 0:
+                    thru_val = str(holes_played)
+                    is_active_val = True  # mid-round
+                elif last_round.get('displayValue', '-') != '-':
+                    # Has a round score but no hole-by-hole data — treat as finished
+                    thru_val = 'F'
+
+            golfers.append(ParsedGolfer(
+                espn_id=str(ath.get('id', c.get('id', ''))),
+                name=ath.get('fullName', ath.get('displayName', '')),
+                short_name=ath.get('shortName', ''),
+                order=c.get('order', 999),
+                score=score_str,
+                score_int=parse_score(score_str),
+                rounds=rounds,
+                is_cut=is_cut,
+                is_wd=is_wd,
+                has_placeholder_rounds=has_placeholder_rounds,
+                status=c.get('status', {}).get('type', {}).get('name', '') if isinstance(c.get('status'), dict) else '',
+                thru=thru_val,
+                is_active=is_active_val,
+            ))
+
+        # Second pass: Detect cuts/WDs by round count and inferred cut line.
+        # Count only "real" rounds (placeholders already stripped above).
+        # If the tournament has progressed to R3+:
+        #   - Infer the cut line from R3 players' R1+R2 stroke totals: the worst 2-round
+        #     score that still made R3 IS the cut line. Any 2-round player who scored worse
+        #     (more strokes) missed the cut. This is robust regardless of which players
+        #     have finished R3 so far (avoids fragility in order-based approaches).
+        #   - Players with exactly 2 real rounds and no placeholder rounds → CUT (missed cut)
+        #   - Players more than one round behind the leader with placeholders → WD
+        #     (being exactly one round behind just means they haven't teed off yet in the current round)
+        if golfers:
+            round_counts = {}
+            for g in golfers:
+                rc = len(g.rounds)
+                round_counts[rc] = round_counts.get(rc, 0) + 1
+
+            max_rounds = max(round_counts.keys()) if round_counts else 0
+
+            if max_rounds >= 3:
+                # Infer cut line: worst R1+R2 stroke total among players who made it to R3.
+                # Cuts are inclusive of ties, so strictly greater than this = missed cut.
+                cut_line_strokes = None
+                for g in golfers:
+                    if len(g.rounds) >= 3:
+                        r1r2 = sum((r.get('strokes') or 0) for r in g.rounds[:2])
+                        if r1r2 > 0:
+                            if cut_line_strokes is None or r1r2 > cut_line_strokes:
+                                cut_line_strokes = r1r2
+
+                for g in golfers:
+                    if not g.is_cut and len(g.rounds) < max_rounds:
+                        rounds_behind = max_rounds - len(g.rounds)
+                        if cut_line_strokes and len(g.rounds) == 2:
+                            r1r2 = sum((r.get('strokes') or 0) for r in g.rounds[:2])
+                            if r1r2 > 0 and r1r2 > cut_line_strokes:
+                                # Worse than worst qualifier → missed cut
+                                g.is_cut = True
+                        if not g.is_cut:
+                            if g.has_placeholder_rounds and rounds_behind > 1:
+                                # More than one full round behind with placeholders → WD
+                                # (exactly one round behind = just waiting to tee off in current round)
+                                g.is_wd = True
+                                g.is_cut = True
+                            elif len(g.rounds) == 2 and not g.has_placeholder_rounds:
+                                # Standard missed cut (exactly 2 rounds, no placeholders)
+                                g.is_cut = True
+        
+        return golfers, data
+    except Exception as e:
+        logger.error(f"ESPN field: {e}")
+        return [], {}
+
+# ── Odds Helper ──
+async def fetch_odds_api(sport_key):
+    api_key = os.environ.get('ODDS_API_KEY', '')
+    if not api_key:
+        return None, "ODDS_API_KEY not configured. Sign up free at https://the-odds-api.com"
+    try:
+        url = f"{ODDS_API_BASE}/sports/{sport_key}/odds/"
+        params = {'apiKey': api_key, 'regions': 'us', 'markets': 'outrights', 'oddsFormat': 'decimal'}
+        data = await upstream.get_json(url, params=params)
+        if isinstance(data, dict) and data.get('message'):
+            return None, data['message']
+        golfer_odds = {}
+        items = data if isinstance(data, list) else [data]
+        for item in items:
+            for bm in item.get('bookmakers', []):
+                for mkt in bm.get('markets', []):
+                    if mkt.get('key') == 'outrights':
+                        for out in mkt.get('outcomes', []):
+                            name = out['name']
+                            price = out.get('price', 999)
+                            if name not in golfer_odds or price < golfer_odds[name]:
+                                golfer_odds[name] = price
+        return golfer_odds, None
+    except Exception as e:
+        logger.error(f"Odds API: {e}")
+        return None, str(e)
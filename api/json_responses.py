@@ -0,0 +1,172 @@
+"""JSON response helpers for endpoints that serve pre-encoded bodies.
+
+Read endpoints that clients poll attach a weak ETag derived from the data
+versions they were rendered from, answer matching If-None-Match requests
+with 304, and send Cache-Control suited to Vercel's edge cache
+(s-maxage + stale-while-revalidate; browsers always revalidate).
+
+Bodies are encoded with orjson when it is installed (FAST_JSON=0 falls back
+to the stdlib). Either way the output is compact UTF-8 JSON with the same
+structure; only float formatting details may differ.
+
+Bodies of at least COMPRESS_MIN_BYTES are sent brotli- (when the brotli
+package is installed) or gzip-compressed, as the client's Accept-Encoding
+allows. Callers serving the same body repeatedly pass a dict to keep the
+compressed bytes per encoding.
+"""
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Edge cache lifetimes (seconds) per kind of content
+LIVE_CACHE_CONTROL = "public, max-age=0, s-maxage=15, stale-while-revalidate=45"
+LIST_CACHE_CONTROL = "public, max-age=0, s-maxage=30, stale-while-revalidate=120"
+FINAL_CACHE_CONTROL = "public, max-age=0, s-maxage=300, stale-while-revalidate=3600"
+
+
+def fast_json_enabled() -> bool:
+    """orjson is installed and FAST_JSON isn't "0" (read per call: api/.env loads after import)."""
+    return orjson is not None and os.environ.get("FAST_JSON", "1").strip() != "0"
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode plain JSON data (dicts, lists, strings, numbers, bools, None) as
+    compact UTF-8, like FastAPI's JSONResponse; dict keys that aren't strings
+    are stringified."""
+    if fast_json_enabled():
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered through encode_json."""
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the versions a response was rendered from."""
+    digest = hashlib.sha1(json.dumps(parts, default=str, separators=(",", ":")).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def accepted_encoding(request: Optional[Request]) -> Optional[str]:
+    """The compression to use for ``request``: br, gzip or None."""
+    header = request.headers.get("accept-encoding", "") if request is not None else ""
+    if not header:
+        return None
+    weights = {}
+    for part in header.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip()] = q
+    best, best_q = None, 0.0
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress_min_bytes() -> int:
+    """Smaller bodies go out as they are: the header and CPU overhead isn't worth it."""
+    return int(os.environ.get("COMPRESS_MIN_BYTES", "1024"))
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _cache_headers(etag: Optional[str], cache_control: Optional[str], vary: bool = False):
+    headers = {}
+    if etag:
+        headers["ETag"] = etag
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if vary:
+        headers["Vary"] = "Accept-Encoding"
+    return headers
+
+
+def not_modified(etag: str, cache_control: Optional[str] = None, vary: bool = True) -> Response:
+    return Response(status_code=304, headers=_cache_headers(etag, cache_control, vary))
+
+
+def json_bytes_response(body: bytes, status_code: int = 200, etag: Optional[str] = None,
+                        cache_control: Optional[str] = None, request: Optional[Request] = None,
+                        compressed: Optional[Dict[str, bytes]] = None) -> Response:
+    """Serve an encoded JSON body, compressed when ``request`` accepts it and
+    the body is large enough. ``compressed`` caches the bytes per encoding."""
+    headers = _cache_headers(etag, cache_control, vary=request is not None)
+    encoding = accepted_encoding(request) if len(body) >= compress_min_bytes() else None
+    if encoding:
+        data = compressed.get(encoding) if compressed is not None else None
+        if data is None:
+            data = compress(body, encoding)
+            if compressed is not None:
+                compressed[encoding] = data
+        headers["Content-Encoding"] = encoding
+        body = data
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def plain_json_response(content: Any, status_code: int = 200, request: Optional[Request] = None) -> Response:
+    """Serve data that is already plain JSON (e.g. database rows) without
+    FastAPI's jsonable_encoder pass over it."""
+    return json_bytes_response(encode_json(content), status_code=status_code, request=request)
+
+
+def conditional_json_response(request: Request, body: bytes, etag: Optional[str] = None,
+                              cache_control: Optional[str] = None) -> Response:
+    """Serve ``body`` or a 304; without an explicit ETag one is derived from the body."""
+    if etag is None:
+        etag = make_etag(hashlib.sha1(body).hexdigest())
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    return json_bytes_response(body, etag=etag, cache_control=cache_control, request=request)
@@ -0,0 +1,192 @@
+"""Server-Sent Events fan-out for live leaderboards.
+
+One in-process broadcaster keeps, per tournament, the last published
+leaderboard state, a bounded history of delta events and the set of
+subscriber queues. Each published leaderboard is diffed against the
+previous one and only changed golfer rows and team standings are sent.
+Events are encoded once and shared by every subscriber.
+
+Event ids are "<epoch>-<seq>"; a reconnect whose Last-Event-ID is still in
+the history replays the missed deltas, anything else (unknown epoch after a
+restart, or too far behind) gets a full snapshot.
+"""
+import asyncio
+import json
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+HEARTBEAT_SECONDS = 15
+RETRY_MS = 5000
+HISTORY_SIZE = 256
+QUEUE_SIZE = 64
+
+
+def _golfer_key(row: Dict[str, Any]) -> str:
+    return str(row.get("espn_id") or row.get("name", ""))
+
+
+def format_event(event_id: Optional[str], event: str, data: Any) -> bytes:
+    """One SSE event; ``data`` is a JSON-able value or an already encoded compact JSON body."""
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    if isinstance(data, bytes):
+        lines.append("data: " + data.decode("utf-8"))
+    else:
+        lines.append("data: " + json.dumps(data, separators=(",", ":"), default=str))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+HEARTBEAT = b": ping\n\n"
+RETRY = f"retry: {RETRY_MS}\n\n".encode()
+
+
+class Subscription:
+    def __init__(self, tournament_id: str):
+        self.tournament_id = tournament_id
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=QUEUE_SIZE)
+        # Set when the subscriber fell behind and dropped events; it must resync
+        self.overflowed = False
+
+    def push(self, frame: bytes):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def drain(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.overflowed = False
+
+
+class _Channel:
+    def __init__(self):
+        self.seq = 0
+        self.history: Deque[Tuple[int, bytes]] = deque(maxlen=HISTORY_SIZE)
+        self.subscribers: Set[Subscription] = set()
+        self.golfers: Optional[Dict[str, str]] = None
+        self.teams: Dict[str, str] = {}
+        self.top25: str = ""
+
+
+class LeaderboardBroadcaster:
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._channels: Dict[str, _Channel] = {}
+        self.published = 0
+        self.frames_sent = 0
+
+    def _channel(self, tournament_id: str) -> _Channel:
+        channel = self._channels.get(tournament_id)
+        if channel is None:
+            channel = self._channels[tournament_id] = _Channel()
+        return channel
+
+    def event_id(self, tournament_id: str) -> str:
+        return f"{self.epoch}-{self._channel(tournament_id).seq}"
+
+    def has_subscribers(self, tournament_id: str) -> bool:
+        channel = self._channels.get(tournament_id)
+        return bool(channel and channel.subscribers)
+
+    def subscribe(self, tournament_id: str) -> Subscription:
+        sub = Subscription(tournament_id)
+        self._channel(tournament_id).subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        channel = self._channels.get(sub.tournament_id)
+        if channel is None:
+            return
+        channel.subscribers.discard(sub)
+        if not channel.subscribers:
+            # Nobody listening: drop diff state, history stays for reconnects
+            channel.golfers = None
+            channel.teams = {}
+            channel.top25 = ""
+
+    def replay(self, tournament_id: str, last_event_id: Optional[str]) -> Optional[List[bytes]]:
+        """Frames published after ``last_event_id``, or None when a full snapshot is needed."""
+        if not last_event_id:
+            return None
+        epoch, _, seq = last_event_id.partition("-")
+        channel = self._channels.get(tournament_id)
+        if channel is None or epoch != self.epoch or not seq.isdigit():
+            return None
+        if channel.golfers is None:
+            # Diff state was dropped while nobody listened; deltas may be missing
+            return None
+        seq_num = int(seq)
+        if seq_num > channel.seq:
+            return None
+        if seq_num == channel.seq:
+            return []
+        if not channel.history or channel.history[0][0] > seq_num + 1:
+            return None
+        return [frame for s, frame in channel.history if s > seq_num]
+
+    def snapshot_frame(self, tournament_id: str, body: bytes) -> bytes:
+        """A full snapshot event carrying the leaderboard's pre-encoded body."""
+        return format_event(self.event_id(tournament_id), "snapshot", body)
+
+    @staticmethod
+    def _state(payload: Dict[str, Any], scores: List[Dict[str, Any]]):
+        golfers = {_golfer_key(row): json.dumps(row, sort_keys=True, default=str) for row in scores}
+        teams = {ts["team_id"]: json.dumps(ts, sort_keys=True, default=str) for ts in payload.get("team_standings", [])}
+        top25 = json.dumps(payload.get("tournament_standings", []), sort_keys=True, default=str)
+        return golfers, teams, top25
+
+    def prime(self, tournament_id: str, payload: Dict[str, Any], scores: List[Dict[str, Any]]):
+        """Seed diff state from the snapshot a new subscriber was just sent."""
+        channel = self._channel(tournament_id)
+        if channel.golfers is None:
+            channel.golfers, channel.teams, channel.top25 = self._state(payload, scores)
+
+    def publish(self, tournament_id: str, payload: Dict[str, Any], scores: List[Dict[str, Any]]):
+        """Diff a freshly rendered leaderboard against the last one and fan out the delta."""
+        channel = self._channels.get(tournament_id)
+        if channel is None or not channel.subscribers:
+            return
+        golfers, teams, top25 = self._state(payload, scores)
+        if channel.golfers is None:
+            channel.golfers, channel.teams, channel.top25 = golfers, teams, top25
+            return
+        changed_golfers = [row for row in scores if channel.golfers.get(_golfer_key(row)) != golfers[_golfer_key(row)]]
+        removed_golfers = [key for key in channel.golfers if key not in golfers]
+        changed_teams = [ts for ts in payload.get("team_standings", []) if channel.teams.get(ts["team_id"]) != teams[ts["team_id"]]]
+        removed_teams = [tid for tid in channel.teams if tid not in teams]
+        top25_changed = top25 != channel.top25
+        channel.golfers, channel.teams, channel.top25 = golfers, teams, top25
+        if not (changed_golfers or removed_golfers or changed_teams or removed_teams or top25_changed):
+            return
+        delta = {
+            "last_updated": payload.get("last_updated", ""),
+            "tournament": payload.get("tournament", {}),
+            "is_finalized": payload.get("is_finalized", False),
+            "golfers": changed_golfers,
+            "removed_golfers": removed_golfers,
+            "teams": changed_teams,
+            "removed_teams": removed_teams,
+        }
+        if top25_changed:
+            delta["tournament_standings"] = payload.get("tournament_standings", [])
+        channel.seq += 1
+        frame = format_event(self.event_id(tournament_id), "delta", delta)
+        channel.history.append((channel.seq, frame))
+        self.published += 1
+        for sub in list(channel.subscribers):
+            sub.push(frame)
+            self.frames_sent += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "epoch": self.epoch,
+            "subscribers": {tid: len(ch.subscribers) for tid, ch in self._channels.items() if ch.subscribers},
+            "published": self.published,
+            "frames_sent": self.frames_sent,
+        }
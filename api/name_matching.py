@@ -0,0 +1,117 @@
+"""Golfer name matching for ESPN sync and odds import.
+
+A NameMatcher normalizes its candidate names once and buckets them, so each
+lookup is a few dict probes instead of a scan over the whole field. Matches
+come with a confidence:
+
+  high    same normalized name (spacing and punctuation ignored)
+  medium  same last name (over three letters) and first initial
+  low     best token overlap above a threshold, when fuzzy matching is on
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Callable, Container, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+FUZZY_MIN_SCORE = 0.6
+
+# Letters NFKD leaves whole (no combining mark to strip), e.g. Højgaard
+_FOLD = str.maketrans({"ø": "o", "æ": "ae", "œ": "oe", "ß": "ss", "ł": "l", "đ": "d", "ð": "d", "þ": "th", "ı": "i"})
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, accent-free, punctuation-free name with single spaces."""
+    name = unicodedata.normalize("NFKD", name or "")
+    name = "".join(ch for ch in name if not unicodedata.combining(ch)).lower().translate(_FOLD).strip()
+    name = re.sub(r"[.'’‘\-]", '', name)
+    name = re.sub(r'\s+', ' ', name)
+    return name
+
+
+def name_key(name: str) -> str:
+    """normalize_name without spaces: the exact-match key, e.g. for player aliases."""
+    return "".join(normalize_name(name).split())
+
+
+def _initial_key(tokens: List[str]) -> Optional[Tuple[str, str]]:
+    if len(tokens) < 2 or len(tokens[-1]) <= 3:
+        return None
+    return tokens[-1], tokens[0][0]
+
+
+class NameMatcher(Generic[T]):
+    """Index of candidates by name.
+
+    ``name`` reads a candidate's display name and ``key`` its identity, which
+    is what ``match(..., exclude=...)`` skips. Within a bucket, earlier
+    candidates win.
+    """
+
+    def __init__(self, candidates: Iterable[T], name: Callable[[T], str] = lambda c: c["name"],
+                 key: Optional[Callable[[T], Hashable]] = None, fuzzy: bool = False, min_score: float = FUZZY_MIN_SCORE):
+        self.candidates: List[T] = list(candidates)
+        self.key = key or name
+        self.fuzzy = fuzzy
+        self.min_score = min_score
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        self._initial: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._by_token: Dict[str, List[int]] = defaultdict(list)
+        self._tokens: List[List[str]] = []
+        for i, candidate in enumerate(self.candidates):
+            tokens = normalize_name(name(candidate)).split()
+            self._tokens.append(tokens)
+            self._exact["".join(tokens)].append(i)
+            initial = _initial_key(tokens)
+            if initial:
+                self._initial[initial].append(i)
+            for token in set(tokens):
+                self._by_token[token].append(i)
+
+    def _first(self, indexes: List[int], exclude: Container[Hashable]) -> Optional[T]:
+        for i in indexes:
+            candidate = self.candidates[i]
+            if self.key(candidate) not in exclude:
+                return candidate
+        return None
+
+    def _best_overlap(self, tokens: List[str], exclude: Container[Hashable]) -> Optional[T]:
+        overlap: Dict[int, int] = defaultdict(int)
+        for token in set(tokens):
+            for i in self._by_token.get(token, ()):
+                overlap[i] += 1
+        best, best_score, tied = None, 0.0, False
+        for i, shared in overlap.items():
+            if self.key(self.candidates[i]) in exclude:
+                continue
+            # Dice coefficient over name tokens
+            score = 2 * shared / (len(tokens) + len(set(self._tokens[i])))
+            if score > best_score:
+                best, best_score, tied = i, score, False
+            elif score == best_score:
+                tied = True
+        if best is None or tied or best_score < self.min_score:
+            return None
+        return self.candidates[best]
+
+    def match(self, name: str, exclude: Container[Hashable] = (),
+              fuzzy: Optional[bool] = None) -> Tuple[Optional[T], Optional[str]]:
+        """Best candidate for ``name`` and its confidence, or (None, None).
+        ``fuzzy`` overrides the matcher's setting for this lookup."""
+        tokens = normalize_name(name).split()
+        if not tokens:
+            return None, None
+        found = self._first(self._exact.get("".join(tokens), []), exclude)
+        if found is not None:
+            return found, 'high'
+        initial = _initial_key(tokens)
+        if initial:
+            found = self._first(self._initial.get(initial, []), exclude)
+            if found is not None:
+                return found, 'medium'
+        if self.fuzzy if fuzzy is None else fuzzy:
+            found = self._best_overlap(list(set(tokens)), exclude)
+            if found is not None:
+                return found, 'low'
+        return None, None
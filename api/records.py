@@ -0,0 +1,98 @@
+"""Typed per-golfer records for the scoring pipeline.
+
+A scoreboard refresh parses one record per golfer in the field, and every
+leaderboard or cup race build scores each team golfer. As slotted
+dataclasses these take a fraction of a dict's memory and read their fields
+as attributes. They stay inside the pipeline: score_cache rows and API
+payloads are still plain dicts, produced once by ``as_dict()`` where a
+record leaves it.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class ParsedGolfer:
+    """One competitor from an ESPN scoreboard (espn_client.espn_get_field)."""
+    __slots__ = ("espn_id", "name", "short_name", "order", "score", "score_int", "rounds", "is_cut", "is_wd",
+                 "has_placeholder_rounds", "status", "thru", "is_active")
+    espn_id: str
+    name: str
+    short_name: str
+    order: int
+    score: str
+    score_int: Optional[int]
+    rounds: List[Dict[str, Any]]
+    is_cut: bool
+    is_wd: bool
+    has_placeholder_rounds: bool
+    status: str
+    thru: str
+    is_active: bool
+
+
+@dataclass
+class ScoreRow:
+    """A score_cache row as the scoring engine reads it; ``position`` is None when the row has none."""
+    __slots__ = ("espn_id", "name", "position", "total_score", "score_int", "rounds", "thru", "is_cut", "is_wd",
+                 "is_active", "strokes_behind", "sort_order")
+    espn_id: Any
+    name: str
+    position: Optional[str]
+    total_score: Any
+    score_int: Optional[int]
+    rounds: List[Dict[str, Any]]
+    thru: str
+    is_cut: bool
+    is_wd: bool
+    is_active: bool
+    strokes_behind: Any
+    sort_order: Any
+
+    @classmethod
+    def from_doc(cls, row: Dict[str, Any]) -> "ScoreRow":
+        return cls(row.get("espn_id"), row.get("name", ""), row.get("position"), row.get("total_score", ""),
+                   row.get("score_int"), row.get("rounds", []), row.get("thru", ""), row.get("is_cut", False),
+                   row.get("is_wd", False), row.get("is_active", False), row.get("strokes_behind", 0),
+                   row.get("sort_order", 999))
+
+
+@dataclass
+class GolferResult:
+    """A team golfer scored against the field. ``golfer`` is the team's own entry,
+    shared rather than copied; ``in_field`` is False when the golfer has no score row."""
+    __slots__ = ("golfer", "in_field", "position", "total_score", "score_int", "rounds", "thru", "is_active",
+                 "is_cut", "is_wd", "strokes_behind", "place_points", "stroke_points", "total_points", "sort_order")
+    golfer: Dict[str, Any]
+    in_field: bool
+    position: str
+    total_score: Any
+    score_int: Optional[int]
+    rounds: List[Dict[str, Any]]
+    thru: str
+    is_active: bool
+    is_cut: bool
+    is_wd: bool
+    strokes_behind: Any
+    place_points: float
+    stroke_points: Any
+    total_points: float
+    sort_order: Any
+
+    @property
+    def name(self) -> str:
+        return self.golfer.get("name", "")
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The leaderboard row: the team's golfer entry plus its score fields."""
+        if not self.in_field:
+            return {**self.golfer, "position": self.position, "total_score": self.total_score, "rounds": self.rounds,
+                    "thru": self.thru, "is_active": self.is_active, "is_cut": self.is_cut,
+                    "strokes_behind": self.strokes_behind, "place_points": self.place_points,
+                    "stroke_points": self.stroke_points, "total_points": self.total_points,
+                    "sort_order": self.sort_order}
+        return {**self.golfer, "position": self.position, "total_score": self.total_score,
+                "score_int": self.score_int, "rounds": self.rounds, "thru": self.thru, "is_active": self.is_active,
+                "is_cut": self.is_cut, "is_wd": self.is_wd, "strokes_behind": self.strokes_behind,
+                "place_points": self.place_points, "stroke_points": self.stroke_points,
+                "total_points": self.total_points, "sort_order": self.sort_order}
@@ -0,0 +1,170 @@
+"""Background score ingestion.
+
+Polls ESPN for every tournament in an active status and writes score_cache,
+so leaderboard reads never wait on upstream I/O. Cadence adapts to play:
+fast while any golfer is on the course, slow between rounds, and a
+tournament drops out of the schedule once ESPN reports it final.
+
+SCORE_INGEST_MODE selects who refreshes scores:
+  inline      leaderboard requests refresh a stale cache themselves (default)
+  background  the API process runs the ingestor as a startup task
+  external    a separate worker runs it: ``python api/score_ingest.py``
+In background and external modes the read path only serves what is cached.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ERROR_BACKOFF_MAX = 600.0
+
+INACTIVE_STATUSES = ("setup", "golfers_loaded", "completed")
+
+
+# Settings are read when used, not at import: server.py imports this module
+# before it loads api/.env
+def ingest_mode() -> str:
+    return os.environ.get("SCORE_INGEST_MODE", "inline").strip().lower()
+
+
+def _seconds(name: str, default: str) -> float:
+    return float(os.environ.get(name, default))
+
+
+def is_ingestable(t: Dict[str, Any]) -> bool:
+    return bool(t.get("espn_event_id")) and t.get("status") not in INACTIVE_STATUSES
+
+
+class ScoreIngestor:
+    """Schedules per-tournament refreshes on an adaptive cadence.
+
+    ``list_tournaments`` returns tournament documents; ``refresh`` takes one
+    and returns the refresh_tournament_scores result (or None when ESPN has
+    no field yet).
+    """
+
+    def __init__(self, list_tournaments: Callable[[], Awaitable[List[Dict[str, Any]]]],
+                 refresh: Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]],
+                 live_interval: Optional[float] = None, idle_interval: Optional[float] = None,
+                 discovery_interval: Optional[float] = None):
+        self.list_tournaments = list_tournaments
+        self.refresh = refresh
+        self.live_interval = live_interval if live_interval is not None else _seconds("SCORE_INGEST_LIVE_SECONDS", "30")
+        self.idle_interval = idle_interval if idle_interval is not None else _seconds("SCORE_INGEST_IDLE_SECONDS", "300")
+        self.discovery_interval = (discovery_interval if discovery_interval is not None
+                                   else _seconds("SCORE_INGEST_DISCOVERY_SECONDS", "120"))
+        self._tournaments: Dict[str, Dict[str, Any]] = {}
+        self._next_due: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        self._next_discovery = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.errors = 0
+
+    async def _discover(self):
+        tournaments = await self.list_tournaments()
+        active = {t["id"]: t for t in tournaments if is_ingestable(t)}
+        for tid in list(self._next_due):
+            if tid not in active:
+                self._forget(tid)
+        for tid, t in active.items():
+            self._tournaments[tid] = t
+            self._next_due.setdefault(tid, 0.0)
+        self._next_discovery = time.monotonic() + self.discovery_interval
+
+    def _forget(self, tid: str):
+        self._tournaments.pop(tid, None)
+        self._next_due.pop(tid, None)
+        self._failures.pop(tid, None)
+
+    def _interval_for(self, result: Optional[Dict[str, Any]]) -> float:
+        if not result:
+            return self.idle_interval
+        scores = (result.get("cache") or {}).get("scores", [])
+        if any(s.get("is_active") for s in scores):
+            return self.live_interval
+        return self.idle_interval
+
+    async def _ingest(self, tid: str):
+        t = self._tournaments[tid]
+        self.runs += 1
+        try:
+            result = await self.refresh(t)
+        except Exception as ex:
+            self.errors += 1
+            failures = self._failures.get(tid, 0) + 1
+            self._failures[tid] = failures
+            delay = min(ERROR_BACKOFF_MAX, self.live_interval * (2 ** failures))
+            self._next_due[tid] = time.monotonic() + delay
+            logger.error(f"Score ingest {tid}: {ex}")
+            return
+        self._failures.pop(tid, None)
+        if result and result.get("completed"):
+            logger.info(f"Score ingest {tid}: tournament final, stopping")
+            self._forget(tid)
+            return
+        self._next_due[tid] = time.monotonic() + self._interval_for(result)
+
+    async def run_once(self) -> float:
+        """Refresh every due tournament. Returns seconds until the next one is due."""
+        now = time.monotonic()
+        if now >= self._next_discovery:
+            await self._discover()
+        due = [tid for tid, at in self._next_due.items() if at <= now]
+        if due:
+            await asyncio.gather(*(self._ingest(tid) for tid in due))
+        wake = [self._next_discovery] + list(self._next_due.values())
+        return max(0.0, min(wake) - time.monotonic())
+
+    async def run_forever(self):
+        while True:
+            try:
+                delay = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                self.errors += 1
+                logger.error(f"Score ingest loop: {ex}")
+                delay = self.live_interval
+            await asyncio.sleep(max(1.0, delay))
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "mode": ingest_mode(),
+            "running": self._task is not None and not self._task.done(),
+            "runs": self.runs,
+            "errors": self.errors,
+            "next_due_seconds": {tid: round(max(0.0, at - now), 1) for tid, at in self._next_due.items()},
+        }
+
+
+async def _main():
+    import server
+
+    logger.info("Score ingest worker started")
+    try:
+        await server.score_ingestor.run_forever()
+    finally:
+        await server.upstream.close()
+        await server.client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
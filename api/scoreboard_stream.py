@@ -0,0 +1,150 @@
+"""Incremental parsing of ESPN scoreboard responses.
+
+The scoreboard JSON carries hole-by-hole linescores for every competitor and,
+for date-range queries, many events. espn_get_field needs only the target
+event's competitors and a handful of their fields, plus the event headers.
+ScoreboardParser consumes the response body chunk by chunk and builds just
+that: other events keep only their headers, unknown keys are skipped without
+being materialized, and hole-by-hole arrays are reduced to their length
+(``[None] * holes``), which is all the field parser reads from them.
+
+Requires the optional ijson package; STREAM_PARSE_AVAILABLE tells callers
+whether to use it or fall back to decoding the whole body.
+"""
+from typing import Any, Dict, List, Optional
+
+try:
+    import ijson
+    STREAM_PARSE_AVAILABLE = True
+except ImportError:
+    ijson = None
+    STREAM_PARSE_AVAILABLE = False
+
+# Spec values: KEEP keeps the whole subtree, a dict keeps the listed keys,
+# a one-item list applies its spec to every array item, COUNT keeps only an
+# array's length. Anything not in the spec is skipped.
+KEEP = True
+COUNT = "count"
+
+COMPETITOR_SPEC = {
+    "id": KEEP, "order": KEEP, "score": KEEP, "status": KEEP,
+    "athlete": {"id": KEEP, "fullName": KEEP, "displayName": KEEP, "shortName": KEEP},
+    "linescores": [{"period": KEEP, "displayValue": KEEP, "value": KEEP, "linescores": COUNT}],
+}
+EVENT_SPEC = {
+    "id": KEEP, "name": KEEP, "shortName": KEEP, "date": KEEP, "endDate": KEEP, "status": KEEP,
+    "competitions": [{"id": KEEP, "competitors": [COMPETITOR_SPEC]}],
+}
+SCOREBOARD_SPEC = {"events": [EVENT_SPEC]}
+
+_SKIP = object()
+_OPEN = frozenset(("start_map", "start_array"))
+_CLOSE = frozenset(("end_map", "end_array"))
+
+
+class _Frame:
+    __slots__ = ("container", "spec", "key")
+
+    def __init__(self, container, spec):
+        self.container = container
+        self.spec = spec
+        self.key: Optional[str] = None
+
+
+class ScoreboardParser:
+    """Push parser: ``feed`` response chunks, then ``close`` for the pruned document.
+
+    Only ``event_id``'s competitions are kept; None keeps every event's.
+    """
+
+    def __init__(self, event_id: Optional[str] = None):
+        if ijson is None:
+            raise RuntimeError("ijson is not installed")
+        self.event_id = None if event_id is None else str(event_id)
+        self.root: Any = None
+        self._stack: List[_Frame] = []
+        self._skip = 0
+        self._events = ijson.sendable_list()
+        self._coro = ijson.basic_parse_coro(self._events, use_float=True)
+
+    def _child_spec(self):
+        if not self._stack:
+            return SCOREBOARD_SPEC
+        frame = self._stack[-1]
+        spec = frame.spec
+        if spec is KEEP:
+            return KEEP
+        if spec is COUNT:
+            frame.container.append(None)
+            return _SKIP
+        if isinstance(spec, list):
+            return spec[0]
+        if spec is EVENT_SPEC and frame.key == "competitions" and not self._wanted(frame.container):
+            return _SKIP
+        return spec.get(frame.key, _SKIP)
+
+    def _wanted(self, event: Dict[str, Any]) -> bool:
+        # ESPN sends "id" first; if it ever came later the event is pruned in _close_frame
+        return self.event_id is None or "id" not in event or str(event["id"]) == self.event_id
+
+    def _place(self, value):
+        if not self._stack:
+            self.root = value
+            return
+        frame = self._stack[-1]
+        if isinstance(frame.container, list):
+            frame.container.append(value)
+        else:
+            frame.container[frame.key] = value
+
+    def _close_frame(self):
+        frame = self._stack.pop()
+        if frame.spec is EVENT_SPEC and not self._wanted(frame.container):
+            frame.container.pop("competitions", None)
+
+    def _handle(self, event: str, value: Any) -> bool:
+        """Apply one token; True when the value it starts should be skipped."""
+        if event == "map_key":
+            self._stack[-1].key = value
+            return False
+        if event in _CLOSE:
+            self._close_frame()
+            return False
+        spec = self._child_spec()
+        if spec is _SKIP:
+            return event in _OPEN
+        if event == "start_map":
+            container: Any = {}
+        elif event == "start_array":
+            container = []
+        else:
+            self._place(value)
+            return False
+        self._place(container)
+        self._stack.append(_Frame(container, spec))
+        return False
+
+    def _drain(self):
+        # Skipped subtrees are most of the tokens, so depth tracking stays in this loop
+        handle = self._handle
+        skip = self._skip
+        for event, value in self._events:
+            if skip:
+                if event in _OPEN:
+                    skip += 1
+                elif event in _CLOSE:
+                    skip -= 1
+                continue
+            if handle(event, value):
+                skip = 1
+        self._skip = skip
+        del self._events[:]
+
+    def feed(self, chunk: bytes):
+        self._coro.send(chunk)
+        self._drain()
+
+    def close(self) -> Dict[str, Any]:
+        self._coro.close()
+        self._drain()
+        return self.root if isinstance(self.root, dict) else {}
@@ -0,0 +1,343 @@
+"""Fantasy scoring engine shared by the leaderboard and cup race endpoints.
+
+Tie groups are computed by a NumPy kernel when numpy is installed and by
+the equivalent pure-Python loop otherwise; both produce identical results.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from records import GolferResult, ScoreRow
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PLACE_POINTS = {1:300,2:200,3:175,4:150,5:125,6:100,7:90,8:80,9:70,10:60,
+                11:55,12:54,13:53,14:52,15:51}
+STROKE_POINTS = {0:100,1:85,2:80,3:75,4:70,5:65}
+
+def calc_place_pts_single(pos):
+    """Calculate place points for a single position number."""
+    if pos <= 0:
+        return 0
+    if pos in PLACE_POINTS:
+        return PLACE_POINTS[pos]
+    if pos > 15:
+        return max(0, 51 - (pos - 15))
+    return 0
+
+def calc_place_pts(pos_str):
+    if not pos_str or pos_str in ('CUT','WD','DQ','MDF','-',''):
+        return 0
+    pos = pos_str.replace('T','').strip()
+    try:
+        pos = int(pos)
+    except ValueError:
+        return 0
+    return calc_place_pts_single(pos)
+
+def calc_stroke_pts(sb):
+    if sb is None or sb < 0:
+        return 0
+    if sb in STROKE_POINTS:
+        return STROKE_POINTS[sb]
+    if sb > 5:
+        return max(0, 65 - (sb - 5) * 5)
+    return 0
+
+def _active_scores(scores_list):
+    active = [s for s in scores_list if not s.get('is_cut', False) and s.get('score_int') is not None]
+    active.sort(key=lambda x: (x.get('score_int', 999)))
+    return active
+
+def _group_stats_py(sorted_scores, leader_score=None, first_pos=1):
+    """Per tie group of ascending scores: score, first position, size,
+    averaged place points, strokes behind the leader and stroke points.
+
+    ``sorted_scores`` may be the tail of a field, starting at ``first_pos``
+    behind a leader who scored ``leader_score``."""
+    if leader_score is None:
+        leader_score = sorted_scores[0] if sorted_scores else 0
+    groups = []
+    pos = first_pos
+    i = 0
+    while i < len(sorted_scores):
+        score = sorted_scores[i]
+        j = i
+        while j < len(sorted_scores) and sorted_scores[j] == score:
+            j += 1
+        num_tied = j - i
+        total_place = sum(calc_place_pts_single(p) for p in range(pos, pos + num_tied))
+        sb = score - leader_score
+        groups.append((score, pos, num_tied, total_place / num_tied, sb, calc_stroke_pts(sb)))
+        pos += num_tied
+        i = j
+    return groups
+
+if np is not None:
+    # Cumulative place points by position and stroke points by strokes behind,
+    # sized well past any real field; larger inputs fall back to the formulas
+    _PLACE_CUMULATIVE = np.concatenate(([0], np.cumsum([calc_place_pts_single(p) for p in range(1, 1025)])))
+    _STROKE_BY_BEHIND = np.array([calc_stroke_pts(sb) for sb in range(128)], dtype=np.int64)
+
+    def _group_stats_np(sorted_scores, leader_score=None, first_pos=1):
+        """Vectorized _group_stats_py: same groups, bit-identical points."""
+        n = len(sorted_scores)
+        if n and leader_score is None:
+            leader_score = sorted_scores[0]
+        if (not n or first_pos - 1 + n >= len(_PLACE_CUMULATIVE)
+                or sorted_scores[-1] - leader_score >= len(_STROKE_BY_BEHIND)):
+            return _group_stats_py(sorted_scores, leader_score, first_pos)
+        scores = np.asarray(sorted_scores, dtype=np.int64)
+        starts = np.flatnonzero(np.concatenate(([True], scores[1:] != scores[:-1])))
+        sizes = np.diff(np.append(starts, n))
+        first = starts + (first_pos - 1)
+        # Integer group sums divided once, exactly like sum(...) / num_tied
+        avg_place = (_PLACE_CUMULATIVE[first + sizes] - _PLACE_CUMULATIVE[first]) / sizes
+        behind = scores[starts] - leader_score
+        return list(zip(scores[starts].tolist(), (first + 1).tolist(), sizes.tolist(), avg_place.tolist(),
+                        behind.tolist(), _STROKE_BY_BEHIND[behind].tolist()))
+
+    _group_stats = _group_stats_np
+else:
+    _group_stats = _group_stats_py
+
+def _tie_groups(active, previous=None, reuse_below=None):
+    """Walk the sorted active field one score group at a time.
+
+    Returns the tied-score map and each group's entry keyed by score. Groups
+    scoring strictly better than ``reuse_below`` take their entry from
+    ``previous``; only the groups from there on go through _group_stats."""
+    result_map = {}
+    groups = {}
+
+    def add(member, entry):
+        result_map[member.get('name','').lower()] = entry
+        espn_key = member.get('espn_id','')
+        if espn_key:
+            result_map[espn_key] = entry
+
+    start = 0
+    if reuse_below is not None:
+        while start < len(active) and active[start]['score_int'] < reuse_below:
+            score = active[start]['score_int']
+            groups[score] = previous[score]
+            add(active[start], groups[score])
+            start += 1
+    leader_score = active[0]['score_int'] if active else None
+    for score, pos, num_tied, avg_place, sb, stroke_pts in _group_stats(
+            [s['score_int'] for s in active[start:]], leader_score, start + 1):
+        tied_pos = f'T{pos}' if num_tied > 1 else str(pos)
+        entry = {'position': tied_pos, 'place_points': avg_place,
+                 'stroke_points': stroke_pts, 'strokes_behind': sb,
+                 'total_points': avg_place + stroke_pts}
+        groups[score] = entry
+        for k in range(pos - 1, pos - 1 + num_tied):
+            add(active[k], entry)
+    return result_map, groups
+
+def calc_tied_scores(scores_list):
+    """Calculate positions and averaged place/stroke points accounting for ties."""
+    return _tie_groups(_active_scores(scores_list))[0]
+
+def _reuse_threshold(prev_active, active):
+    """Best score whose tie group may differ between two versions of the field.
+
+    Groups strictly better than it keep their members, so their positions and
+    points carry over. None when everything must be recomputed."""
+    if not prev_active or not active or prev_active[0]['score_int'] != active[0]['score_int']:
+        return None
+    old = {(s.get('espn_id'), s.get('name')): s['score_int'] for s in prev_active}
+    new = {(s.get('espn_id'), s.get('name')): s['score_int'] for s in active}
+    if len(old) != len(prev_active) or len(new) != len(active):
+        return None
+    moved = [score for key in old.keys() | new.keys() if old.get(key) != new.get(key)
+             for score in (old.get(key), new.get(key)) if score is not None]
+    return min(moved) if moved else float('inf')
+
+def calc_prices(golfers):
+    sorted_g = sorted(golfers, key=lambda x: x.get('odds', 999))
+    price = 300000
+    for i, g in enumerate(sorted_g):
+        g['price'] = max(75000, price)
+        g['world_ranking'] = i + 1
+        price -= 3000
+    return sorted_g
+
+def parse_score(s):
+    if not s or s in ('-',''):
+        return None
+    s = str(s).strip()
+    if s == 'E':
+        return 0
+    try:
+        return int(s)
+    except ValueError:
+        return None
+
+
+def build_score_rows(golfers):
+    """Convert parsed ESPN golfers (records.ParsedGolfer) into the score_cache row format."""
+    leader_score = None
+    for g in golfers:
+        if g.score_int is not None and not g.is_cut:
+            if leader_score is None or g.score_int < leader_score:
+                leader_score = g.score_int
+    scores = []
+    for g in golfers:
+        sb = None
+        if g.score_int is not None and leader_score is not None and not g.is_cut:
+            sb = g.score_int - leader_score
+        # Display "WD" for withdrawals, "CUT" for missed cuts, score otherwise
+        if g.is_wd:
+            display_score = "WD"
+        elif g.is_cut:
+            display_score = "CUT"
+        else:
+            display_score = g.score
+        # Only show first 2 rounds for cut (not WD) players; WD may have mid-round data
+        display_rounds = g.rounds[:2] if g.is_cut and not g.is_wd else g.rounds
+        scores.append({
+            "espn_id": g.espn_id, "name": g.name, "position": str(g.order),
+            "total_score": display_score, "score_int": g.score_int,
+            "rounds": display_rounds,
+            "thru": g.thru, "is_cut": g.is_cut,
+            "is_wd": g.is_wd,
+            "is_active": g.is_active,
+            "strokes_behind": sb if sb is not None else 999, "sort_order": g.order
+        })
+    return scores
+
+# ── Score Index ──
+MIN_MADE_CUT_POINTS = 5
+
+
+def _score_key(name) -> str:
+    return (name or "").lower()
+
+
+class ScoreIndex:
+    """Precomputed lookups over one version of a tournament's score_cache rows.
+
+    Team golfers are matched to score rows by lowercased name or espn_id,
+    taking whichever row comes first in the cached order, exactly as the
+    original per-golfer scan did.
+
+    Built from the ``previous`` version of the same field, tie groups ahead
+    of every golfer whose score moved are carried over rather than recomputed.
+    """
+
+    def __init__(self, scores: List[Dict[str, Any]], previous: Optional["ScoreIndex"] = None):
+        self.scores = scores
+        self._active = _active_scores(scores)
+        reuse_below = _reuse_threshold(previous._active, self._active) if previous is not None else None
+        self.tied_map, self._groups = _tie_groups(self._active, previous._groups if previous is not None else None,
+                                                  reuse_below)
+        self._by_name: Dict[str, int] = {}
+        self._by_espn_id: Dict[Any, int] = {}
+        self._tied: List[Optional[Dict[str, Any]]] = []
+        self._rows = [ScoreRow.from_doc(s) for s in scores]
+        for pos, s in enumerate(scores):
+            name_key = _score_key(s.get("name", ""))
+            self._by_name.setdefault(name_key, pos)
+            self._by_espn_id.setdefault(s.get("espn_id"), pos)
+            self._tied.append(self.tied_map.get(name_key) or self.tied_map.get(s.get("espn_id", "")))
+
+    def _position(self, golfer: Dict[str, Any]) -> Optional[int]:
+        by_name = self._by_name.get(_score_key(golfer.get("name", "")))
+        by_id = self._by_espn_id.get(golfer.get("espn_id"))
+        if by_name is None:
+            return by_id
+        if by_id is None:
+            return by_name
+        return min(by_name, by_id)
+
+    def unchanged_since(self, previous: "ScoreIndex", golfer: Dict[str, Any]) -> bool:
+        """True when ``golfer`` scores exactly as it did under ``previous``."""
+        pos = self._position(golfer)
+        prev_pos = previous._position(golfer)
+        if pos is None or prev_pos is None:
+            return pos is None and prev_pos is None
+        return self.scores[pos] == previous.scores[prev_pos] and self._tied[pos] == previous._tied[prev_pos]
+
+    def lookup(self, golfer: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the score row for a team golfer, or None if not in the field."""
+        pos = self._position(golfer)
+        return self.scores[pos] if pos is not None else None
+
+    def tied_for(self, score_row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the tie-adjusted points for a score row from this index."""
+        return self.tied_map.get(_score_key(score_row.get("name", ""))) or \
+            self.tied_map.get(score_row.get("espn_id", ""))
+
+    def score_golfer(self, golfer: Dict[str, Any]) -> Tuple[GolferResult, float]:
+        """Score one team golfer. Returns its result and unrounded points."""
+        pos = self._position(golfer)
+        if pos is None:
+            return GolferResult(golfer, False, "-", "-", None, [], "", False, False, False, 0, 0, 0, 0, 9999), 0
+        sd = self._rows[pos]
+        tied_data = self._tied[pos]
+        if tied_data and not sd.is_cut:
+            pp = tied_data["place_points"]
+            sp = tied_data["stroke_points"]
+            tot = tied_data["total_points"]
+            position = tied_data["position"]
+            sb_val = tied_data["strokes_behind"]
+            # Players who made the cut earn a minimum of 5 points
+            if tot < MIN_MADE_CUT_POINTS:
+                tot = MIN_MADE_CUT_POINTS
+        else:
+            pp = 0
+            sp = 0
+            tot = 0
+            if sd.is_wd:
+                position = "WD"
+            elif sd.is_cut:
+                position = sd.position if sd.position is not None else "CUT"
+            else:
+                position = sd.position if sd.position is not None else "-"
+            sb_val = sd.strokes_behind
+        return GolferResult(golfer, True, position, sd.total_score, sd.score_int, sd.rounds, sd.thru, sd.is_active,
+                            sd.is_cut, sd.is_wd, sb_val, round(pp, 1), sp, round(tot, 1), sd.sort_order), tot
+
+    def score_team(self, golfers: List[Dict[str, Any]]) -> Tuple[List[GolferResult], float]:
+        """Score a team's golfers in roster order. Returns the results and the unrounded team total."""
+        rows = []
+        total = 0
+        for golfer in golfers:
+            row, pts = self.score_golfer(golfer)
+            rows.append(row)
+            total += pts
+        return rows, total
+
+
+_score_indexes: Dict[str, Tuple[str, ScoreIndex]] = {}
+
+
+def score_index_for(tournament_id: str, cache: Optional[Dict[str, Any]]) -> ScoreIndex:
+    """Return the ScoreIndex for a score_cache document, rebuilding only when last_updated changes."""
+    version = cache.get("last_updated", "") if cache else ""
+    entry = _score_indexes.get(tournament_id)
+    if entry and entry[0] == version:
+        return entry[1]
+    index = ScoreIndex(cache.get("scores", []) if cache else [], previous=entry[1] if entry else None)
+    _score_indexes[tournament_id] = (version, index)
+    return index
+
+
+def cached_score_index(tournament_id: str) -> Optional[Tuple[str, ScoreIndex]]:
+    """The last (last_updated, ScoreIndex) this process built for a tournament, if any."""
+    return _score_indexes.get(tournament_id)
+
+
+def diff_score_rows(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Optional[Tuple[List[str], Dict[str, Dict[str, Any]]]]:
+    """Rows of ``new`` that differ from ``old``, keyed by espn_id, plus the new row order.
+
+    None when the two lists don't hold the same uniquely identified golfers,
+    in which case only a full rewrite is safe."""
+    old_by_id = {str(row.get("espn_id") or ""): row for row in old}
+    order = [str(row.get("espn_id") or "") for row in new]
+    if "" in old_by_id or len(old_by_id) != len(old) or len(set(order)) != len(order) or set(order) != old_by_id.keys():
+        return None
+    changed = {espn_id: row for espn_id, row in zip(order, new) if old_by_id[espn_id] != row}
+    return order, changed
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
@@ -9,36 +9,37 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime, timezone, timedelta
-import requests
 import asyncio
 import io
 import csv
 import re
 import httpx
-from supabase_mongo_compat import SupabaseMongoCompat
+from storage import open_storage
+from scoring import build_score_rows, cached_score_index, calc_prices, diff_score_rows, score_index_for
+from singleflight import SingleFlight
+from score_ingest import ScoreIngestor, ingest_mode
+from snapshots import Snapshot, SnapshotStore, snapshot_key, teams_version
+from live_stream import (HEARTBEAT as STREAM_HEARTBEAT, HEARTBEAT_SECONDS as STREAM_HEARTBEAT_SECONDS,
+                         RETRY as STREAM_RETRY, LeaderboardBroadcaster)
+from json_responses import (FINAL_CACHE_CONTROL, LIST_CACHE_CONTROL, LIVE_CACHE_CONTROL, FastJSONResponse,
+                            encode_json, etag_matches, json_bytes_response, make_etag, not_modified,
+                            plain_json_response)
+from name_matching import NameMatcher, name_key
+from espn_client import ESPN_BASE, upstream, resolved_queries, espn_get_events, espn_get_field
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env', override=True)
 
-client = SupabaseMongoCompat()
+client = open_storage()
 db = client
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 ADMIN_EMAIL = os.environ.get("ADMIN_EMAIL", "").lower().strip()
-ESPN_BASE = "https://site.api.espn.com/apis/site/v2/sports/golf/pga"
-ODDS_API_BASE = "https://api.the-odds-api.com/v4"
-
-def _normalize_name(name: str) -> str:
-    """Normalize a player name for fuzzy matching."""
-    name = name.lower().strip()
-    name = re.sub(r"[.'''\-]", '', name)
-    name = re.sub(r'\s+', ' ', name)
-    return name
 
 def gen_id():
     return str(uuid.uuid4())
@@ -66,328 +67,6 @@ class TournamentSetup(BaseModel):
     end_date: Optional[str] = None
     deadline: Optional[str] = None
 
-# ── Scoring Engine ──
-PLACE_POINTS = {1:300,2:200,3:175,4:150,5:125,6:100,7:90,8:80,9:70,10:60,
-                11:55,12:54,13:53,14:52,15:51}
-
-def calc_place_pts_single(pos):
-    """Calculate place points for a single position number."""
-    if pos <= 0:
-        return 0
-    if pos in PLACE_POINTS:
-        return PLACE_POINTS[pos]
-    if pos > 15:
-        return max(0, 51 - (pos - 15))
-    return 0
-
-def calc_place_pts(pos_str):
-    if not pos_str or pos_str in ('CUT','WD','DQ','MDF','-',''):
-        return 0
-    pos = pos_str.replace('T','').strip()
-    try:
-        pos = int(pos)
-    except ValueError:
-        return 0
-    return calc_place_pts_single(pos)
-
-def calc_stroke_pts(sb):
-    if sb is None or sb < 0:
-        return 0
-    if sb == 0:
-        return 100
-    stroke_map = {1:85,2:80,3:75,4:70,5:65}
-    if sb in stroke_map:
-        return stroke_map[sb]
-    if sb > 5:
-        return max(0, 65 - (sb - 5) * 5)
-    return 0
-
-def calc_tied_scores(scores_list):
-    """Calculate positions and averaged place/stroke points accounting for ties."""
-    active = [s for s in scores_list if not s.get('is_cut', False) and s.get('score_int') is not None]
-    active.sort(key=lambda x: (x.get('score_int', 999)))
-    leader_score = active[0]['score_int'] if active else 0
-    pos = 1
-    i = 0
-    result_map = {}
-    while i < len(active):
-        score = active[i]['score_int']
-        j = i
-        while j < len(active) and active[j]['score_int'] == score:
-            j += 1
-        num_tied = j - i
-        positions = list(range(pos, pos + num_tied))
-        total_place = sum(calc_place_pts_single(p) for p in positions)
-        avg_place = total_place / num_tied
-        sb = score - leader_score
-        stroke_pts = calc_stroke_pts(sb)
-        tied_pos = f'T{pos}' if num_tied > 1 else str(pos)
-        for k in range(i, j):
-            name_key = active[k].get('name','').lower()
-            espn_key = active[k].get('espn_id','')
-            result_map[name_key] = {'position': tied_pos, 'place_points': avg_place,
-                                     'stroke_points': stroke_pts, 'strokes_behind': sb,
-                                     'total_points': avg_place + stroke_pts}
-            if espn_key:
-                result_map[espn_key] = result_map[name_key]
-        pos += num_tied
-        i = j
-    return result_map
-
-def calc_prices(golfers):
-    sorted_g = sorted(golfers, key=lambda x: x.get('odds', 999))
-    price = 300000
-    for i, g in enumerate(sorted_g):
-        g['price'] = max(75000, price)
-        g['world_ranking'] = i + 1
-        price -= 3000
-    return sorted_g
-
-def parse_score(s):
-    if not s or s in ('-',''):
-        return None
-    s = str(s).strip()
-    if s == 'E':
-        return 0
-    try:
-        return int(s)
-    except ValueError:
-        return None
-
-# ── ESPN Helpers ──
-async def espn_get_events(year=None):
-    try:
-        url = f"{ESPN_BASE}/scoreboard"
-        params = {}
-        if year:
-            params['dates'] = str(year)
-        resp = await asyncio.to_thread(requests.get, url, params=params, timeout=15)
-        data = resp.json()
-        result = []
-        for ev in data.get('events', []):
-            comps = ev.get('competitions', [{}])
-            comp = comps[0] if comps else {}
-            result.append({
-                'espn_id': ev.get('id', ''),
-                'name': ev.get('name', ''),
-                'short_name': ev.get('shortName', ''),
-                'date': ev.get('date', ''),
-                'end_date': ev.get('endDate', ev.get('date', '')),
-                'status': ev.get('status', {}).get('type', {}).get('name', ''),
-                'state': ev.get('status', {}).get('type', {}).get('state', ''),
-                'competitor_count': len(comp.get('competitors', []))
-            })
-        return result
-    except Exception as e:
-        logger.error(f"ESPN events: {e}")
-        return []
-
-async def espn_get_field(event_id, event_date=None):
-    try:
-        url = f"{ESPN_BASE}/scoreboard"
-        # Build params - use date for correct season lookup
-        params = {}
-        if event_date:
-            try:
-                dt = datetime.fromisoformat(str(event_date).replace('Z','+00:00'))
-                params['dates'] = dt.strftime('%Y%m%d')
-            except Exception:
-                params['event'] = str(event_id)
-        else:
-            params['event'] = str(event_id)
-        resp = await asyncio.to_thread(requests.get, url, params=params, timeout=15)
-        data = resp.json()
-        events = data.get('events', [])
-        # Find the specific event by ID
-        ev = None
-        for e in events:
-            if str(e.get('id','')) == str(event_id):
-                ev = e
-                break
-        # Fallback: if not found with dates, try event param directly
-        if not ev and 'dates' in params:
-            params2 = {'event': str(event_id)}
-            resp2 = await asyncio.to_thread(requests.get, url, params=params2, timeout=15)
-            data2 = resp2.json()
-            for e in data2.get('events', []):
-                if str(e.get('id','')) == str(event_id):
-                    ev = e
-                    data = data2
-                    break
-        if not ev:
-            # Last fallback: try years 2026, 2025
-            for year in [2026, 2025]:
-                resp3 = await asyncio.to_thread(requests.get, url, params={'dates': str(year)}, timeout=15)
-                data3 = resp3.json()
-                for e in data3.get('events', []):
-                    if str(e.get('id','')) == str(event_id):
-                        ev = e
-                        data = data3
-                        break
-                if ev:
-                    break
-        if not ev:
-            return [], data if data else {}
-        comps = ev.get('competitions', [])
-        if not comps:
-            return [], data
-        comp = comps[0]
-        def is_real_ls(ls):
-            # A linescore has real data if it has a non-dash display value,
-            # a non-zero stroke count, or nested hole-by-hole data.
-            # ESPN adds placeholder stubs (displayValue="-", value=0, no holes)
-            # for WD players' unplayed rounds — we exclude those from the round list.
-            return (
-                ls.get('displayValue', '-') != '-'
-                or (ls.get('value') or 0.0) > 0
-                or bool(ls.get('linescores'))
-            )
-
-        golfers = []
-        for c in comp.get('competitors', []):
-            ath = c.get('athlete', {})
-            all_ls = c.get('linescores', [])
-            real_ls = [ls for ls in all_ls if is_real_ls(ls)]
-            has_placeholder_rounds = len(all_ls) > len(real_ls) and len(real_ls) > 0
-            rounds = []
-            for ls in real_ls:
-                rounds.append({
-                    'round': ls.get('period', 0),
-                    'score': ls.get('displayValue', ''),
-                    'strokes': ls.get('value', None)
-                })
-            score_str = str(c.get('score', ''))
-            # Text-based detection: check if WD/CUT words appear in any ESPN field.
-            status_obj = c.get('status', {})
-            status_name = ''
-            status_desc = ''
-            status_short = ''
-            if isinstance(status_obj, dict):
-                type_obj = status_obj.get('type', {})
-                if isinstance(type_obj, dict):
-                    status_name = str(type_obj.get('name', ''))
-                    status_desc = str(type_obj.get('description', ''))
-                    status_short = str(type_obj.get('shortDetail', ''))
-            linescore_text = ' '.join(str(ls.get('displayValue', '')) for ls in all_ls)
-            combined_text = f"{score_str} {status_name} {status_desc} {status_short} {linescore_text}".upper()
-            is_cut_by_text = 'CUT' in combined_text
-            is_wd_by_text = any(w in combined_text for w in ('WD', 'WITHDREW', 'WITHDRAW'))
-            is_cut = is_cut_by_text or is_wd_by_text
-            is_wd = is_wd_by_text
-
-            # Derive thru and is_active from nested hole-by-hole linescores.
-            # ESPN's scoreboard API does not return a status.thru field.
-            thru_val = ''
-            is_active_val = False
-            if real_ls:
-                last_round = real_ls[-1]
-                nested_holes = last_round.get('linescores', [])
-                holes_played = len(nested_holes)
-                if holes_played >= 18:
-                    thru_val = 'F'
-                elif holes_played > 0:
-                    thru_val = str(holes_played)
-                    is_active_val = True  # mid-round
-                elif last_round.get('displayValue', '-') != '-':
-                    # Has a round score but no hole-by-hole data — treat as finished
-                    thru_val = 'F'
-
-            golfers.append({
-                'espn_id': str(ath.get('id', c.get('id', ''))),
-                'name': ath.get('fullName', ath.get('displayName', '')),
-                'short_name': ath.get('shortName', ''),
-                'order': c.get('order', 999),
-                'score': score_str,
-                'score_int': parse_score(score_str),
-                'rounds': rounds,
-                'is_cut': is_cut,
-                'is_wd': is_wd,
-                'has_placeholder_rounds': has_placeholder_rounds,
-                'status': c.get('status', {}).get('type', {}).get('name', '') if isinstance(c.get('status'), dict) else '',
-                'thru': thru_val,
-                'is_active': is_active_val,
-            })
-
-        # Second pass: Detect cuts/WDs by round count and inferred cut line.
-        # Count only "real" rounds (placeholders already stripped above).
-        # If the tournament has progressed to R3+:
-        #   - Infer the cut line from R3 players' R1+R2 stroke totals: the worst 2-round
-        #     score that still made R3 IS the cut line. Any 2-round player who scored worse
-        #     (more strokes) missed the cut. This is robust regardless of which players
-        #     have finished R3 so far (avoids fragility in order-based approaches).
-        #   - Players with exactly 2 real rounds and no placeholder rounds → CUT (missed cut)
-        #   - Players more than one round behind the leader with placeholders → WD
-        #     (being exactly one round behind just means they haven't teed off yet in the current round)
-        if golfers:
-            round_counts = {}
-            for g in golfers:
-                rc = len(g['rounds'])
-                round_counts[rc] = round_counts.get(rc, 0) + 1
-
-            max_rounds = max(round_counts.keys()) if round_counts else 0
-
-            if max_rounds >= 3:
-                # Infer cut line: worst R1+R2 stroke total among players who made it to R3.
-                # Cuts are inclusive of ties, so strictly greater than this = missed cut.
-                cut_line_strokes = None
-                for g in golfers:
-                    if len(g['rounds']) >= 3:
-                        r1r2 = sum((r.get('strokes') or 0) for r in g['rounds'][:2])
-                        if r1r2 > 0:
-                            if cut_line_strokes is None or r1r2 > cut_line_strokes:
-                                cut_line_strokes = r1r2
-
-                for g in golfers:
-                    if not g.get('is_cut') and len(g['rounds']) < max_rounds:
-                        rounds_behind = max_rounds - len(g['rounds'])
-                        if cut_line_strokes and len(g['rounds']) == 2:
-                            r1r2 = sum((r.get('strokes') or 0) for r in g['rounds'][:2])
-                            if r1r2 > 0 and r1r2 > cut_line_strokes:
-                                # Worse than worst qualifier → missed cut
-                                g['is_cut'] = True
-                        if not g.get('is_cut'):
-                            if g.get('has_placeholder_rounds') and rounds_behind > 1:
-                                # More than one full round behind with placeholders → WD
-                                # (exactly one round behind = just waiting to tee off in current round)
-                                g['is_wd'] = True
-                                g['is_cut'] = True
-                            elif len(g['rounds']) == 2 and not g.get('has_placeholder_rounds'):
-                                # Standard missed cut (exactly 2 rounds, no placeholders)
-                                g['is_cut'] = True
-        
-        return golfers, data
-    except Exception as e:
-        logger.error(f"ESPN field: {e}")
-        return [], {}
-
-# ── Odds Helper ──
-async def fetch_odds_api(sport_key):
-    api_key = os.environ.get('ODDS_API_KEY', '')
-    if not api_key:
-        return None, "ODDS_API_KEY not configured. Sign up free at https://the-odds-api.com"
-    try:
-        url = f"{ODDS_API_BASE}/sports/{sport_key}/odds/"
-        params = {'apiKey': api_key, 'regions': 'us', 'markets': 'outrights', 'oddsFormat': 'decimal'}
-        resp = await asyncio.to_thread(requests.get, url, params=params, timeout=15)
-        data = resp.json()
-        if isinstance(data, dict) and data.get('message'):
-            return None, data['message']
-        golfer_odds = {}
-        items = data if isinstance(data, list) else [data]
-        for item in items:
-            for bm in item.get('bookmakers', []):
-                for mkt in bm.get('markets', []):
-                    if mkt.get('key') == 'outrights':
-                        for out in mkt.get('outcomes', []):
-                            name = out['name']
-                            price = out.get('price', 999)
-                            if name not in golfer_odds or price < golfer_odds[name]:
-                                golfer_odds[name] = price
-        return golfer_odds, None
-    except Exception as e:
-        logger.error(f"Odds API: {e}")
-        return None, str(e)
-
 # ── Auth Routes ──
 @api_router.post("/auth/register")
 async def register(data: UserCreate):
@@ -433,23 +112,31 @@ async def update_profile(user_id: str, data: UserUpdate):
             updates["is_admin"] = new_email == ADMIN_EMAIL
     if updates:
         await db.users.update_one({"id": user_id}, {"$set": updates})
+        # Denormalized copies on the user's teams, renamed in one request
+        team_updates = {}
         if "name" in updates:
-            await db.teams.update_many({"user_id": user_id}, {"$set": {"user_name": updates["name"]}})
+            team_updates["user_name"] = updates["name"]
         if "email" in updates:
-            await db.teams.update_many({"user_id": user_id}, {"$set": {"user_email": updates["email"]}})
+            team_updates["user_email"] = updates["email"]
+        if team_updates:
+            team_updates["updated_at"] = datetime.now(timezone.utc).isoformat()
+            await db.teams.update_many({"user_id": user_id}, {"$set": team_updates})
+            # Frozen results of finished events carry the old name or email too
+            teams = await db.teams.find({"user_id": user_id}, {"_id": 0, "tournament_id": 1}).to_list(100)
+            await unfreeze_completed({team["tournament_id"] for team in teams})
     updated = await db.users.find_one({"id": user_id}, {"_id": 0})
     return {"id": updated["id"], "name": updated["name"], "email": updated["email"], "is_admin": updated.get("is_admin", False)}
 
 # ── Admin Routes ──
 async def check_admin(user_id):
-    user = await db.users.find_one({"id": user_id}, {"_id": 0})
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "id": 1, "is_admin": 1})
     if not user or not user.get("is_admin"):
         raise HTTPException(status_code=403, detail="Admin access required")
 
 @api_router.get("/admin/tournaments")
 async def admin_get_tournaments(user_id: str = Query(...)):
     await check_admin(user_id)
-    return await db.tournaments.find({}, {"_id": 0}).sort("slot", 1).to_list(4)
+    return plain_json_response(await db.tournaments.find({}, {"_id": 0}).sort("slot", 1).to_list(4))
 
 @api_router.put("/admin/tournaments/{slot}")
 async def admin_update_tournament(slot: int, data: TournamentSetup, user_id: str = Query(...)):
@@ -458,11 +145,13 @@ async def admin_update_tournament(slot: int, data: TournamentSetup, user_id: str
     updates = {}
     if data.name is not None: updates["name"] = data.name
     if data.espn_event_id is not None: updates["espn_event_id"] = data.espn_event_id
+    if existing and data.espn_event_id not in (None, existing.get("espn_event_id")): updates["espn_query"] = None
     if data.odds_sport_key is not None: updates["odds_sport_key"] = data.odds_sport_key
     if data.start_date is not None: updates["start_date"] = data.start_date
     if data.end_date is not None: updates["end_date"] = data.end_date
     if data.deadline is not None: updates["deadline"] = data.deadline
     if existing:
+        await unfreeze_results(existing["id"])
         await db.tournaments.update_one({"slot": slot}, {"$set": updates})
     else:
         doc = {"id": gen_id(), "slot": slot, "name": data.name or f"Tournament {slot}",
@@ -473,6 +162,47 @@ async def admin_update_tournament(slot: int, data: TournamentSetup, user_id: str
         await db.tournaments.insert_one(doc)
     return await db.tournaments.find_one({"slot": slot}, {"_id": 0})
 
+async def espn_field_for(t):
+    """espn_get_field for a tournament, saving the scoreboard query that found its event
+    so later fetches (in any process) make one upstream call."""
+    result = await espn_get_field(t["espn_event_id"], t.get("start_date", ""), t.get("espn_query"))
+    query = resolved_queries.get(str(t["espn_event_id"]))
+    if query and query != t.get("espn_query"):
+        try:
+            await db.tournaments.update_one({"id": t["id"]}, {"$set": {"espn_query": query}})
+            t["espn_query"] = query
+        except httpx.HTTPStatusError as ex:
+            logger.warning(f"ESPN query index: {ex}")
+    return result
+
+# ── Player aliases ──
+async def known_players(names) -> Dict[str, Dict[str, Any]]:
+    """player_aliases rows for the given spellings, keyed by name_key."""
+    keys = sorted({name_key(name) for name in names if name} - {""})
+    if not keys:
+        return {}
+    try:
+        rows = await db.player_aliases.find({"alias": {"$in": keys}}, {"_id": 0}).to_list(len(keys))
+    except httpx.HTTPStatusError as ex:
+        logger.warning(f"Player aliases: {ex}")
+        return {}
+    return {row["alias"]: row for row in rows}
+
+async def learn_players(links):
+    """Remember each confirmed (spelling, espn_id, espn_name) for later imports."""
+    now = datetime.now(timezone.utc).isoformat()
+    rows = {}
+    for spelling, espn_id, espn_name in links:
+        key = name_key(spelling or "")
+        if key and espn_id:
+            rows[key] = {"alias": key, "espn_id": str(espn_id), "name": espn_name or spelling, "updated_at": now}
+    if not rows:
+        return
+    try:
+        await db.player_aliases.upsert_many(list(rows.values()), on_conflict="alias")
+    except httpx.HTTPStatusError as ex:
+        logger.warning(f"Player aliases: {ex}")
+
 @api_router.post("/admin/espn-search")
 async def admin_espn_search(user_id: str = Query(...), year: int = Query(2026)):
     await check_admin(user_id)
@@ -487,11 +217,10 @@ async def admin_fetch_golfers(slot: int, user_id: str = Query(...)):
         raise HTTPException(status_code=404, detail="Tournament not found")
     if not t.get("espn_event_id"):
         raise HTTPException(status_code=400, detail="Map an ESPN event first")
-    event_date = t.get("start_date", "")
-    golfers, raw = await espn_get_field(t["espn_event_id"], event_date)
+    golfers, raw = await espn_field_for(t)
     if not golfers:
         raise HTTPException(status_code=400, detail="Could not fetch golfers. Field may not be available yet.")
-    golfer_list = [{"espn_id": g["espn_id"], "name": g["name"], "short_name": g.get("short_name",""),
+    golfer_list = [{"espn_id": g.espn_id, "name": g.name, "short_name": g.short_name,
                     "world_ranking": i+1, "odds": None, "price": None} for i,g in enumerate(golfers)]
     update_data = {"golfers": golfer_list, "status": "golfers_loaded"}
     # Find the correct event in raw data to get dates
@@ -507,6 +236,7 @@ async def admin_fetch_golfers(slot: int, user_id: str = Query(...)):
         update_data["end_date"] = target_ev.get("endDate", target_ev.get("date", t.get("end_date", "")))
         if not t.get("deadline"):
             update_data["deadline"] = target_ev.get("date", "")
+    await unfreeze_results(t["id"])
     await db.tournaments.update_one({"slot": slot}, {"$set": update_data})
     return await db.tournaments.find_one({"slot": slot}, {"_id": 0})
 
@@ -553,21 +283,24 @@ async def admin_fetch_odds(slot: int, user_id: str = Query(...), body: dict = {}
         raise HTTPException(status_code=400, detail="Could not parse any odds from the pasted data")
     # Match to golfers
     golfers = t["golfers"]
+    known = await known_players(parsed_odds)
+    odds_by_espn_id = {}
+    for on, ov in parsed_odds.items():
+        player = known.get(name_key(on))
+        if player:
+            odds_by_espn_id.setdefault(player["espn_id"], ov)
+    matcher = NameMatcher(parsed_odds, name=lambda n: n, fuzzy=True)
     for g in golfers:
         name = g["name"]
         if name in parsed_odds:
             g["odds"] = parsed_odds[name]
+        elif str(g.get("espn_id")) in odds_by_espn_id:
+            g["odds"] = odds_by_espn_id[str(g["espn_id"])]
         else:
-            last = name.split()[-1] if name else ""
-            matched = False
-            for on, ov in parsed_odds.items():
-                if last and last.lower() in on.lower():
-                    g["odds"] = ov
-                    matched = True
-                    break
-            if not matched:
-                g["odds"] = 999
+            found, _ = matcher.match(name)
+            g["odds"] = parsed_odds[found] if found is not None else 999
     golfers = calc_prices(golfers)
+    await unfreeze_results(t["id"])
     await db.tournaments.update_one({"slot": slot}, {"$set": {"golfers": golfers, "status": "prices_set"}})
     return await db.tournaments.find_one({"slot": slot}, {"_id": 0})
 
@@ -584,6 +317,7 @@ async def admin_default_prices(slot: int, user_id: str = Query(...)):
         g["odds"] = g.get("odds") or 999
         g["world_ranking"] = i + 1
         price -= 3000
+    await unfreeze_results(t["id"])
     await db.tournaments.update_one({"slot": slot}, {"$set": {"golfers": golfers, "status": "prices_set"}})
     return await db.tournaments.find_one({"slot": slot}, {"_id": 0})
 
@@ -618,6 +352,13 @@ async def admin_upload_players(slot: int, user_id: str = Query(...), body: dict
                             "world_ranking": len(players) + 1, "odds": None, "price": price})
     if not players:
         raise HTTPException(status_code=400, detail="Could not parse any players. Use format: Name, Price (one per line)")
+    # Spellings confirmed by earlier ESPN syncs link straight to the ESPN player
+    known = await known_players(p["name"] for p in players)
+    for p in players:
+        player = known.get(name_key(p["name"]))
+        if player:
+            p["espn_id"], p["name"] = player["espn_id"], player["name"] or p["name"]
+    await unfreeze_results(t["id"])
     await db.tournaments.update_one({"slot": slot}, {"$set": {"golfers": players, "status": "prices_set"}})
     return await db.tournaments.find_one({"slot": slot}, {"_id": 0})
 
@@ -632,46 +373,43 @@ async def admin_espn_sync_preview(slot: int, user_id: str = Query(...)):
         raise HTTPException(status_code=400, detail="Map an ESPN event first")
     if not t.get("golfers"):
         raise HTTPException(status_code=400, detail="Upload players first")
-    espn_golfers, _ = await espn_get_field(t["espn_event_id"], t.get("start_date", ""))
+    espn_golfers, _ = await espn_field_for(t)
     if not espn_golfers:
         raise HTTPException(status_code=400, detail="ESPN field not available yet — try again when the field is posted")
     site_players = t["golfers"]
+    matcher = NameMatcher(espn_golfers, name=lambda eg: eg.name, key=lambda eg: eg.espn_id, fuzzy=True)
     used_espn_ids = set()
     matched = []
     unmatched_site = []
-    for sp in site_players:
-        site_norm = _normalize_name(sp['name'])
-        site_parts = site_norm.split()
-        site_last = site_parts[-1] if site_parts else ''
-        site_first_init = site_parts[0][0] if site_parts and site_parts[0] else ''
-        found = None
-        confidence = None
-        # Pass 1: exact normalized match
-        for eg in espn_golfers:
-            if eg['espn_id'] in used_espn_ids:
+    found = {}
+    # Players already linked, by this tournament or a confirmed alias, need no name matching
+    by_espn_id = {eg.espn_id: eg for eg in espn_golfers}
+    known = await known_players(sp['name'] for sp in site_players)
+    for i, sp in enumerate(site_players):
+        player = known.get(name_key(sp['name']))
+        espn_id = str(sp['espn_id']) if sp.get('espn_id') else player and player['espn_id']
+        eg = by_espn_id.get(espn_id)
+        if eg and eg.espn_id not in used_espn_ids:
+            found[i] = (eg, 'high')
+            used_espn_ids.add(eg.espn_id)
+    # Name matches claim their golfers before fuzzy matching sees the leftovers
+    for fuzzy in (False, True):
+        for i, sp in enumerate(site_players):
+            if i in found:
                 continue
-            if _normalize_name(eg['name']) == site_norm:
-                found, confidence = eg, 'high'
-                break
-        # Pass 2: last-name + first-initial match
-        if not found:
-            for eg in espn_golfers:
-                if eg['espn_id'] in used_espn_ids:
-                    continue
-                espn_parts = _normalize_name(eg['name']).split()
-                espn_last = espn_parts[-1] if espn_parts else ''
-                espn_first_init = espn_parts[0][0] if espn_parts and espn_parts[0] else ''
-                if site_last == espn_last and len(site_last) > 3 and site_first_init == espn_first_init:
-                    found, confidence = eg, 'medium'
-                    break
-        if found:
-            matched.append({'site_name': sp['name'], 'espn_id': found['espn_id'],
-                            'espn_name': found['name'], 'price': sp.get('price'), 'confidence': confidence})
-            used_espn_ids.add(found['espn_id'])
+            eg, confidence = matcher.match(sp['name'], exclude=used_espn_ids, fuzzy=fuzzy)
+            if eg:
+                found[i] = (eg, confidence)
+                used_espn_ids.add(eg.espn_id)
+    for i, sp in enumerate(site_players):
+        if i in found:
+            eg, confidence = found[i]
+            matched.append({'site_name': sp['name'], 'espn_id': eg.espn_id,
+                            'espn_name': eg.name, 'price': sp.get('price'), 'confidence': confidence})
         else:
             unmatched_site.append({'name': sp['name'], 'price': sp.get('price')})
-    unmatched_espn = [{'espn_id': eg['espn_id'], 'name': eg['name']}
-                      for eg in espn_golfers if eg['espn_id'] not in used_espn_ids]
+    unmatched_espn = [{'espn_id': eg.espn_id, 'name': eg.name}
+                      for eg in espn_golfers if eg.espn_id not in used_espn_ids]
     return {'matched': matched, 'unmatched_site': unmatched_site,
             'unmatched_espn': unmatched_espn, 'espn_total': len(espn_golfers)}
 
@@ -697,9 +435,14 @@ async def admin_espn_sync_confirm(slot: int, user_id: str = Query(...), body: di
     for add in add_from_espn:
         updated.append({'espn_id': add['espn_id'], 'name': add['espn_name'], 'short_name': '',
                         'world_ranking': len(updated) + 1, 'odds': None, 'price': add.get('price', 0)})
+    await learn_players([(m['site_name'], m['espn_id'], m['espn_name']) for m in matched]
+                        + [(x['espn_name'], x['espn_id'], x['espn_name']) for x in matched + add_from_espn])
     affected_teams = []
+    changed_teams = []
     if t.get("id") and (remove_from_site or matched):
-        teams = await db.teams.find({"tournament_id": t["id"]}, {"_id": 0}).to_list(500)
+        teams = await db.teams.find({"tournament_id": t["id"]},
+                                    {"_id": 0, "id": 1, "user_name": 1, "team_number": 1, "golfers": 1}).to_list(500)
+        now = datetime.now(timezone.utc).isoformat()
         for team in teams:
             removed = [g['name'] for g in team.get('golfers', []) if g.get('name') in remove_from_site]
             if removed:
@@ -716,7 +459,12 @@ async def admin_espn_sync_confirm(slot: int, user_id: str = Query(...), body: di
                 else:
                     new_golfers.append(g)
             if changed:
-                await db.teams.update_one({"id": team["id"]}, {"$set": {"golfers": new_golfers}})
+                changed_teams.append({"id": team["id"], "golfers": new_golfers, "updated_at": now})
+    # One bulk write for every relinked team rather than a request per team; only
+    # golfers change, so concurrent edits to other columns (or deletes) stand
+    await db.teams.update_many_by_id(changed_teams)
+    if t.get("id"):
+        await unfreeze_results(t["id"])
     await db.tournaments.update_one({"slot": slot}, {"$set": {"golfers": updated}})
     return {"success": True, "golfers_count": len(updated), "affected_teams": affected_teams}
 
@@ -730,6 +478,7 @@ async def admin_reset_tournament(slot: int, user_id: str = Query(...)):
         await db.teams.delete_many({"tournament_id": t["id"]})
         # Delete score cache
         await db.score_cache.delete_many({"tournament_id": t["id"]})
+        await unfreeze_results(t["id"])
     # Delete the tournament document completely
     await db.tournaments.delete_one({"slot": slot})
     # Create a fresh empty slot
@@ -782,14 +531,14 @@ async def admin_export_csv(slot: int, user_id: str = Query(...)):
     )
 
 @api_router.get("/admin/teams/{tournament_id}")
-async def admin_get_tournament_teams(tournament_id: str, user_id: str = Query(...)):
+async def admin_get_tournament_teams(tournament_id: str, request: Request, user_id: str = Query(...)):
     """Get all teams for a tournament (admin only)."""
     await check_admin(user_id)
     t = await db.tournaments.find_one({"id": tournament_id}, {"_id": 0})
     if not t:
         raise HTTPException(status_code=404, detail="Tournament not found")
     teams = await db.teams.find({"tournament_id": tournament_id}, {"_id": 0}).to_list(500)
-    return {"tournament": t, "teams": teams}
+    return plain_json_response({"tournament": t, "teams": teams}, request=request)
 
 class AdminTeamUpdate(BaseModel):
     golfers: List[Dict[str, Any]]
@@ -815,6 +564,7 @@ async def admin_update_team(team_id: str, data: AdminTeamUpdate, user_id: str =
         "updated_at": datetime.now(timezone.utc).isoformat(),
         "admin_modified": True
     }})
+    await unfreeze_results(team["tournament_id"])
     return await db.teams.find_one({"id": team_id}, {"_id": 0})
 
 @api_router.delete("/admin/teams/{team_id}")
@@ -825,6 +575,7 @@ async def admin_delete_team(team_id: str, user_id: str = Query(...)):
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     await db.teams.delete_one({"id": team_id})
+    await unfreeze_results(team["tournament_id"])
     return {"message": "Team deleted successfully"}
 
 @api_router.patch("/admin/teams/{team_id}/paid")
@@ -834,7 +585,8 @@ async def admin_set_team_paid(team_id: str, user_id: str = Query(...), paid: boo
     team = await db.teams.find_one({"id": team_id}, {"_id": 0})
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-    await db.teams.update_one({"id": team_id}, {"$set": {"paid": paid}})
+    await db.teams.update_one({"id": team_id}, {"$set": {"paid": paid, "updated_at": datetime.now(timezone.utc).isoformat()}})
+    await unfreeze_results(team["tournament_id"])
     return await db.teams.find_one({"id": team_id}, {"_id": 0})
 
 
@@ -842,14 +594,11 @@ async def admin_set_team_paid(team_id: str, user_id: str = Query(...), paid: boo
 async def debug_espn_raw(event_id: str):
     """Debug endpoint to see raw ESPN data for cut detection."""
     try:
-        import requests
-        
         # Try the leaderboard endpoint which should have full competitor data
-        url = f"https://site.api.espn.com/apis/site/v2/sports/golf/pga/leaderboard"
+        url = f"{ESPN_BASE}/leaderboard"
         params = {'event': event_id}
         
-        resp = requests.get(url, params=params, timeout=15)
-        data = resp.json()
+        data = await upstream.get_json(url, params=params)
         
         # Navigate the structure
         if 'events' not in data:
@@ -879,43 +628,59 @@ async def debug_espn_raw(event_id: str):
         import traceback
         return {"error": str(e), "traceback": traceback.format_exc()}
 
+@api_router.get("/debug/stats")
+async def debug_stats():
+    """In-process counters for score refreshes, ingestion, leaderboard snapshots and the DB read cache."""
+    return {"score_refresh": score_refreshes.stats(), "score_ingest": score_ingestor.stats(),
+            "leaderboard_snapshots": leaderboard_snapshots.stats(), "leaderboard_stream": leaderboard_stream.stats(),
+            "db_cache": db.cache_stats()}
+
 # ── Public Tournament Routes ──
 @api_router.get("/tournaments")
-async def get_tournaments():
+async def get_tournaments(request: Request):
     tournaments = await db.tournaments.find({}, {"_id": 0}).sort("slot", 1).to_list(4)
+    # Each tournament's teams_version carries its team count, so a poll that
+    # matches is answered before the list is built or encoded
+    team_versions = await asyncio.gather(*(teams_version(db.teams, t["id"]) for t in tournaments))
+    listed = [(t["id"], t["slot"], t["name"], t.get("start_date",""), t.get("end_date",""), t.get("deadline",""),
+               t.get("status","setup"), len(t.get("golfers",[])), any(g.get("price") for g in t.get("golfers",[])))
+              for t in tournaments]
+    etag = make_etag("tournaments", listed, team_versions)
+    if etag_matches(request, etag):
+        return not_modified(etag, LIST_CACHE_CONTROL)
     result = []
-    for t in tournaments:
-        tc = await db.teams.count_documents({"tournament_id": t["id"]})
+    for (tid, slot, name, start_date, end_date, deadline, status, golfer_count, has_prices), (tc, _) in zip(listed, team_versions):
         result.append({
-            "id": t["id"], "slot": t["slot"], "name": t["name"],
-            "start_date": t.get("start_date",""), "end_date": t.get("end_date",""),
-            "deadline": t.get("deadline",""), "status": t.get("status","setup"),
-            "golfer_count": len(t.get("golfers",[])), "team_count": tc,
-            "has_prices": any(g.get("price") for g in t.get("golfers",[]))
+            "id": tid, "slot": slot, "name": name,
+            "start_date": start_date, "end_date": end_date,
+            "deadline": deadline, "status": status,
+            "golfer_count": golfer_count, "team_count": tc,
+            "has_prices": has_prices
         })
-    return result
+    return json_bytes_response(encode_json(result), etag=etag, cache_control=LIST_CACHE_CONTROL, request=request)
 
 @api_router.get("/tournaments/{tid}")
 async def get_tournament(tid: str):
     t = await db.tournaments.find_one({"id": tid}, {"_id": 0})
     if not t: raise HTTPException(status_code=404, detail="Tournament not found")
     t["team_count"] = await db.teams.count_documents({"tournament_id": tid})
-    return t
+    return plain_json_response(t)
 
 # ── Team Routes ──
 @api_router.get("/teams/user/{user_id}")
 async def get_user_teams(user_id: str):
-    return await db.teams.find({"user_id": user_id}, {"_id": 0}).to_list(100)
+    return plain_json_response(await db.teams.find({"user_id": user_id}, {"_id": 0}).to_list(100))
 
 @api_router.get("/teams/tournament/{tournament_id}")
-async def get_tournament_teams(tournament_id: str):
-    return await db.teams.find({"tournament_id": tournament_id}, {"_id": 0}).to_list(500)
+async def get_tournament_teams(tournament_id: str, request: Request):
+    return plain_json_response(await db.teams.find({"tournament_id": tournament_id}, {"_id": 0}).to_list(500),
+                               request=request)
 
 @api_router.post("/teams")
 async def save_team(data: TeamCreate):
     user = await db.users.find_one({"id": data.user_id}, {"_id": 0})
     if not user: raise HTTPException(status_code=404, detail="User not found")
-    t = await db.tournaments.find_one({"id": data.tournament_id}, {"_id": 0})
+    t = await db.tournaments.find_one({"id": data.tournament_id}, {"_id": 0, "id": 1, "deadline": 1, "status": 1})
     if not t: raise HTTPException(status_code=404, detail="Tournament not found")
     deadline = t.get("deadline","")
     if deadline:
@@ -935,25 +700,30 @@ async def save_team(data: TeamCreate):
     total_cost = sum(g.get('price',0) for g in data.golfers)
     if total_cost > 1000000:
         raise HTTPException(status_code=400, detail="Over budget! Max $1,000,000")
-    existing = await db.teams.find_one({"user_id": data.user_id, "tournament_id": data.tournament_id, "team_number": data.team_number}, {"_id": 0})
+    existing = await db.teams.find_one({"user_id": data.user_id, "tournament_id": data.tournament_id, "team_number": data.team_number}, {"_id": 0, "id": 1})
     if existing:
         await db.teams.update_one({"id": existing["id"]}, {"$set": {
             "golfers": [dict(g) for g in data.golfers], "total_cost": total_cost,
             "user_name": user["name"], "updated_at": datetime.now(timezone.utc).isoformat()
         }})
+        if t.get("status") == "completed":
+            await unfreeze_results(t["id"])
         result = await db.teams.find_one({"id": existing["id"]}, {"_id": 0})
         return result
     else:
         count = await db.teams.count_documents({"user_id": data.user_id, "tournament_id": data.tournament_id})
         if count >= 2:
             raise HTTPException(status_code=400, detail="Maximum 2 teams per tournament")
+        now = datetime.now(timezone.utc).isoformat()
         team = {
             "id": gen_id(), "user_id": data.user_id, "user_name": user["name"],
             "user_email": user["email"], "tournament_id": data.tournament_id,
             "team_number": data.team_number, "golfers": [dict(g) for g in data.golfers],
-            "total_cost": total_cost, "created_at": datetime.now(timezone.utc).isoformat()
+            "total_cost": total_cost, "created_at": now, "updated_at": now
         }
         await db.teams.insert_one(team)
+        if t.get("status") == "completed":
+            await unfreeze_results(t["id"])
         return {k:v for k,v in team.items() if k != '_id'}
 
 @api_router.delete("/teams/{team_id}")
@@ -961,7 +731,7 @@ async def delete_team(team_id: str, user_id: str = Query(...)):
     team = await db.teams.find_one({"id": team_id}, {"_id": 0})
     if not team: raise HTTPException(status_code=404, detail="Team not found")
     if team["user_id"] != user_id: raise HTTPException(status_code=403, detail="Not your team")
-    t = await db.tournaments.find_one({"id": team["tournament_id"]}, {"_id": 0})
+    t = await db.tournaments.find_one({"id": team["tournament_id"]}, {"_id": 0, "deadline": 1, "status": 1})
     if t and t.get("deadline"):
         try:
             dl = datetime.fromisoformat(t["deadline"].replace('Z','+00:00'))
@@ -970,15 +740,102 @@ async def delete_team(team_id: str, user_id: str = Query(...)):
         except (ValueError, TypeError):
             pass
     await db.teams.delete_one({"id": team_id})
+    if t and t.get("status") == "completed":
+        await unfreeze_results(team["tournament_id"])
     return {"message": "Team deleted"}
 
 # ── Leaderboard ──
-@api_router.get("/leaderboard/{tournament_id}")
-async def get_leaderboard(tournament_id: str):
-    t = await db.tournaments.find_one({"id": tournament_id}, {"_id": 0})
+# Refreshes hold their result briefly so requests that read the stale cache
+# just before a refresh landed reuse it instead of starting another one.
+score_refreshes = SingleFlight(hold=5)
+# Rendered leaderboards, rebuilt only when scores, teams or tournament fields change
+leaderboard_snapshots = SnapshotStore()
+cup_race_snapshots = SnapshotStore(max_entries=1)
+# SSE fan-out; stream heartbeats share one staleness check per tournament per interval
+leaderboard_stream = LeaderboardBroadcaster()
+stream_refreshes = SingleFlight(hold=STREAM_HEARTBEAT_SECONDS)
+# Snapshot key last published to each tournament's stream
+stream_published_keys: Dict[str, Any] = {}
+snapshot_builds = SingleFlight()
+
+# Set to False once the database turns out not to have patch_score_cache
+score_patch_enabled = True
+
+async def write_score_cache(tournament_id, scores, last_updated):
+    """Persist fresh score rows, sending only the rows that changed when possible.
+
+    A patch applies only if the stored version is still the one this process
+    last indexed; otherwise, or for a changed field, the whole list is written."""
+    global score_patch_enabled
+    known = cached_score_index(tournament_id)
+    diff = diff_score_rows(known[1].scores, scores) if score_patch_enabled and known and known[0] else None
+    if diff is not None:
+        order, changed = diff
+        try:
+            patched = await db.score_cache.rpc("patch_score_cache", {
+                "p_tournament_id": tournament_id, "p_expected_last_updated": known[0],
+                "p_last_updated": last_updated, "p_order": order, "p_changed": changed,
+            }, {"tournament_id": tournament_id})
+            if patched:
+                return {"tournament_id": tournament_id, "scores": scores, "last_updated": last_updated}
+        except httpx.HTTPStatusError as ex:
+            if ex.response.status_code == 404:
+                score_patch_enabled = False
+            logger.warning(f"Score patch {tournament_id}: {ex}")
+    return await db.score_cache.find_one_and_update(
+        {"tournament_id": tournament_id},
+        {"$set": {"tournament_id": tournament_id, "scores": scores, "last_updated": last_updated}},
+        upsert=True)
+
+async def refresh_tournament_scores(t):
+    """Fetch live ESPN scores for a tournament and write them to score_cache.
+
+    Returns None when ESPN has no field yet, otherwise the fresh cache document,
+    the number of score rows and whether the event has gone final."""
+    tournament_id = t["id"]
+    golfers, raw = await espn_field_for(t)
+    if not golfers:
+        return None
+    scores = build_score_rows(golfers)
+    cache = await write_score_cache(tournament_id, scores, datetime.now(timezone.utc).isoformat())
+    # Build the next index now, from the one it replaces, so the diff base stays current
+    score_index_for(tournament_id, cache)
+    completed = False
+    events = raw.get('events',[])
+    if events:
+        st = events[0].get('status',{}).get('type',{}).get('name','')
+        if 'FINAL' in st.upper():
+            await db.tournaments.update_one({"id": tournament_id}, {"$set": {"status": "completed"}})
+            completed = True
+            await freeze_results_safely(tournament_id)
+    if leaderboard_stream.has_subscribers(tournament_id):
+        try:
+            await publish_leaderboard(tournament_id)
+        except Exception as ex:
+            logger.error(f"Stream publish: {ex}")
+    return {"cache": cache, "count": len(scores), "completed": completed}
+
+async def ingest_tournament_scores(t):
+    return await score_refreshes.do(t["id"], lambda: refresh_tournament_scores(t))
+
+async def list_tournaments_for_ingest():
+    return await db.tournaments.find({}, {"_id": 0, "id": 1, "espn_event_id": 1, "espn_query": 1, "status": 1, "start_date": 1}).to_list(10)
+
+score_ingestor = ScoreIngestor(list_tournaments_for_ingest, ingest_tournament_scores)
+
+async def load_leaderboard_tournament(tournament_id):
+    t = await db.tournaments.find_one({"id": tournament_id}, {"_id": 0, "id": 1, "name": 1, "status": 1, "espn_event_id": 1,
+                                                              "espn_query": 1, "start_date": 1, "end_date": 1})
     if not t: raise HTTPException(status_code=404, detail="Tournament not found")
+    return t
+
+async def load_leaderboard_inputs(tournament_id, refresh=True, t=None):
+    """Load a tournament and its score_cache, refreshing stale scores first in inline mode."""
+    if t is None:
+        t = await load_leaderboard_tournament(tournament_id)
     cache = await db.score_cache.find_one({"tournament_id": tournament_id}, {"_id": 0})
-    if t.get("espn_event_id") and t.get("status") not in ("setup", "golfers_loaded"):
+    # Outside inline mode the ingestor keeps score_cache fresh; reads never hit ESPN
+    if refresh and ingest_mode() == "inline" and t.get("espn_event_id") and t.get("status") not in ("setup", "golfers_loaded"):
         should_refresh = not cache
         if cache:
             try:
@@ -989,174 +846,246 @@ async def get_leaderboard(tournament_id: str):
                 should_refresh = True
         if should_refresh:
             try:
-                event_date = t.get("start_date", "")
-                golfers, raw = await espn_get_field(t["espn_event_id"], event_date)
-                if golfers:
-                    leader_score = None
-                    for g in golfers:
-                        if g.get("score_int") is not None and not g.get("is_cut"):
-                            if leader_score is None or g["score_int"] < leader_score:
-                                leader_score = g["score_int"]
-                    scores = []
-                    for g in golfers:
-                        sb = None
-                        if g.get("score_int") is not None and leader_score is not None and not g.get("is_cut"):
-                            sb = g["score_int"] - leader_score
-                        # Display "WD" for withdrawals, "CUT" for missed cuts, score otherwise
-                        if g.get("is_wd"):
-                            display_score = "WD"
-                        elif g.get("is_cut"):
-                            display_score = "CUT"
-                        else:
-                            display_score = g["score"]
-                        # Only show first 2 rounds for cut (not WD) players; WD may have mid-round data
-                        display_rounds = g["rounds"][:2] if g.get("is_cut") and not g.get("is_wd") else g["rounds"]
-
-                        scores.append({
-                            "espn_id": g["espn_id"], "name": g["name"], "position": str(g["order"]),
-                            "total_score": display_score, "score_int": g.get("score_int"),
-                            "rounds": display_rounds,
-                            "thru": g.get("thru",""), "is_cut": g.get("is_cut",False),
-                            "is_wd": g.get("is_wd",False),
-                            "is_active": g.get("is_active", False),
-                            "strokes_behind": sb if sb is not None else 999, "sort_order": g["order"]
-                        })
-                    await db.score_cache.update_one(
-                        {"tournament_id": tournament_id},
-                        {"$set": {"tournament_id": tournament_id, "scores": scores,
-                                  "last_updated": datetime.now(timezone.utc).isoformat()}},
-                        upsert=True)
-                    cache = await db.score_cache.find_one({"tournament_id": tournament_id}, {"_id": 0})
-                    events = raw.get('events',[])
-                    if events:
-                        st = events[0].get('status',{}).get('type',{}).get('name','')
-                        if 'FINAL' in st.upper():
-                            await db.tournaments.update_one({"id": tournament_id}, {"$set": {"status": "completed"}})
-                            t["status"] = "completed"
+                # Concurrent viewers of a stale leaderboard share one ESPN fetch + write
+                result = await score_refreshes.do(tournament_id, lambda: refresh_tournament_scores(t))
+                if result:
+                    cache = result["cache"]
+                    if result["completed"]:
+                        t["status"] = "completed"
             except Exception as ex:
                 logger.error(f"Auto-refresh: {ex}")
-    scores = cache.get("scores",[]) if cache else []
+    return t, cache
+
+async def leaderboard_snapshot_key(t, cache):
+    return snapshot_key(t, cache, await teams_version(db.teams, t["id"]))
+
+async def current_leaderboard_snapshot(t, cache, key):
+    snap = leaderboard_snapshots.get(t["id"], key)
+    if snap is None:
+        snap = await snapshot_builds.do((t["id"], key), lambda: build_leaderboard_snapshot(t, cache, key))
+    return snap
+
+@api_router.get("/leaderboard/{tournament_id}")
+async def get_leaderboard(tournament_id: str, request: Request):
+    t = await load_leaderboard_tournament(tournament_id)
+    if t.get("status") == "completed":
+        # Finalized events are served from their frozen results document
+        frozen = await load_frozen_results(tournament_id)
+        if frozen is not None:
+            etag = make_etag("leaderboard", tournament_id, "final", frozen.key)
+            if etag_matches(request, etag):
+                return not_modified(etag, FINAL_CACHE_CONTROL)
+            return json_bytes_response(frozen.body, etag=etag, cache_control=FINAL_CACHE_CONTROL,
+                                       request=request, compressed=frozen.compressed)
+    t, cache = await load_leaderboard_inputs(tournament_id, t=t)
+    key = await leaderboard_snapshot_key(t, cache)
+    etag = make_etag("leaderboard", tournament_id, key)
+    cache_control = FINAL_CACHE_CONTROL if t.get("status") == "completed" else LIVE_CACHE_CONTROL
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    snap = await current_leaderboard_snapshot(t, cache, key)
+    if t.get("status") == "completed":
+        # Completed before the archive existed, or unfrozen by a later write
+        await freeze_results_safely(tournament_id)
+    return json_bytes_response(snap.body, etag=etag, cache_control=cache_control,
+                               request=request, compressed=snap.compressed)
+
+async def publish_leaderboard(tournament_id, t=None, cache=None, key=None):
+    """Render the current leaderboard and push any changes to stream subscribers."""
+    if t is None:
+        t, cache = await load_leaderboard_inputs(tournament_id, refresh=False)
+    if key is None:
+        key = await leaderboard_snapshot_key(t, cache)
+    snap = await current_leaderboard_snapshot(t, cache, key)
+    leaderboard_stream.publish(tournament_id, snap.payload, score_index_for(tournament_id, cache).scores)
+    stream_published_keys[tournament_id] = key
+
+async def keep_stream_fresh(tournament_id):
+    """Heartbeat check: refresh stale scores (inline mode only), then publish if the
+    leaderboard's inputs changed since the last publish, e.g. scores written by an
+    ingestor in another process."""
+    try:
+        t, cache = await load_leaderboard_inputs(tournament_id)
+        key = await leaderboard_snapshot_key(t, cache)
+        if key != stream_published_keys.get(tournament_id):
+            await publish_leaderboard(tournament_id, t, cache, key)
+    except Exception as ex:
+        logger.error(f"Stream refresh: {ex}")
+
+@api_router.get("/leaderboard/{tournament_id}/stream")
+async def stream_leaderboard(tournament_id: str, request: Request):
+    """Live leaderboard over Server-Sent Events.
+
+    Sends a full "snapshot" event on connect (or replays missed "delta" events
+    when Last-Event-ID is still in the history), then a "delta" event with the
+    changed golfer rows and team standings whenever new scores are ingested.
+    Comment heartbeats keep idle connections open and trigger the shared check
+    for new scores: refreshed from ESPN when stale in inline ingest mode, read
+    from score_cache as the ingestor wrote them otherwise."""
+    t, cache = await load_leaderboard_inputs(tournament_id)
+    sub = leaderboard_stream.subscribe(tournament_id)
+    try:
+        last_event_id = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+        backlog = leaderboard_stream.replay(tournament_id, last_event_id)
+        if backlog is None:
+            snap = await current_leaderboard_snapshot(t, cache, await leaderboard_snapshot_key(t, cache))
+            leaderboard_stream.prime(tournament_id, snap.payload, score_index_for(tournament_id, cache).scores)
+            backlog = [leaderboard_stream.snapshot_frame(tournament_id, snap.body)]
+    except BaseException:
+        leaderboard_stream.unsubscribe(sub)
+        raise
+
+    async def events():
+        try:
+            yield STREAM_RETRY
+            for frame in backlog:
+                yield frame
+            while True:
+                if sub.overflowed:
+                    # Fell too far behind: discard queued deltas and resync with a snapshot
+                    sub.drain()
+                    t_now, cache_now = await load_leaderboard_inputs(tournament_id)
+                    snap = await current_leaderboard_snapshot(t_now, cache_now, await leaderboard_snapshot_key(t_now, cache_now))
+                    yield leaderboard_stream.snapshot_frame(tournament_id, snap.body)
+                    continue
+                try:
+                    frame = await asyncio.wait_for(sub.queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    asyncio.ensure_future(stream_refreshes.do(tournament_id, lambda: keep_stream_fresh(tournament_id)))
+                    yield STREAM_HEARTBEAT
+                    continue
+                yield frame
+        finally:
+            leaderboard_stream.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+async def build_leaderboard_snapshot(t, cache, key):
+    """Render and encode a tournament's leaderboard once for a given snapshot key."""
+    tournament_id = t["id"]
     last_updated = cache.get("last_updated","") if cache else ""
     teams = await db.teams.find({"tournament_id": tournament_id}, {"_id": 0}).to_list(500)
-    # Pre-calculate tied scores for all golfers
-    tied_map = calc_tied_scores(scores) if scores else {}
+    # Shared per-cache-version index: O(1) golfer lookups and precomputed tied scores
+    index = score_index_for(tournament_id, cache)
+    # Teams whose row and golfers' scores are unchanged since the last build keep their entry
+    previous = leaderboard_snapshots.latest(tournament_id)
     team_standings = []
+    team_parts = {}
     for team in teams:
-        tp = 0
-        gd = []
-        for golfer in team.get("golfers",[]):
-            sd = None
-            for s in scores:
-                if s.get("name","").lower() == golfer.get("name","").lower() or s.get("espn_id") == golfer.get("espn_id"):
-                    sd = s
-                    break
-            if sd:
-                name_key = sd.get("name","").lower()
-                espn_key = sd.get("espn_id","")
-                tied_data = tied_map.get(name_key) or tied_map.get(espn_key)
-                if tied_data and not sd.get("is_cut"):
-                    pp = tied_data['place_points']
-                    sp = tied_data['stroke_points']
-                    tot = tied_data['total_points']
-                    position = tied_data['position']
-                    sb_val = tied_data['strokes_behind']
-                    # Players who made the cut earn a minimum of 5 points
-                    if tot < 5:
-                        tot = 5
-                else:
-                    pp = 0
-                    sp = 0
-                    tot = 0
-                    if sd.get("is_wd"):
-                        position = "WD"
-                    elif sd.get("is_cut"):
-                        position = sd.get("position", "CUT")
-                    else:
-                        position = sd.get("position", "-")
-                    sb_val = sd.get("strokes_behind", 0)
-
-                gd.append({**golfer, "position": position, "total_score": sd.get("total_score",""),
-                          "score_int": sd.get("score_int"),
-                          "rounds": sd.get("rounds",[]), "thru": sd.get("thru",""),
-                          "is_active": sd.get("is_active",False), "is_cut": sd.get("is_cut",False),
-                          "is_wd": sd.get("is_wd",False),
-                          "strokes_behind": sb_val, "place_points": round(pp, 1), "stroke_points": sp,
-                          "total_points": round(tot, 1), "sort_order": sd.get("sort_order", 999)})
-                tp += tot
-            else:
-                gd.append({**golfer, "position":"-","total_score":"-","rounds":[],"thru":"",
-                          "is_active":False,"is_cut":False,"strokes_behind":0,"place_points":0,"stroke_points":0,"total_points":0,"sort_order":9999})
-        # Sort: active/non-cut players by total_points desc, then cut players by sort_order (finish position) asc
-        gd.sort(key=lambda x: (1 if x.get("is_cut") else 0, -x["total_points"] if not x.get("is_cut") else x.get("sort_order", 9999)))
-        team_standings.append({
-            "team_id": team["id"], "user_name": team["user_name"], "team_number": team["team_number"],
-            "team_name": f"{team['user_name']} #{team['team_number']}", "golfers": gd, "total_points": tp, "paid": team.get("paid", False)
-        })
+        reused = previous.teams.get(team["id"]) if previous and previous.index is not None else None
+        if reused and reused[0] == team and all(index.unchanged_since(previous.index, g) for g in team.get("golfers",[])):
+            entry = {**reused[1]}
+        else:
+            gd, tp = index.score_team(team.get("golfers",[]))
+            # Sort: active/non-cut players by total_points desc, then cut players by sort_order (finish position) asc
+            gd.sort(key=lambda x: (1 if x.is_cut else 0, -x.total_points if not x.is_cut else x.sort_order))
+            entry = {
+                "team_id": team["id"], "user_name": team["user_name"], "team_number": team["team_number"],
+                "team_name": f"{team['user_name']} #{team['team_number']}", "golfers": [r.as_dict() for r in gd],
+                "total_points": tp, "paid": team.get("paid", False)
+            }
+        team_parts[team["id"]] = (team, entry)
+        team_standings.append(entry)
     team_standings.sort(key=lambda x: x["total_points"], reverse=True)
     for i, ts in enumerate(team_standings):
         ts["rank"] = i + 1
     # Build top 25 with tied positions
-    top25_scores = [s for s in scores if not s.get("is_cut",False) and s.get("score_int") is not None]
+    top25_scores = [s for s in index.scores if not s.get("is_cut",False) and s.get("score_int") is not None]
     top25_scores.sort(key=lambda x: x.get("score_int", 999))
     top25 = []
     for s in top25_scores[:25]:
-        name_key = s.get("name","").lower()
-        espn_key = s.get("espn_id","")
-        tied_data = tied_map.get(name_key) or tied_map.get(espn_key) or {}
+        tied_data = index.tied_for(s) or {}
         top25.append({**s, "position": tied_data.get("position", s.get("position","")),
                       "fantasy_points": round(tied_data.get("total_points", 0), 1)})
-    return {
+    payload = {
         "tournament": {"id": t["id"], "name": t["name"], "status": t.get("status",""),
                        "start_date": t.get("start_date",""), "end_date": t.get("end_date","")},
         "team_standings": team_standings, "tournament_standings": top25,
         "last_updated": last_updated, "is_finalized": t.get("status") == "completed"
     }
+    snap = leaderboard_snapshots.put(tournament_id, Snapshot(key, encode_json(payload), payload, index, team_parts))
+    leaderboard_stream.publish(tournament_id, payload, index.scores)
+    return snap
+
+# ── Results Archive ──
+# One immutable, pre-rendered leaderboard per finalized tournament. Any write
+# that could change what it shows drops it: admin edits, manager team writes,
+# and profile renames, since team_standings carry the denormalized user_name.
+# The next completed read freezes the results again.
+frozen_results = SnapshotStore(max_entries=16)
+
+def results_year(t):
+    for field in ("end_date", "start_date"):
+        value = str(t.get(field) or "")
+        if value[:4].isdigit():
+            return int(value[:4])
+    return datetime.now(timezone.utc).year
+
+async def freeze_results(tournament_id):
+    """Write the results document for a completed tournament, unless it already exists."""
+    if await db.results_archive.find_one({"tournament_id": tournament_id}, {"tournament_id": 1}):
+        return
+    t, cache = await load_leaderboard_inputs(tournament_id, refresh=False)
+    if t.get("status") != "completed":
+        return
+    snap = await current_leaderboard_snapshot(t, cache, await leaderboard_snapshot_key(t, cache))
+    finalized_at = datetime.now(timezone.utc).isoformat()
+    await db.results_archive.update_one({"tournament_id": tournament_id}, {"$set": {
+        "tournament_name": t.get("name", ""), "year": results_year(t), "finalized_at": finalized_at,
+        "winners": [ts["user_name"] for ts in snap.payload["team_standings"][:3]],
+        "leaderboard": snap.payload}}, upsert=True)
+    frozen_results.put(tournament_id, Snapshot(finalized_at, snap.body, snap.payload))
+
+async def freeze_results_safely(tournament_id):
+    try:
+        await snapshot_builds.do(("freeze", tournament_id), lambda: freeze_results(tournament_id))
+    except Exception as ex:
+        logger.error(f"Freeze results {tournament_id}: {ex}")
+
+async def load_frozen_results(tournament_id):
+    """The frozen leaderboard for a tournament as a Snapshot keyed by finalized_at, or None."""
+    try:
+        row = await db.results_archive.find_one({"tournament_id": tournament_id}, {"finalized_at": 1})
+    except httpx.HTTPStatusError as ex:
+        # Archive table not migrated yet: fall back to rendering from score_cache
+        logger.warning(f"Results archive: {ex}")
+        return None
+    if not row:
+        return None
+    snap = frozen_results.get(tournament_id, row["finalized_at"])
+    if snap is None:
+        doc = await db.results_archive.find_one({"tournament_id": tournament_id}, {"finalized_at": 1, "leaderboard": 1})
+        if not doc:
+            return None
+        snap = frozen_results.put(tournament_id, Snapshot(doc["finalized_at"], encode_json(doc["leaderboard"]), doc["leaderboard"]))
+    return snap
+
+async def unfreeze_results(tournament_id):
+    frozen_results.discard(tournament_id)
+    try:
+        await db.results_archive.delete_many({"tournament_id": tournament_id})
+    except httpx.HTTPStatusError as ex:
+        logger.warning(f"Results archive: {ex}")
+
+async def unfreeze_completed(tournament_ids):
+    """Unfreeze the completed ones among ``tournament_ids`` after a write to their teams."""
+    ids = list(tournament_ids)
+    if not ids:
+        return
+    rows = await db.tournaments.find({"id": {"$in": ids}, "status": "completed"}, {"_id": 0, "id": 1}).to_list(len(ids))
+    await asyncio.gather(*(unfreeze_results(row["id"]) for row in rows))
 
 @api_router.post("/scores/refresh/{tournament_id}")
 async def manual_refresh(tournament_id: str, user_id: Optional[str] = Query(None)):
-    t = await db.tournaments.find_one({"id": tournament_id}, {"_id": 0})
+    t = await db.tournaments.find_one({"id": tournament_id}, {"_id": 0, "id": 1, "espn_event_id": 1, "espn_query": 1, "start_date": 1})
     if not t: raise HTTPException(status_code=404, detail="Tournament not found")
     if not t.get("espn_event_id"): raise HTTPException(status_code=400, detail="No ESPN event mapped")
-    event_date = t.get("start_date", "")
-    golfers, raw = await espn_get_field(t["espn_event_id"], event_date)
-    if not golfers: raise HTTPException(status_code=400, detail="Could not fetch scores")
-    leader_score = None
-    for g in golfers:
-        if g.get("score_int") is not None and not g.get("is_cut"):
-            if leader_score is None or g["score_int"] < leader_score:
-                leader_score = g["score_int"]
-    scores_list = []
-    for g in golfers:
-        sb = None
-        if g.get("score_int") is not None and leader_score is not None and not g.get("is_cut"):
-            sb = g["score_int"] - leader_score
-        if g.get("is_wd"):
-            display_score = "WD"
-        elif g.get("is_cut"):
-            display_score = "CUT"
-        else:
-            display_score = g["score"]
-        display_rounds = g["rounds"][:2] if g.get("is_cut") and not g.get("is_wd") else g["rounds"]
-        scores_list.append({
-            "espn_id": g["espn_id"], "name": g["name"], "position": str(g["order"]),
-            "total_score": display_score, "score_int": g.get("score_int"),
-            "rounds": display_rounds,
-            "thru": g.get("thru",""), "is_cut": g.get("is_cut",False),
-            "is_wd": g.get("is_wd",False),
-            "is_active": g.get("is_active", False),
-            "strokes_behind": sb if sb is not None else 999, "sort_order": g["order"]
-        })
-    await db.score_cache.update_one(
-        {"tournament_id": tournament_id},
-        {"$set": {"tournament_id": tournament_id, "scores": scores_list,
-                  "last_updated": datetime.now(timezone.utc).isoformat()}},
-        upsert=True)
-    events = raw.get('events',[])
-    if events:
-        st = events[0].get('status',{}).get('type',{}).get('name','')
-        if 'FINAL' in st.upper():
-            await db.tournaments.update_one({"id": tournament_id}, {"$set": {"status": "completed"}})
-    return {"message": "Scores refreshed", "count": len(scores_list)}
+    result = await score_refreshes.do(tournament_id, lambda: refresh_tournament_scores(t))
+    if not result: raise HTTPException(status_code=400, detail="Could not fetch scores")
+    return {"message": "Scores refreshed", "count": result["count"]}
 
 # ── History ──
 HISTORY = [
@@ -1181,84 +1110,129 @@ HISTORY = [
     {"year":2016,"tournaments":[{"name":"Masters","winners":["Dylan Frank","Andrew David","Curtis David"]}]},
 ]
 
+def history_with_results(archived):
+    """HISTORY plus finalized tournaments it doesn't list yet, newest first within each year."""
+    years = {entry["year"]: {"year": entry["year"], "tournaments": list(entry["tournaments"])} for entry in HISTORY}
+    for row in sorted(archived, key=lambda r: r.get("finalized_at", "")):
+        if not row.get("tournament_name") or not row.get("winners"):
+            continue
+        year = years.setdefault(row["year"], {"year": row["year"], "tournaments": []})
+        if any(entry["name"] == row["tournament_name"] for entry in year["tournaments"]):
+            continue
+        year["tournaments"].insert(0, {"name": row["tournament_name"], "winners": row["winners"]})
+    return sorted(years.values(), key=lambda y: y["year"], reverse=True)
+
 @api_router.get("/history")
 async def get_history():
-    return HISTORY
+    try:
+        archived = await db.results_archive.find({}, {"_id": 0, "tournament_name": 1, "year": 1, "winners": 1,
+                                                       "finalized_at": 1}).to_list(200)
+    except httpx.HTTPStatusError as ex:
+        logger.warning(f"Results archive: {ex}")
+        archived = []
+    return history_with_results(archived)
+
+async def frozen_results_versions(tournament_ids):
+    """finalized_at per tournament whose results are frozen."""
+    if not tournament_ids:
+        return {}
+    try:
+        rows = await db.results_archive.find({"tournament_id": {"$in": tournament_ids}},
+                                             {"_id": 0, "tournament_id": 1, "finalized_at": 1}).to_list(len(tournament_ids))
+    except httpx.HTTPStatusError as ex:
+        logger.warning(f"Results archive: {ex}")
+        return {}
+    return {row["tournament_id"]: row["finalized_at"] for row in rows}
+
+async def cup_race_slot_versions(tournaments):
+    """Score and team versions for each tournament's contribution to the cup race.
+
+    Completed tournaments with frozen results are versioned by finalized_at
+    instead of a teams read: every team write on a finished event, by an admin,
+    a manager or a profile rename, unfreezes it."""
+    ids = [t["id"] for t in tournaments]
+    completed = [t["id"] for t in tournaments if t.get("status") == "completed"]
+    live = [tid for tid in ids if tid not in completed]
+    caches, frozen, *live_versions = await asyncio.gather(
+        db.score_cache.find({"tournament_id": {"$in": ids}}, {"_id": 0, "tournament_id": 1, "last_updated": 1}).to_list(len(ids)),
+        frozen_results_versions(completed),
+        *(teams_version(db.teams, tid) for tid in live))
+    versions = dict(zip(live, live_versions))
+    versions.update({tid: ("final", finalized_at) for tid, finalized_at in frozen.items()})
+    unfrozen = [tid for tid in completed if tid not in frozen]
+    versions.update(zip(unfrozen, await asyncio.gather(*(teams_version(db.teams, tid) for tid in unfrozen))))
+    last_updated = {c["tournament_id"]: c.get("last_updated", "") for c in caches}
+    return tuple((t["id"], t.get("slot"), t.get("name"), t.get("status"), last_updated.get(t["id"], ""), versions[t["id"]])
+                 for t in tournaments)
 
 @api_router.get("/cup-race")
-async def get_cup_race():
-    tournaments = await db.tournaments.find({}, {"_id": 0}).to_list(10)
-    tournaments.sort(key=lambda x: x.get("slot", 99))
+async def get_cup_race(request: Request):
+    tournaments = await db.tournaments.find({}, {"_id": 0, "id": 1, "name": 1, "slot": 1, "status": 1}).sort("slot", 1).to_list(10)
+    key = await cup_race_slot_versions(tournaments) if tournaments else ()
+    etag = make_etag("cup-race", key)
+    if etag_matches(request, etag):
+        return not_modified(etag, LIST_CACHE_CONTROL)
+    snap = cup_race_snapshots.get("cup-race", key)
+    if snap is None:
+        snap = await snapshot_builds.do(("cup-race", key), lambda: build_cup_race_snapshot(tournaments, key))
+    return json_bytes_response(snap.body, etag=etag, cache_control=LIST_CACHE_CONTROL,
+                               request=request, compressed=snap.compressed)
+
+# Completed tournaments never rescore: their per-manager best teams are kept
+# until the slot's version (scores or teams) changes, e.g. after an admin edit
+completed_cup_slots: Dict[str, Any] = {}
+
+def cup_race_slot_contribution(tournament_id, cache, teams):
+    """Each manager's best team in one tournament: {user_id: (user_name, points, golfer rows)}."""
+    index = score_index_for(tournament_id, cache)
+    best: Dict[str, Any] = {}
+    for team in teams:
+        uid = team["user_id"]
+        rows, tp = index.score_team(team.get("golfers", []))
+        tp = round(tp, 1)
+        if uid not in best:
+            best[uid] = (team["user_name"], -1, [])
+        if tp > best[uid][1]:
+            best[uid] = (best[uid][0], tp, [{
+                "name": r.name,
+                "position": r.position,
+                "place_points": r.place_points,
+                "stroke_points": r.stroke_points,
+                "total_points": r.total_points,
+                "is_cut": r.is_cut,
+                "is_wd": r.is_wd,
+            } for r in rows])
+    return best
+
+async def build_cup_race_snapshot(tournaments, key):
+    versions = {version[0]: version for version in key}
+    contributions = {}
+    for t in tournaments:
+        cached = completed_cup_slots.get(t["id"])
+        if cached and cached[0] == versions[t["id"]]:
+            contributions[t["id"]] = cached[1]
+    live_ids = [t["id"] for t in tournaments if t["id"] not in contributions]
+    if live_ids:
+        # Teams are read per tournament: one $in read would hit the row cap
+        # PostgREST puts on a single response and silently drop teams
+        caches, *teams = await asyncio.gather(
+            db.score_cache.find({"tournament_id": {"$in": live_ids}}, {"_id": 0}).to_list(len(live_ids)),
+            *(db.teams.find({"tournament_id": tid}, {"_id": 0, "user_id": 1, "user_name": 1, "golfers": 1}).to_list(500)
+              for tid in live_ids))
+        cache_by_tournament = {c["tournament_id"]: c for c in caches}
+        teams_by_tournament = dict(zip(live_ids, teams))
+        for t in tournaments:
+            tid = t["id"]
+            if tid not in live_ids:
+                continue
+            contributions[tid] = cup_race_slot_contribution(tid, cache_by_tournament.get(tid), teams_by_tournament[tid])
+            if t.get("status") == "completed":
+                completed_cup_slots[tid] = (versions[tid], contributions[tid])
 
     manager_data: Dict[str, Any] = {}
-
     for t in tournaments:
-        tid = t["id"]
         slot = t.get("slot", 0)
-        t_name = t.get("name", f"Event {slot}")
-
-        cache = await db.score_cache.find_one({"tournament_id": tid}, {"_id": 0})
-        scores = cache.get("scores", []) if cache else []
-        tied_map = calc_tied_scores(scores) if scores else {}
-
-        teams = await db.teams.find({"tournament_id": tid}, {"_id": 0}).to_list(500)
-
-        for team in teams:
-            uid = team["user_id"]
-            uname = team["user_name"]
-            tp = 0.0
-            gd = []
-
-            for golfer in team.get("golfers", []):
-                sd = None
-                for s in scores:
-                    if s.get("name", "").lower() == golfer.get("name", "").lower() or \
-                       s.get("espn_id") == golfer.get("espn_id"):
-                        sd = s
-                        break
-
-                if sd:
-                    name_key = sd.get("name", "").lower()
-                    espn_key = sd.get("espn_id", "")
-                    tied_data = tied_map.get(name_key) or tied_map.get(espn_key)
-                    if tied_data and not sd.get("is_cut"):
-                        tot = max(5.0, tied_data["total_points"])
-                        position = tied_data["position"]
-                        pp = tied_data["place_points"]
-                        sp = tied_data["stroke_points"]
-                    else:
-                        tot = 0.0
-                        pp = 0.0
-                        sp = 0
-                        if sd.get("is_wd"):
-                            position = "WD"
-                        elif sd.get("is_cut"):
-                            position = sd.get("position", "CUT")
-                        else:
-                            position = sd.get("position", "-")
-                    gd.append({
-                        "name": golfer.get("name", ""),
-                        "position": position,
-                        "place_points": round(pp, 1),
-                        "stroke_points": sp,
-                        "total_points": round(tot, 1),
-                        "is_cut": sd.get("is_cut", False),
-                        "is_wd": sd.get("is_wd", False),
-                    })
-                    tp += tot
-                else:
-                    gd.append({
-                        "name": golfer.get("name", ""),
-                        "position": "-",
-                        "place_points": 0,
-                        "stroke_points": 0,
-                        "total_points": 0,
-                        "is_cut": False,
-                        "is_wd": False,
-                    })
-
-            tp = round(tp, 1)
-
+        for uid, (uname, tp, gd) in contributions[t["id"]].items():
             if uid not in manager_data:
                 manager_data[uid] = {
                     "user_id": uid,
@@ -1266,7 +1240,6 @@ async def get_cup_race():
                     "slot_scores": {},
                     "slot_teams": {},
                 }
-
             current_best = manager_data[uid]["slot_scores"].get(slot, -1)
             if tp > current_best:
                 manager_data[uid]["slot_scores"][slot] = tp
@@ -1292,7 +1265,8 @@ async def get_cup_race():
     for i, s in enumerate(standings):
         s["rank"] = i + 1
 
-    return {"tournaments": t_meta, "standings": standings}
+    payload = {"tournaments": t_meta, "standings": standings}
+    return cup_race_snapshots.put("cup-race", Snapshot(key, encode_json(payload), payload))
 
 
 @api_router.get("/")
@@ -1321,8 +1295,12 @@ async def startup():
     await db.teams.create_index("id", unique=True)
     await db.teams.create_index([("user_id",1),("tournament_id",1)])
     await db.score_cache.create_index("tournament_id", unique=True)
+    if ingest_mode() == "background":
+        score_ingestor.start()
     logger.info("FairwayFantasy API started")
 
 @app.on_event("shutdown")
 async def shutdown():
-    client.close()
+    await score_ingestor.stop()
+    await upstream.close()
+    await client.close()
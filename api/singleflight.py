@@ -0,0 +1,52 @@
+"""Per-key request coalescing for expensive refreshes."""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result.
+
+    The call runs in its own task, so a caller that disconnects does not cancel
+    the refresh for everyone else. With ``hold`` > 0 a successful result is also
+    handed to callers arriving within that many seconds after it finished, which
+    absorbs requests that read a stale cache just before the refresh landed.
+    """
+
+    def __init__(self, hold: float = 0):
+        self.hold = hold
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._recent: Dict[Hashable, Tuple[float, Any]] = {}
+        self.executed = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            recent = self._recent.get(key)
+            if recent and time.monotonic() - recent[0] < self.hold:
+                self.coalesced += 1
+                return recent[1]
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.errors += 1
+            self._recent.pop(key, None)
+        elif self.hold > 0:
+            self._recent[key] = (time.monotonic(), task.result())
+
+    def stats(self) -> Dict[str, int]:
+        return {"executed": self.executed, "coalesced": self.coalesced,
+                "errors": self.errors, "in_flight": len(self._in_flight)}
@@ -0,0 +1,79 @@
+"""Materialized leaderboard snapshots.
+
+A snapshot is the fully rendered, JSON-encoded leaderboard for one
+tournament, keyed by everything it was computed from: the score_cache
+version, a version stamp of the tournament's teams and the tournament fields
+shown in the response. Reads with an unchanged key are served straight
+from the stored bytes.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+async def teams_version(teams: Any, tournament_id: str) -> Tuple[int, str]:
+    """Version stamp of a tournament's teams: their count and latest updated_at.
+
+    Every team write stamps updated_at (supabase_schema.sql's trigger enforces
+    it), so inserts and edits raise the latest stamp and deletes lower the
+    count. One aggregate read instead of fetching every row."""
+    count, latest = await teams.count_and_max({"tournament_id": tournament_id}, "updated_at")
+    return count, str(latest or "")
+
+
+class Snapshot:
+    """One rendered leaderboard.
+
+    ``index`` and ``teams`` (team id -> (team row, standing entry)) record
+    what it was built from, so the next build can reuse unchanged teams.
+    ``compressed`` holds ``body`` per content encoding once a client asked for it.
+    """
+    __slots__ = ("key", "body", "payload", "index", "teams", "compressed")
+
+    def __init__(self, key: Hashable, body: bytes, payload: Dict[str, Any], index: Any = None,
+                 teams: Optional[Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]] = None):
+        self.key = key
+        self.body = body
+        self.payload = payload
+        self.index = index
+        self.teams = teams or {}
+        self.compressed: Dict[str, bytes] = {}
+
+
+class SnapshotStore:
+    """Latest snapshot per tournament, bounded LRU across tournaments."""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Snapshot]" = OrderedDict()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, tournament_id: str, key: Hashable) -> Optional[Snapshot]:
+        snap = self._entries.get(tournament_id)
+        if snap is None or snap.key != key:
+            return None
+        self._entries.move_to_end(tournament_id)
+        self.hits += 1
+        return snap
+
+    def latest(self, tournament_id: str) -> Optional[Snapshot]:
+        return self._entries.get(tournament_id)
+
+    def put(self, tournament_id: str, snap: Snapshot) -> Snapshot:
+        self.builds += 1
+        self._entries[tournament_id] = snap
+        self._entries.move_to_end(tournament_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return snap
+
+    def discard(self, tournament_id: str):
+        self._entries.pop(tournament_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "builds": self.builds}
+
+
+def snapshot_key(t: Dict[str, Any], cache: Optional[Dict[str, Any]], team_version: Hashable) -> Tuple:
+    return (cache.get("last_updated", "") if cache else "", team_version,
+            t.get("name", ""), t.get("status", ""), t.get("start_date", ""), t.get("end_date", ""))
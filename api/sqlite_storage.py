@@ -0,0 +1,343 @@
+"""SQLite storage backend with the same table surface as SupabaseMongoCompat.
+
+Tables mirror supabase_schema.sql column for column: text and integer
+columns are stored natively, booleans as 0/1, and jsonb columns as JSON
+text, so rows come back exactly as PostgREST returns them (every column,
+null when unset). The columns the app looks rows up by (ids, tournament_id,
+user_id, email, slot) are indexed, projections read only the columns they
+name, and upserts are native ``INSERT ... ON CONFLICT``. Needs SQLite 3.35+
+for ``RETURNING``.
+
+Queries run synchronously on the event loop: against a local database they
+take microseconds, well under the cost of a thread hop. No call awaits
+between statements, so read-modify-write sequences cannot interleave.
+"""
+import json
+import sqlite3
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Column kinds: how values are stored and decoded
+TEXT, INT, BOOL, JSON = "text", "int", "bool", "json"
+
+_NOW = "(strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))"
+
+# Per table: columns as (name, kind, default SQL or None), primary key, and the
+# (unique, columns) indexes created with it
+TABLES: Dict[str, Dict[str, Any]] = {
+    "users": {
+        "columns": [("id", TEXT, None), ("name", TEXT, None), ("email", TEXT, None), ("pin", TEXT, None),
+                    ("is_admin", BOOL, "0"), ("created_at", TEXT, _NOW)],
+        "key": "id",
+        "indexes": [(True, ("email",)), (True, ("pin",))],
+    },
+    "tournaments": {
+        "columns": [("id", TEXT, None), ("slot", INT, None), ("name", TEXT, "''"), ("espn_event_id", TEXT, "''"),
+                    ("odds_sport_key", TEXT, "''"), ("start_date", TEXT, "''"), ("end_date", TEXT, "''"),
+                    ("deadline", TEXT, "''"), ("golfers", JSON, "'[]'"), ("status", TEXT, "'setup'"),
+                    ("created_at", TEXT, _NOW), ("espn_query", JSON, None)],
+        "key": "id",
+        "indexes": [(True, ("slot",))],
+    },
+    "teams": {
+        "columns": [("id", TEXT, None), ("user_id", TEXT, None), ("user_name", TEXT, None), ("user_email", TEXT, None),
+                    ("tournament_id", TEXT, None), ("team_number", INT, None), ("golfers", JSON, "'[]'"),
+                    ("total_cost", INT, "0"), ("created_at", TEXT, _NOW), ("updated_at", TEXT, None),
+                    ("admin_modified", BOOL, "0"), ("paid", BOOL, "0")],
+        "key": "id",
+        "indexes": [(False, ("tournament_id",)), (False, ("user_id", "tournament_id")),
+                    (True, ("user_id", "tournament_id", "team_number"))],
+    },
+    "score_cache": {
+        "columns": [("tournament_id", TEXT, None), ("scores", JSON, "'[]'"), ("last_updated", TEXT, "''")],
+        "key": "tournament_id",
+        "indexes": [],
+    },
+    "results_archive": {
+        "columns": [("tournament_id", TEXT, None), ("tournament_name", TEXT, "''"), ("year", INT, None),
+                    ("finalized_at", TEXT, "''"), ("winners", JSON, "'[]'"), ("leaderboard", JSON, None)],
+        "key": "tournament_id",
+        "indexes": [],
+    },
+    "player_aliases": {
+        "columns": [("alias", TEXT, None), ("espn_id", TEXT, None), ("name", TEXT, "''"), ("updated_at", TEXT, _NOW)],
+        "key": "alias",
+        "indexes": [(False, ("espn_id",))],
+    },
+}
+
+_SQL_TYPES = {TEXT: "TEXT", INT: "INTEGER", BOOL: "INTEGER", JSON: "TEXT"}
+
+
+def _encode(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == JSON:
+        return json.dumps(value, separators=(",", ":"))
+    if kind == BOOL:
+        return int(bool(value))
+    return value
+
+
+def _decode(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == JSON:
+        return json.loads(value)
+    if kind == BOOL:
+        return bool(value)
+    return value
+
+
+class SQLiteQuery:
+    def __init__(self, table: "SQLiteTable", query_filter: Optional[Dict[str, Any]] = None,
+                 projection: Optional[Dict[str, int]] = None):
+        self.table = table
+        self.query_filter = query_filter or {}
+        self.projection = projection
+        self.sort_field: Optional[str] = None
+        self.sort_direction: int = 1
+
+    def sort(self, field: str, direction: int):
+        self.sort_field = field
+        self.sort_direction = direction
+        return self
+
+    async def to_list(self, limit: Optional[int]):
+        order = None
+        if self.sort_field:
+            # PostgREST puts nulls last ascending, first descending
+            column = self.table._column(self.sort_field)
+            order = (f"{column} IS NULL, {column}" if self.sort_direction != -1
+                     else f"{column} IS NULL DESC, {column} DESC")
+        return self.table._select(self.query_filter, self.projection, order, limit)
+
+
+class SQLiteTable:
+    def __init__(self, client: "SQLiteStorage", table_name: str):
+        self.client = client
+        self.table_name = table_name
+        spec = TABLES[table_name]
+        self.kinds: Dict[str, str] = {name: kind for name, kind, _ in spec["columns"]}
+        self.key: str = spec["key"]
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self.client.conn
+
+    def _column(self, name: str) -> str:
+        if name not in self.kinds:
+            raise ValueError(f"Unknown column {self.table_name}.{name}")
+        return name
+
+    def _where(self, query_filter: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for key, value in (query_filter or {}).items():
+            column = self._column(key)
+            kind = self.kinds[key]
+            if isinstance(value, dict):
+                if "$ne" in value:
+                    # PostgREST's neq, like SQL <>, never matches null
+                    clauses.append(f"{column} != ?")
+                    params.append(_encode(kind, value["$ne"]))
+                elif "$in" in value:
+                    values = list(value["$in"])
+                    clauses.append(f"{column} IN ({','.join('?' * len(values))})" if values else "0")
+                    params.extend(_encode(kind, v) for v in values)
+                else:
+                    raise ValueError(f"Unsupported filter operator for key {key}: {value}")
+            elif value is None:
+                clauses.append(f"{column} IS NULL")
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(_encode(kind, value))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _columns(self, projection: Optional[Dict[str, int]]) -> List[str]:
+        # Mongo-style projections: inclusions select columns, a pure exclusion
+        # projection selects the rest; _id is ignored
+        if projection:
+            included = [field for field, flag in projection.items() if flag and field != "_id"]
+            if included:
+                return [self._column(field) for field in included]
+            excluded = {field for field, flag in projection.items() if not flag}
+            return [name for name in self.kinds if name not in excluded]
+        return list(self.kinds)
+
+    def _decode_rows(self, cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+        names = [d[0] for d in cursor.description]
+        kinds = [self.kinds[name] for name in names]
+        return [{name: _decode(kind, value) for name, kind, value in zip(names, kinds, row)} for row in cursor]
+
+    def _select(self, query_filter: Optional[Dict[str, Any]], projection: Optional[Dict[str, int]] = None,
+                order: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        where, params = self._where(query_filter)
+        sql = f"SELECT {', '.join(self._columns(projection))} FROM {self.table_name}{where}"
+        sql += f" ORDER BY {order}, rowid" if order else " ORDER BY rowid"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._decode_rows(self._conn.execute(sql, params))
+
+    def _write(self, docs: Sequence[Dict[str, Any]], on_conflict: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+        """INSERT rows, or with ``on_conflict`` an upsert that overwrites only the
+        columns each row carries. Returns the rows as stored."""
+        written: List[Dict[str, Any]] = []
+        with self._conn:
+            for doc in docs:
+                columns = [self._column(name) for name in doc]
+                sql = (f"INSERT INTO {self.table_name} ({', '.join(columns)}) "
+                       f"VALUES ({', '.join('?' * len(columns))})")
+                if on_conflict:
+                    updates = [c for c in columns if c not in on_conflict] or columns[:1]
+                    sql += (f" ON CONFLICT ({', '.join(self._column(c) for c in on_conflict)}) DO UPDATE SET "
+                            + ", ".join(f"{c} = excluded.{c}" for c in updates))
+                cursor = self._conn.execute(sql + " RETURNING *",
+                                            [_encode(self.kinds[c], doc[c]) for c in columns])
+                written.extend(self._decode_rows(cursor))
+        return written
+
+    def _update(self, query_filter: Dict[str, Any], set_payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        where, params = self._where(query_filter)
+        columns = [self._column(name) for name in set_payload]
+        if not columns:
+            return self._select(query_filter)
+        sql = f"UPDATE {self.table_name} SET {', '.join(f'{c} = ?' for c in columns)}{where} RETURNING *"
+        with self._conn:
+            return self._decode_rows(self._conn.execute(
+                sql, [_encode(self.kinds[c], set_payload[c]) for c in columns] + params))
+
+    async def create_index(self, keys, unique: bool = False, **kwargs):
+        fields = [keys] if isinstance(keys, str) else [field for field, _ in keys]
+        self.client.create_index(self.table_name, [self._column(f) for f in fields], unique)
+
+    async def find_one(self, query_filter: Dict[str, Any], projection: Optional[Dict[str, int]] = None):
+        rows = self._select(query_filter, projection, limit=1)
+        return rows[0] if rows else None
+
+    def find(self, query_filter: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, int]] = None):
+        return SQLiteQuery(self, query_filter, projection)
+
+    async def insert_one(self, doc: Dict[str, Any]):
+        return self._write([doc], None)[0]
+
+    async def insert_many(self, docs: List[Dict[str, Any]], chunk_size: int = 0):
+        """Insert rows in one transaction. Returns the inserted rows."""
+        return self._write(docs, None)
+
+    async def upsert_many(self, docs: List[Dict[str, Any]], on_conflict: str = "id", chunk_size: int = 0):
+        """Insert rows, overwriting the columns they carry where ``on_conflict`` already exists."""
+        return self._write(docs, on_conflict.split(","))
+
+    async def update_many_by_id(self, docs: List[Dict[str, Any]], chunk_size: int = 0):
+        """Apply per-row partial updates (an id plus the columns to set) in one
+        transaction; ids that no longer exist are skipped."""
+        with self._conn:
+            for doc in docs:
+                columns = [self._column(name) for name in doc if name != "id"]
+                if columns:
+                    self._conn.execute(f"UPDATE {self.table_name} SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?",
+                                       [_encode(self.kinds[c], doc[c]) for c in columns] + [doc["id"]])
+
+    async def find_one_and_update(self, query_filter: Dict[str, Any], update_doc: Dict[str, Any],
+                                  upsert: bool = False) -> Optional[Dict[str, Any]]:
+        """Like update_one, but returns the row as written (None when nothing matched)."""
+        set_payload = update_doc.get("$set", update_doc)
+        if upsert:
+            if any(isinstance(value, dict) for value in query_filter.values()):
+                raise ValueError(f"upsert needs an equality filter, got {query_filter}")
+            return self._write([{**query_filter, **set_payload}], list(query_filter))[0]
+        rows = self._update(query_filter, set_payload)
+        return rows[0] if rows else None
+
+    async def update_one(self, query_filter: Dict[str, Any], update_doc: Dict[str, Any], upsert: bool = False):
+        await self.find_one_and_update(query_filter, update_doc, upsert)
+
+    async def update_many(self, query_filter: Dict[str, Any], update_doc: Dict[str, Any]):
+        self._update(query_filter, update_doc.get("$set", update_doc))
+
+    async def delete_one(self, query_filter: Dict[str, Any]):
+        await self.delete_many(query_filter)
+
+    async def delete_many(self, query_filter: Dict[str, Any]):
+        where, params = self._where(query_filter)
+        with self._conn:
+            self._conn.execute(f"DELETE FROM {self.table_name}{where}", params)
+
+    async def rpc(self, function: str, args: Dict[str, Any], query_filter: Optional[Dict[str, Any]] = None,
+                  changed_fields: Iterable[str] = ()):
+        """Run one of FUNCTIONS, the local versions of the schema's Postgres functions."""
+        if function not in FUNCTIONS:
+            raise ValueError(f"Unknown function {function}")
+        with self._conn:
+            return FUNCTIONS[function](self, args)
+
+    async def count_documents(self, query_filter: Dict[str, Any]):
+        where, params = self._where(query_filter)
+        return self._conn.execute(f"SELECT COUNT(*) FROM {self.table_name}{where}", params).fetchone()[0]
+
+    async def count_documents_grouped(self, field: str, query_filter: Optional[Dict[str, Any]] = None) -> Dict[Any, int]:
+        """Count matching rows per distinct value of ``field`` in one query."""
+        where, params = self._where(query_filter)
+        column = self._column(field)
+        sql = f"SELECT {column}, COUNT(*) FROM {self.table_name}{where} GROUP BY {column}"
+        return {_decode(self.kinds[field], value): count for value, count in self._conn.execute(sql, params)}
+
+    async def count_and_max(self, query_filter: Dict[str, Any], field: str) -> Tuple[int, Any]:
+        """Number of matching rows and the largest non-null ``field`` among them."""
+        where, params = self._where(query_filter)
+        sql = f"SELECT COUNT(*), MAX({self._column(field)}) FROM {self.table_name}{where}"
+        count, latest = self._conn.execute(sql, params).fetchone()
+        return count, _decode(self.kinds[field], latest)
+
+
+def _patch_score_cache(table: SQLiteTable, args: Dict[str, Any]) -> bool:
+    rows = table._select({"tournament_id": args["p_tournament_id"],
+                          "last_updated": args["p_expected_last_updated"]}, {"scores": 1}, limit=1)
+    if not rows:
+        return False
+    stored: Dict[str, Any] = {}
+    for row in rows[0]["scores"] or []:
+        if row.get("espn_id") is not None:
+            stored.setdefault(str(row["espn_id"]), row)
+    changed = args["p_changed"]
+    scores = [changed.get(espn_id) or stored.get(espn_id) for espn_id in args["p_order"]]
+    table._update({"tournament_id": args["p_tournament_id"]},
+                  {"scores": scores, "last_updated": args["p_last_updated"]})
+    return True
+
+
+FUNCTIONS: Dict[str, Callable[[SQLiteTable, Dict[str, Any]], Any]] = {
+    "patch_score_cache": _patch_score_cache,
+}
+
+
+class SQLiteStorage:
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        for name, spec in TABLES.items():
+            columns = ", ".join(
+                f"{column} {_SQL_TYPES[kind]}" + (" PRIMARY KEY" if column == spec["key"] else "")
+                + (f" DEFAULT {default}" if default is not None else "")
+                for column, kind, default in spec["columns"])
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {name} ({columns})")
+            for unique, fields in spec["indexes"]:
+                self.create_index(name, list(fields), unique)
+            setattr(self, name, SQLiteTable(self, name))
+
+    def create_index(self, table: str, columns: Sequence[str], unique: bool = False):
+        if list(columns) == [TABLES[table]["key"]]:
+            return  # the primary key is already indexed
+        name = f"{table}_{'_'.join(columns)}_{'key' if unique else 'idx'}"
+        self.conn.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} "
+                          f"ON {table} ({', '.join(columns)})")
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return {"enabled": False, "backend": "sqlite", "path": self.path}
+
+    async def close(self):
+        self.conn.close()
@@ -0,0 +1,95 @@
+"""Storage backend interface and selection.
+
+server.py talks to its database through a small Mongo-style surface: one
+Table per collection with find/find_one/count_documents and the single-row
+and bulk writes, plus a couple of client-level helpers. Any object with
+this shape can serve the app:
+
+  supabase  SupabaseMongoCompat over PostgREST (default)
+  sqlite    SQLiteStorage, a local file, or ``:memory:`` for a throwaway
+            in-process database; for load tests and single-node deployments
+
+STORAGE_BACKEND picks one; STORAGE_SQLITE_PATH sets the SQLite database
+(default ``steelsons.db``).
+"""
+import os
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Tuple
+
+DEFAULT_SQLITE_PATH = "steelsons.db"
+
+
+class Query(Protocol):
+    def sort(self, field: str, direction: int) -> "Query": ...
+
+    async def to_list(self, limit: Optional[int]) -> List[Dict[str, Any]]: ...
+
+
+class Table(Protocol):
+    """One collection. Filters are equality, ``$ne`` or ``$in`` per field;
+    projections are Mongo-style inclusion or exclusion dicts. update_many_by_id
+    sets each doc's columns on the row with its id, skipping ids that no longer
+    exist."""
+
+    async def create_index(self, *args, **kwargs) -> None: ...
+
+    async def find_one(self, query_filter: Dict[str, Any],
+                       projection: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]: ...
+
+    def find(self, query_filter: Optional[Dict[str, Any]] = None,
+             projection: Optional[Dict[str, int]] = None) -> Query: ...
+
+    async def insert_one(self, doc: Dict[str, Any]) -> Dict[str, Any]: ...
+
+    async def insert_many(self, docs: List[Dict[str, Any]], chunk_size: int = ...) -> List[Dict[str, Any]]: ...
+
+    async def upsert_many(self, docs: List[Dict[str, Any]], on_conflict: str = "id",
+                          chunk_size: int = ...) -> List[Dict[str, Any]]: ...
+
+    async def update_many_by_id(self, docs: List[Dict[str, Any]], chunk_size: int = ...) -> None: ...
+
+    async def update_one(self, query_filter: Dict[str, Any], update_doc: Dict[str, Any],
+                         upsert: bool = False) -> None: ...
+
+    async def find_one_and_update(self, query_filter: Dict[str, Any], update_doc: Dict[str, Any],
+                                  upsert: bool = False) -> Optional[Dict[str, Any]]: ...
+
+    async def update_many(self, query_filter: Dict[str, Any], update_doc: Dict[str, Any]) -> None: ...
+
+    async def delete_one(self, query_filter: Dict[str, Any]) -> None: ...
+
+    async def delete_many(self, query_filter: Dict[str, Any]) -> None: ...
+
+    async def rpc(self, function: str, args: Dict[str, Any], query_filter: Optional[Dict[str, Any]] = None,
+                  changed_fields: Iterable[str] = ()) -> Any: ...
+
+    async def count_documents(self, query_filter: Dict[str, Any]) -> int: ...
+
+    async def count_documents_grouped(self, field: str,
+                                      query_filter: Optional[Dict[str, Any]] = None) -> Dict[Any, int]: ...
+
+    async def count_and_max(self, query_filter: Dict[str, Any], field: str) -> Tuple[int, Any]: ...
+
+
+class Storage(Protocol):
+    users: Table
+    tournaments: Table
+    teams: Table
+    score_cache: Table
+    results_archive: Table
+    player_aliases: Table
+
+    def cache_stats(self) -> Dict[str, Any]: ...
+
+    async def close(self) -> None: ...
+
+
+def open_storage(backend: Optional[str] = None) -> Storage:
+    """Build the backend named by ``backend`` or STORAGE_BACKEND."""
+    backend = (backend or os.environ.get("STORAGE_BACKEND", "supabase")).strip().lower()
+    if backend == "supabase":
+        from supabase_mongo_compat import SupabaseMongoCompat
+        return SupabaseMongoCompat()
+    if backend == "sqlite":
+        from sqlite_storage import SQLiteStorage
+        return SQLiteStorage(os.environ.get("STORAGE_SQLITE_PATH", DEFAULT_SQLITE_PATH))
+    raise RuntimeError(f"Unknown STORAGE_BACKEND {backend!r}; expected supabase or sqlite")
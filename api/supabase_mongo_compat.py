@@ -1,13 +1,162 @@
+import copy
+import json
 import os
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import httpx
 
 
+GROUPED_COUNT_PAGE_SIZE = 1000
+BULK_CHUNK_SIZE = 500
+
+
+def _parse_cache_ttls(raw: str) -> Dict[str, float]:
+    """Parse SUPABASE_CACHE_TTLS, e.g. "tournaments=30" (seconds per table)."""
+    ttls: Dict[str, float] = {}
+    for part in raw.split(","):
+        if "=" not in part:
+            continue
+        table, seconds = part.split("=", 1)
+        try:
+            ttl = float(seconds)
+        except ValueError:
+            continue
+        if table.strip() and ttl > 0:
+            ttls[table.strip()] = ttl
+    return ttls
+
+
+def _filters_disjoint(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    """True when no row can match both filters (some key has two different eq values)."""
+    for key, value in a.items():
+        if key in b and not isinstance(value, dict) and not isinstance(b[key], dict):
+            if str(value) != str(b[key]):
+                return True
+    return False
+
+
+def _content_range_total(response: httpx.Response) -> int:
+    content_range = response.headers.get("content-range", "0-0/0")
+    try:
+        return int(content_range.split("/")[1])
+    except Exception:
+        return 0
+
+
+def _uniform_chunks(docs: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    """Split rows into chunks of at most ``size`` that share one key set, as PostgREST bulk writes require."""
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for doc in docs:
+        groups.setdefault(tuple(sorted(doc)), []).append(doc)
+    for rows in groups.values():
+        for start in range(0, len(rows), size):
+            yield rows[start:start + size]
+
+
+class QueryCache:
+    """Bounded LRU of read results with per-table TTLs.
+
+    Writes invalidate every cached read on the table that could overlap the
+    written rows: reads whose filter is provably disjoint from the write
+    filter (and does not reference a column the write changes) survive.
+    A per-table generation counter keeps reads that were in flight during a
+    write from repopulating the cache with pre-write data.
+    """
+
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 512):
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, str, Dict[str, Any], Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def enabled_for(self, table: str) -> bool:
+        return table in self.ttls
+
+    @staticmethod
+    def make_key(table: str, kind: str, query_filter: Dict[str, Any], params: Dict[str, Any]) -> Tuple:
+        return (table, kind, json.dumps(query_filter, sort_keys=True, default=str),
+                json.dumps(params, sort_keys=True, default=str))
+
+    def generation(self, table: str) -> int:
+        return self._generations.get(table, 0)
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, copy.deepcopy(entry[3])
+
+    def put(self, key: Tuple, table: str, query_filter: Dict[str, Any], value: Any, generation: int):
+        if generation != self.generation(table):
+            return
+        self._entries[key] = (time.monotonic() + self.ttls[table], table, dict(query_filter), copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, table: str, query_filter: Optional[Dict[str, Any]] = None,
+                   changed_fields: Iterable[str] = ()):
+        """Drop cached reads on ``table`` that may include rows matching ``query_filter``."""
+        self._generations[table] = self.generation(table) + 1
+        changed = set(changed_fields)
+        for key in [k for k, e in self._entries.items() if e[1] == table]:
+            cached_filter = self._entries[key][2]
+            if query_filter is not None and _filters_disjoint(cached_filter, query_filter) \
+                    and not changed.intersection(cached_filter):
+                continue
+            del self._entries[key]
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {"tables": dict(self.ttls), "entries": len(self._entries), "max_entries": self.max_entries,
+                "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions, "invalidations": self.invalidations}
+
+
+def _select_clause(projection: Optional[Dict[str, int]]) -> str:
+    """Translate a Mongo-style inclusion projection into a PostgREST select list.
+
+    Exclusion projections such as {"_id": 0} select everything; excluded
+    columns other than _id are stripped client-side by _apply_exclusions.
+    """
+    if projection:
+        included = [field for field, flag in projection.items() if flag and field != "_id"]
+        if included:
+            return ",".join(included)
+    return "*"
+
+
+def _apply_exclusions(rows: List[Dict[str, Any]], projection: Optional[Dict[str, int]]):
+    if not projection:
+        return rows
+    excluded = [field for field, flag in projection.items() if not flag and field != "_id"]
+    if not excluded or any(flag for flag in projection.values()):
+        return rows
+    return [{k: v for k, v in row.items() if k not in excluded} for row in rows]
+
+
 class SupabaseQuery:
-    def __init__(self, table: "SupabaseTable", query_filter: Optional[Dict[str, Any]] = None):
+    def __init__(self, table: "SupabaseTable", query_filter: Optional[Dict[str, Any]] = None,
+                 projection: Optional[Dict[str, int]] = None):
         self.table = table
         self.query_filter = query_filter or {}
+        self.projection = projection
         self.sort_field: Optional[str] = None
         self.sort_direction: int = 1
 
@@ -16,12 +165,13 @@ class SupabaseQuery:
         self.sort_direction = direction
         return self
 
-    async def to_list(self, limit: int):
-        rows = await self.table._select(self.query_filter)
+    async def to_list(self, limit: Optional[int]):
+        order = None
         if self.sort_field:
-            reverse = self.sort_direction == -1
-            rows = sorted(rows, key=lambda x: x.get(self.sort_field), reverse=reverse)
-        return rows[:limit]
+            order = f"{self.sort_field}.{'desc' if self.sort_direction == -1 else 'asc'}"
+        rows = await self.table._select(self.query_filter, select=_select_clause(self.projection),
+                                        order=order, limit=limit)
+        return _apply_exclusions(rows, self.projection)
 
 
 class SupabaseTable:
@@ -29,17 +179,49 @@ class SupabaseTable:
         self.client = client
         self.table_name = table_name
 
-    async def _select(self, query_filter: Optional[Dict[str, Any]] = None):
-        params = {"select": "*"}
-        self._apply_filter_params(params, query_filter or {})
+    @property
+    def _cache(self) -> Optional[QueryCache]:
+        cache = self.client.cache
+        return cache if cache is not None and cache.enabled_for(self.table_name) else None
+
+    async def _select(self, query_filter: Optional[Dict[str, Any]] = None, use_cache: bool = True,
+                      select: str = "*", order: Optional[str] = None, limit: Optional[int] = None,
+                      offset: Optional[int] = None):
+        query_filter = query_filter or {}
+        params = {"select": select}
+        self._apply_filter_params(params, query_filter)
+        if order:
+            params["order"] = order
+        if limit:
+            params["limit"] = str(limit)
+        if offset:
+            params["offset"] = str(offset)
+        cache = self._cache if use_cache else None
+        if cache is not None:
+            key = cache.make_key(self.table_name, "select", query_filter, params)
+            hit, rows = cache.get(key)
+            if hit:
+                return rows
+            generation = cache.generation(self.table_name)
         data = await self.client.request("GET", f"/rest/v1/{self.table_name}", params=params)
-        return data if isinstance(data, list) else []
+        rows = data if isinstance(data, list) else []
+        if cache is not None:
+            cache.put(key, self.table_name, query_filter, rows, generation)
+        return rows
+
+    def _invalidate(self, query_filter: Optional[Dict[str, Any]], changed_fields: Iterable[str] = ()):
+        cache = self._cache
+        if cache is not None:
+            cache.invalidate(self.table_name, query_filter, changed_fields)
 
     def _apply_filter_params(self, params: Dict[str, str], query_filter: Dict[str, Any]):
         for key, value in query_filter.items():
             if isinstance(value, dict):
                 if "$ne" in value:
                     params[key] = f"neq.{value['$ne']}"
+                elif "$in" in value:
+                    quoted = ",".join('"' + str(v).replace('"', '\\"') + '"' for v in value["$in"])
+                    params[key] = f"in.({quoted})"
                 else:
                     raise ValueError(f"Unsupported filter operator for key {key}: {value}")
             else:
@@ -49,62 +231,197 @@ class SupabaseTable:
         return None
 
     async def find_one(self, query_filter: Dict[str, Any], projection: Optional[Dict[str, int]] = None):
-        rows = await self._select(query_filter)
+        rows = await self._select(query_filter, select=_select_clause(projection), limit=1)
+        rows = _apply_exclusions(rows, projection)
         return rows[0] if rows else None
 
     def find(self, query_filter: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, int]] = None):
-        return SupabaseQuery(self, query_filter)
+        return SupabaseQuery(self, query_filter, projection)
 
     async def insert_one(self, doc: Dict[str, Any]):
         headers = {"Prefer": "return=representation"}
-        data = await self.client.request(
-            "POST",
-            f"/rest/v1/{self.table_name}",
-            json=[doc],
-            headers=headers,
-        )
+        try:
+            data = await self.client.request(
+                "POST",
+                f"/rest/v1/{self.table_name}",
+                json=[doc],
+                headers=headers,
+            )
+        finally:
+            self._invalidate(doc)
         if isinstance(data, list) and data:
             return data[0]
         return doc
 
-    async def update_one(self, query_filter: Dict[str, Any], update_doc: Dict[str, Any], upsert: bool = False):
+    async def _bulk_post(self, docs: List[Dict[str, Any]], prefer: str, params: Optional[Dict[str, str]] = None,
+                         chunk_size: int = BULK_CHUNK_SIZE) -> List[Dict[str, Any]]:
+        written: List[Dict[str, Any]] = []
+        if not docs:
+            return written
+        try:
+            for chunk in _uniform_chunks(docs, chunk_size):
+                data = await self.client.request("POST", f"/rest/v1/{self.table_name}", params=params,
+                                                 json=chunk, headers={"Prefer": prefer})
+                if isinstance(data, list):
+                    written.extend(data)
+        finally:
+            self._invalidate(None)
+        return written
+
+    async def insert_many(self, docs: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE):
+        """Insert rows with one POST per chunk. Returns the inserted rows."""
+        return await self._bulk_post(docs, "return=representation", chunk_size=chunk_size)
+
+    async def upsert_many(self, docs: List[Dict[str, Any]], on_conflict: str = "id",
+                          chunk_size: int = BULK_CHUNK_SIZE):
+        """Insert rows, overwriting the columns they carry where ``on_conflict`` already exists."""
+        return await self._bulk_post(docs, "resolution=merge-duplicates,return=representation",
+                                     {"on_conflict": on_conflict}, chunk_size)
+
+    async def update_many_by_id(self, docs: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE):
+        """Apply per-row partial updates: each doc is an id plus the columns to set.
+
+        One update_rows_by_id call per chunk instead of a request per row; ids
+        that no longer exist are skipped. Without that function (not migrated
+        yet), rows are PATCHed one by one."""
+        if not docs:
+            return
+        try:
+            for chunk in _uniform_chunks(docs, chunk_size):
+                if self.client.bulk_update_enabled:
+                    try:
+                        await self.client.request("POST", "/rest/v1/rpc/update_rows_by_id",
+                                                  json={"p_table": self.table_name, "p_rows": chunk})
+                        continue
+                    except httpx.HTTPStatusError as ex:
+                        if ex.response.status_code != 404:
+                            raise
+                        self.client.bulk_update_enabled = False
+                for doc in chunk:
+                    await self.client.request("PATCH", f"/rest/v1/{self.table_name}", params={"id": f"eq.{doc['id']}"},
+                                              json={k: v for k, v in doc.items() if k != "id"},
+                                              headers={"Prefer": "return=minimal"})
+        finally:
+            self._invalidate(None)
+
+    async def _write_one(self, query_filter: Dict[str, Any], update_doc: Dict[str, Any], upsert: bool,
+                         returning: str) -> Any:
         set_payload = update_doc.get("$set", update_doc)
-        existing = await self.find_one(query_filter)
-        if existing:
+        prefer = f"return={returning}"
+        try:
+            if upsert:
+                # Native INSERT ... ON CONFLICT on the filter columns, which must form a unique key
+                if any(isinstance(value, dict) for value in query_filter.values()):
+                    raise ValueError(f"upsert needs an equality filter, got {query_filter}")
+                return await self.client.request(
+                    "POST", f"/rest/v1/{self.table_name}", params={"on_conflict": ",".join(query_filter)},
+                    json=[{**query_filter, **set_payload}], headers={"Prefer": f"resolution=merge-duplicates,{prefer}"})
             params: Dict[str, str] = {}
             self._apply_filter_params(params, query_filter)
-            await self.client.request("PATCH", f"/rest/v1/{self.table_name}", params=params, json=set_payload)
-            return
-        if upsert:
-            merged = dict(query_filter)
-            merged.update(set_payload)
-            await self.insert_one(merged)
+            return await self.client.request("PATCH", f"/rest/v1/{self.table_name}", params=params,
+                                             json=set_payload, headers={"Prefer": prefer})
+        finally:
+            self._invalidate(query_filter, set_payload)
+
+    async def update_one(self, query_filter: Dict[str, Any], update_doc: Dict[str, Any], upsert: bool = False):
+        await self._write_one(query_filter, update_doc, upsert, "minimal")
+
+    async def find_one_and_update(self, query_filter: Dict[str, Any], update_doc: Dict[str, Any],
+                                  upsert: bool = False) -> Optional[Dict[str, Any]]:
+        """Like update_one, but returns the row as written (None when nothing matched)."""
+        data = await self._write_one(query_filter, update_doc, upsert, "representation")
+        return data[0] if isinstance(data, list) and data else None
 
     async def update_many(self, query_filter: Dict[str, Any], update_doc: Dict[str, Any]):
         set_payload = update_doc.get("$set", update_doc)
         params: Dict[str, str] = {}
         self._apply_filter_params(params, query_filter)
-        await self.client.request("PATCH", f"/rest/v1/{self.table_name}", params=params, json=set_payload)
+        try:
+            await self.client.request("PATCH", f"/rest/v1/{self.table_name}", params=params, json=set_payload)
+        finally:
+            self._invalidate(query_filter, set_payload)
 
     async def delete_one(self, query_filter: Dict[str, Any]):
         params: Dict[str, str] = {}
         self._apply_filter_params(params, query_filter)
-        await self.client.request("DELETE", f"/rest/v1/{self.table_name}", params=params)
+        try:
+            await self.client.request("DELETE", f"/rest/v1/{self.table_name}", params=params)
+        finally:
+            self._invalidate(query_filter)
 
     async def delete_many(self, query_filter: Dict[str, Any]):
         params: Dict[str, str] = {}
         self._apply_filter_params(params, query_filter)
-        await self.client.request("DELETE", f"/rest/v1/{self.table_name}", params=params)
+        try:
+            await self.client.request("DELETE", f"/rest/v1/{self.table_name}", params=params)
+        finally:
+            self._invalidate(query_filter)
+
+    async def rpc(self, function: str, args: Dict[str, Any], query_filter: Optional[Dict[str, Any]] = None,
+                  changed_fields: Iterable[str] = ()):
+        """Call a Postgres function that writes rows of this table matching ``query_filter``."""
+        try:
+            return await self.client.request("POST", f"/rest/v1/rpc/{function}", json=args)
+        finally:
+            self._invalidate(query_filter, changed_fields)
 
     async def count_documents(self, query_filter: Dict[str, Any]):
         params = {"select": "id"}
         self._apply_filter_params(params, query_filter)
+        cache = self._cache
+        if cache is not None:
+            key = cache.make_key(self.table_name, "count", query_filter, params)
+            hit, total = cache.get(key)
+            if hit:
+                return total
+            generation = cache.generation(self.table_name)
         total = await self.client.request_count(f"/rest/v1/{self.table_name}", params=params)
+        if cache is not None:
+            cache.put(key, self.table_name, query_filter, total, generation)
         return total
 
+    async def count_documents_grouped(self, field: str, query_filter: Optional[Dict[str, Any]] = None) -> Dict[Any, int]:
+        """Count matching rows per distinct value of ``field`` in one request.
+
+        Only the grouping column is transferred, and no exact-count header is
+        sent, so this replaces a count_documents round trip per group. Pages
+        stay under PostgREST's default max-rows cap; one page covers a
+        typical season."""
+        counts: Dict[Any, int] = {}
+        offset = 0
+        while True:
+            rows = await self._select(query_filter, select=field, order=f"{field}.asc",
+                                      limit=GROUPED_COUNT_PAGE_SIZE, offset=offset)
+            for row in rows:
+                value = row.get(field)
+                counts[value] = counts.get(value, 0) + 1
+            if len(rows) < GROUPED_COUNT_PAGE_SIZE:
+                return counts
+            offset += len(rows)
+
+    async def count_and_max(self, query_filter: Dict[str, Any], field: str) -> Tuple[int, Any]:
+        """Number of matching rows and the largest non-null ``field`` among them,
+        in one request: the top row by ``field``, with an exact count."""
+        params = {"select": field, "order": f"{field}.desc.nullslast", "limit": "1"}
+        self._apply_filter_params(params, query_filter)
+        cache = self._cache
+        if cache is not None:
+            key = cache.make_key(self.table_name, "count_and_max", query_filter, params)
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            generation = cache.generation(self.table_name)
+        rows, total = await self.client.request_with_count(f"/rest/v1/{self.table_name}", params=params)
+        value = (total, rows[0].get(field) if isinstance(rows, list) and rows else None)
+        if cache is not None:
+            cache.put(key, self.table_name, query_filter, value, generation)
+        return value
+
 
 class SupabaseMongoCompat:
-    def __init__(self):
+    """Storage backend (see storage.py) over Supabase's PostgREST API."""
+
+    def __init__(self, cache_ttls: Optional[Dict[str, float]] = None, cache_max_entries: Optional[int] = None):
         self.supabase_url = os.environ["SUPABASE_URL"].rstrip("/")
         self.supabase_key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
         if not self.supabase_key:
@@ -113,10 +430,26 @@ class SupabaseMongoCompat:
             raise RuntimeError("Missing SUPABASE_SERVICE_ROLE_KEY or SUPABASE_ANON_KEY for backend database access")
         self.http_client = httpx.AsyncClient(timeout=20)
 
+        # Opt-in read-through cache, e.g. SUPABASE_CACHE_TTLS="tournaments=30"
+        if cache_ttls is None:
+            cache_ttls = _parse_cache_ttls(os.environ.get("SUPABASE_CACHE_TTLS", ""))
+        if cache_max_entries is None:
+            cache_max_entries = int(os.environ.get("SUPABASE_CACHE_MAX_ENTRIES", "512"))
+        self.cache: Optional[QueryCache] = QueryCache(cache_ttls, cache_max_entries) if cache_ttls else None
+        # Set to False once the database turns out not to have update_rows_by_id
+        self.bulk_update_enabled = True
+
         self.users = SupabaseTable(self, "users")
         self.tournaments = SupabaseTable(self, "tournaments")
         self.teams = SupabaseTable(self, "teams")
         self.score_cache = SupabaseTable(self, "score_cache")
+        self.results_archive = SupabaseTable(self, "results_archive")
+        self.player_aliases = SupabaseTable(self, "player_aliases")
+
+    def cache_stats(self) -> Dict[str, Any]:
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
 
     def _headers(self, extra: Optional[Dict[str, str]] = None):
         headers = {
@@ -156,12 +489,18 @@ class SupabaseMongoCompat:
             headers=self._headers({"Prefer": "count=exact"}),
         )
         response.raise_for_status()
-        content_range = response.headers.get("content-range", "0-0/0")
-        try:
-            total = int(content_range.split("/")[1])
-        except Exception:
-            total = 0
-        return total
+        return _content_range_total(response)
+
+    async def request_with_count(self, path: str, params: Optional[Dict[str, Any]] = None) -> Tuple[Any, int]:
+        """GET ``path`` with an exact count: the decoded rows and the total matching."""
+        response = await self.http_client.request(
+            "GET",
+            f"{self.supabase_url}{path}",
+            params=params,
+            headers=self._headers({"Prefer": "count=exact"}),
+        )
+        response.raise_for_status()
+        return (response.json() if response.content else None), _content_range_total(response)
 
     async def close(self):
         await self.http_client.aclose()
@@ -44,7 +44,27 @@ create table if not exists public.teams (
   constraint teams_user_tournament_team_unique unique (user_id, tournament_id, team_number)
 );
 
+alter table public.teams add column if not exists paid boolean not null default false;
+-- Scoreboard query params that last found espn_event_id, e.g. {"dates": "20260409"}
+alter table public.tournaments add column if not exists espn_query jsonb;
+
 create index if not exists teams_user_tournament_idx on public.teams (user_id, tournament_id);
+
+-- Every team write stamps updated_at with the database clock: leaderboard
+-- snapshots are keyed on each tournament's team count and latest updated_at
+create or replace function public.teams_touch_updated_at() returns trigger
+language plpgsql
+as $$
+begin
+  new.updated_at = now();
+  return new;
+end;
+$$;
+
+drop trigger if exists teams_touch_updated_at on public.teams;
+create trigger teams_touch_updated_at
+before insert or update on public.teams
+for each row execute function public.teams_touch_updated_at();
 create index if not exists teams_tournament_idx on public.teams (tournament_id);
 
 create table if not exists public.score_cache (
@@ -94,3 +114,105 @@ create policy score_cache_open_access on public.score_cache
 for all to anon, authenticated
 using (true)
 with check (true);
+
+-- Incremental score writes: rebuild scores in p_order, taking rows from p_changed
+-- (keyed by espn_id) and keeping the stored row otherwise. Applies only while the
+-- stored version is p_expected_last_updated; returns whether it did.
+create or replace function public.patch_score_cache(
+  p_tournament_id text,
+  p_expected_last_updated text,
+  p_last_updated text,
+  p_order text[],
+  p_changed jsonb
+) returns boolean
+language plpgsql
+as $$
+begin
+  update public.score_cache sc
+  set scores = (
+        select coalesce(jsonb_agg(coalesce(p_changed -> o.espn_id, cur.elem) order by o.ord), '[]'::jsonb)
+        from unnest(p_order) with ordinality as o(espn_id, ord)
+        left join lateral (
+          select e.elem from jsonb_array_elements(sc.scores) as e(elem)
+          where e.elem ->> 'espn_id' = o.espn_id
+          limit 1
+        ) cur on true
+      ),
+      last_updated = p_last_updated
+  where sc.tournament_id = p_tournament_id
+    and sc.last_updated = p_expected_last_updated;
+  return found;
+end;
+$$;
+
+grant execute on function public.patch_score_cache(text, text, text, text[], jsonb) to anon, authenticated;
+
+-- Bulk partial updates keyed by id in one statement: each row of p_rows sets
+-- the columns the first row carries. Ids that no longer exist are skipped,
+-- never inserted. Returns the number of rows updated.
+create or replace function public.update_rows_by_id(p_table text, p_rows jsonb)
+returns integer
+language plpgsql
+as $$
+declare
+  assignments text;
+  updated integer;
+begin
+  if p_table not in ('users', 'tournaments', 'teams') then
+    raise exception 'update_rows_by_id: unsupported table %', p_table;
+  end if;
+  select string_agg(format('%I = r.%I', key, key), ', ')
+    into assignments
+    from jsonb_object_keys(p_rows -> 0) as key
+   where key <> 'id';
+  if assignments is null then
+    return 0;
+  end if;
+  execute format('update public.%I t set %s from jsonb_populate_recordset(null::public.%I, $1) r where t.id = r.id',
+                 p_table, assignments, p_table)
+    using p_rows;
+  get diagnostics updated = row_count;
+  return updated;
+end;
+$$;
+
+grant execute on function public.update_rows_by_id(text, jsonb) to anon, authenticated;
+
+-- Frozen, pre-rendered results for finalized tournaments
+create table if not exists public.results_archive (
+  tournament_id text primary key,
+  tournament_name text not null default '',
+  year integer not null,
+  finalized_at text not null default '',
+  winners jsonb not null default '[]'::jsonb,
+  leaderboard jsonb not null
+);
+
+alter table public.results_archive enable row level security;
+grant all on table public.results_archive to anon, authenticated;
+
+drop policy if exists results_archive_open_access on public.results_archive;
+create policy results_archive_open_access on public.results_archive
+for all to anon, authenticated
+using (true)
+with check (true);
+
+-- Spellings confirmed by ESPN syncs: alias is the name with case, accents,
+-- punctuation and spaces stripped (name_matching.name_key)
+create table if not exists public.player_aliases (
+  alias text primary key,
+  espn_id text not null,
+  name text not null default '',
+  updated_at timestamptz not null default now()
+);
+
+create index if not exists player_aliases_espn_idx on public.player_aliases (espn_id);
+
+alter table public.player_aliases enable row level security;
+grant all on table public.player_aliases to anon, authenticated;
+
+drop policy if exists player_aliases_open_access on public.player_aliases;
+create policy player_aliases_open_access on public.player_aliases
+for all to anon, authenticated
+using (true)
+with check (true);
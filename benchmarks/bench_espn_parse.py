@@ -0,0 +1,87 @@
+"""Memory and latency of espn_get_field with and without streaming parse.
+
+Serves scoreboard payloads from an in-process transport in network-sized
+chunks and runs espn_get_field both ways: decoding the whole body with
+response.json(), and feeding chunks to ScoreboardParser as they arrive.
+Peak memory is traced with tracemalloc and covers everything allocated
+during the call: response buffering, the decoded document and the parsed
+field.
+
+Synthetic fixtures (benchmarks/espn_fixtures.py) cover a mid-round single
+event, a final round, and a season-wide query where the target is one of
+many events. A recorded ESPN response can be added with --fixture. Usage:
+
+    python benchmarks/bench_espn_parse.py [--repeat 5] [--fixture scoreboard.json --event-id 401580351]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "api"))
+
+import espn_client  # noqa: E402
+import espn_fixtures  # noqa: E402
+from espn_fixtures import EVENT_ID  # noqa: E402
+
+
+def fixtures():
+    return {
+        "mid-round (1 event, R2)": espn_fixtures.scoreboard("mid-round"),
+        "final (1 event, R4)": espn_fixtures.scoreboard("final"),
+        "season (12 events)": espn_fixtures.season(),
+    }
+
+
+def measure(body: bytes, event_id: str, stream: bool, repeat: int):
+    os.environ["ESPN_STREAM_PARSE"] = "1" if stream else "0"
+
+    async def run():
+        espn_fixtures.serve(body)
+        golfers, _ = await espn_client.espn_get_field(event_id, "2026-04-09T04:00Z")
+        await espn_client.upstream.http_client.aclose()
+        return golfers
+
+    times = []
+    golfers = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        golfers = asyncio.run(run())
+        times.append((time.perf_counter() - start) * 1e3)
+    tracemalloc.start()
+    asyncio.run(run())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak / 1e6, golfers
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fixture", help="recorded scoreboard JSON file")
+    parser.add_argument("--event-id", default=EVENT_ID)
+    args = parser.parse_args()
+    if not espn_client.STREAM_PARSE_AVAILABLE:
+        raise SystemExit("ijson is not installed; nothing to compare")
+
+    cases = {name: (json.dumps(doc).encode(), EVENT_ID) for name, doc in fixtures().items()}
+    if args.fixture:
+        cases[Path(args.fixture).name] = (Path(args.fixture).read_bytes(), args.event_id)
+
+    print(f"{'fixture':<26} {'body MB':>8} {'mode':<7} {'median ms':>10} {'peak MB':>8}")
+    for name, (body, event_id) in cases.items():
+        full = measure(body, event_id, False, args.repeat)
+        streamed = measure(body, event_id, True, args.repeat)
+        if full[2] != streamed[2]:
+            raise SystemExit(f"{name}: streaming parse disagrees with full decode")
+        for mode, (ms, peak, _) in (("json", full), ("stream", streamed)):
+            print(f"{name:<26} {len(body) / 1e6:8.2f} {mode:<7} {ms:10.1f} {peak:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Latency, memory and throughput of the scoring and leaderboard pipeline.
+
+For each tournament stage in benchmarks/espn_fixtures.py (or recorded
+fixtures from --fixtures DIR), seeds an in-memory SQLite database
+(api/sqlite_storage.py) with four tournaments: three completed ones and the
+current one at that stage. It then times:
+
+  espn_get_field     parse the scoreboard, served from an in-process transport
+  calc_tied_scores   tie groups and points for the parsed field
+  refresh_scores     fetch, build rows and write score_cache (live stages)
+  score_teams        score every team's golfers against the cached field
+  leaderboard_cold   get_leaderboard with in-process snapshots and indexes dropped
+  leaderboard_warm   get_leaderboard served from its snapshot
+  leaderboard_304    get_leaderboard with a matching If-None-Match
+  cup_race_cold      get_cup_race with snapshots and completed slots dropped
+  cup_race_warm      get_cup_race served from its snapshot
+
+The leaderboard and cup race cases are repeated for each --teams count
+(teams per tournament). server.py reads at most 500 teams per tournament,
+so at 5000 the leaderboard shows fewer teams than were seeded; the
+"served" column reports how many it returned. Each case reports p50/p99
+latency and throughput, then traces one extra run with tracemalloc for its
+peak memory (high-water mark, KiB) and its allocation count: the memory
+blocks the run allocated that are still held when it returns, its result
+included. --json writes the results for later runs to --compare against.
+Usage:
+
+    python benchmarks/bench_pipeline.py [--runs 20] [--teams 50 500 5000] [--stages mid-round final]
+        [--fixtures DIR] [--json out.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "api"))
+
+# Reads must never go upstream; server.py builds a Supabase client at import
+os.environ["SCORE_INGEST_MODE"] = "external"
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_ANON_KEY", "benchmark")
+
+from starlette.requests import Request  # noqa: E402
+
+import espn_client  # noqa: E402
+import espn_fixtures  # noqa: E402
+import json_responses  # noqa: E402
+import scoring  # noqa: E402
+import server  # noqa: E402
+from sqlite_storage import SQLiteStorage  # noqa: E402
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+TEAM_COUNTS = (50, 500, 5000)
+CURRENT_SLOT = 4
+PICKS = 5
+
+
+def make_request(headers=()):
+    async def receive():
+        return {"type": "http.request", "body": b""}
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"",
+                    "headers": [(k.lower().encode(), v.encode()) for k, v in headers]}, receive)
+
+
+async def parse_field(body: bytes, event_id: str):
+    espn_fixtures.serve(body)
+    return await espn_client.espn_get_field(event_id, "2026-04-09T04:00Z")
+
+
+async def seed(db, stage_golfers, completed_golfers, teams):
+    """Four tournaments with ``teams`` teams each; slot 4 is the one at the stage under test."""
+    now = datetime.now(timezone.utc).isoformat()
+    for slot in range(1, CURRENT_SLOT + 1):
+        tid = f"bench-t{slot}"
+        current = slot == CURRENT_SLOT
+        golfers, stage = stage_golfers if current else completed_golfers[slot - 1]
+        event_id = espn_fixtures.EVENT_ID if current else f"40158020{slot}"
+        await db.tournaments.insert_one({
+            "id": tid, "slot": slot, "name": f"Tournament {slot}", "espn_event_id": event_id,
+            "espn_query": {"event": event_id}, "odds_sport_key": "", "start_date": "2026-04-09T04:00Z",
+            "end_date": "2026-04-12T04:00Z", "deadline": "2026-04-09T04:00Z",
+            "golfers": [{"espn_id": g.espn_id, "name": g.name, "short_name": g.short_name,
+                         "world_ranking": i + 1, "odds": None, "price": 100000} for i, g in enumerate(golfers)],
+            "status": "completed" if stage == "final" else "prices_set", "created_at": now})
+        await db.score_cache.insert_one({"tournament_id": tid, "scores": scoring.build_score_rows(golfers),
+                                         "last_updated": now})
+        rows = []
+        for k in range(teams):
+            user = k // 3
+            picks = [golfers[(k * 7 + j * 31) % len(golfers)] for j in range(PICKS)]
+            rows.append({"id": f"{tid}-team{k}", "user_id": f"user{user}", "user_name": f"Manager {user}",
+                         "user_email": f"manager{user}@example.com", "tournament_id": tid, "team_number": k % 3 + 1,
+                         "golfers": [{"espn_id": g.espn_id, "name": g.name, "price": 100000} for g in picks],
+                         "total_cost": PICKS * 100000, "paid": k % 2 == 0, "admin_modified": False,
+                         "created_at": now, "updated_at": now})
+        await db.teams.insert_many(rows)
+
+
+def reset_leaderboard(tid):
+    server.leaderboard_snapshots.discard(tid)
+    server.frozen_results.discard(tid)
+    scoring._score_indexes.pop(tid, None)
+
+
+def reset_cup_race():
+    server.cup_race_snapshots.discard("cup-race")
+    server.completed_cup_slots.clear()
+    scoring._score_indexes.clear()
+
+
+async def measure(fn, runs, setup=None):
+    """Time ``runs`` calls, then trace one more for its peak memory and allocated blocks."""
+    times = []
+    for _ in range(runs):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        await fn()
+        times.append(time.perf_counter() - start)
+    if setup:
+        setup()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    start_size = tracemalloc.get_traced_memory()[0]
+    result = await fn()
+    peak = tracemalloc.get_traced_memory()[1] - start_size
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del result
+    own = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    blocks = sum(stat.count_diff for stat in after.filter_traces(own).compare_to(before.filter_traces(own), "filename"))
+    ms = sorted(t * 1e3 for t in times)
+    return {"runs": runs, "p50_ms": round(statistics.median(ms), 3),
+            "p99_ms": round(statistics.quantiles(ms, n=100, method="inclusive")[98] if runs > 1 else ms[0], 3),
+            "ops_per_s": round(runs / sum(times), 1), "peak_kib": round(peak / 1024, 1),
+            "alloc_blocks": blocks}
+
+
+async def bench_stage(stage, doc, completed_golfers, team_counts, runs):
+    body = json.dumps(doc).encode()
+    event_id = espn_fixtures.EVENT_ID
+    golfers, raw = await parse_field(body, event_id)
+    if not golfers:
+        # Recorded fixtures carry ESPN's own event id
+        event_id = str((raw.get("events") or [{}])[0].get("id", ""))
+        golfers, raw = await parse_field(body, event_id)
+    final = "FINAL" in str((raw.get("events") or [{}])[0].get("status", {}).get("type", {}).get("name", "")).upper()
+    stage_golfers = (golfers, "final" if final else stage)
+    results = [
+        {"case": "espn_get_field", "teams": 0, **await measure(lambda: espn_client.espn_get_field(event_id, "2026-04-09T04:00Z"), runs)},
+    ]
+    scores = scoring.build_score_rows(golfers)
+
+    async def tied():
+        scoring.calc_tied_scores(scores)
+    results.append({"case": "calc_tied_scores", "teams": 0, **await measure(tied, runs)})
+
+    tid = f"bench-t{CURRENT_SLOT}"
+    for teams in team_counts:
+        server.db = server.client = SQLiteStorage(":memory:")
+        reset_cup_race()
+        reset_leaderboard(tid)
+        await seed(server.db, stage_golfers, completed_golfers, teams)
+        if teams == team_counts[0] and not final:
+            t = await server.db.tournaments.find_one({"id": tid})
+            t["espn_event_id"], t["espn_query"] = event_id, None
+            results.append({"case": "refresh_scores", "teams": 0,
+                            **await measure(lambda: server.refresh_tournament_scores(t), runs)})
+        team_rows = await server.db.teams.find({"tournament_id": tid}, {"golfers": 1}).to_list(teams)
+        index = scoring.score_index_for(tid, await server.db.score_cache.find_one({"tournament_id": tid}))
+
+        async def score_teams():
+            return [index.score_team(team["golfers"]) for team in team_rows]
+        results.append({"case": "score_teams", "teams": teams, **await measure(score_teams, runs)})
+        leaderboard = lambda headers=(): server.get_leaderboard(tid, make_request(headers))  # noqa: E731
+        results.append({"case": "leaderboard_cold", "teams": teams,
+                        **await measure(leaderboard, runs, lambda: reset_leaderboard(tid))})
+        results.append({"case": "leaderboard_warm", "teams": teams, **await measure(leaderboard, runs)})
+        response = await leaderboard()
+        etag = response.headers["etag"]
+        served = len(json.loads(response.body)["team_standings"])
+        for r in results[-2:]:
+            r["served"] = served
+        results.append({"case": "leaderboard_304", "teams": teams,
+                        **await measure(lambda: leaderboard((("If-None-Match", etag),)), runs)})
+        cup_race = lambda: server.get_cup_race(make_request())  # noqa: E731
+        results.append({"case": "cup_race_cold", "teams": teams, **await measure(cup_race, runs, reset_cup_race)})
+        results.append({"case": "cup_race_warm", "teams": teams, **await measure(cup_race, runs)})
+    return [{"fixture": stage, **r} for r in results]
+
+
+def result_key(r):
+    return r["fixture"], r["case"], r["teams"]
+
+
+def print_results(results, baseline=None):
+    base = {result_key(r): r for r in (baseline or [])}
+    header = (f"{'fixture':<15} {'case':<17} {'teams':>5} {'served':>6} {'p50 ms':>9} {'p99 ms':>9} {'ops/s':>9} "
+              f"{'peak mem KiB':>12} {'alloc blocks':>12}")
+    print(header + ("  p50 vs base  peak mem vs base  blocks vs base" if base else ""))
+    for r in results:
+        line = (f"{r['fixture']:<15} {r['case']:<17} {r['teams']:>5} {r.get('served', ''):>6} {r['p50_ms']:9.3f} "
+                f"{r['p99_ms']:9.3f} {r['ops_per_s']:9.1f} {r['peak_kib']:12.1f} {r['alloc_blocks']:12d}")
+        old = base.get(result_key(r))
+        if old:
+            line += f"  {r['p50_ms'] / old['p50_ms']:10.2f}x {r['peak_kib'] / old['peak_kib']:16.2f}x"
+            if "alloc_blocks" in old:
+                line += f" {r['alloc_blocks'] - old['alloc_blocks']:+15d}"
+        print(line)
+
+
+async def run(args):
+    fixtures = {stage: espn_fixtures.scoreboard(stage) for stage in args.stages}
+    if args.fixtures:
+        fixtures.update(espn_fixtures.load(args.fixtures))
+    completed_golfers = []
+    for slot in range(1, CURRENT_SLOT):
+        body = json.dumps(espn_fixtures.scoreboard("final", seed=slot)).encode()
+        completed_golfers.append(((await parse_field(body, espn_fixtures.EVENT_ID))[0], "final"))
+    results = []
+    for stage, doc in fixtures.items():
+        results += await bench_stage(stage, doc, completed_golfers, args.teams, args.runs)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--teams", type=int, nargs="+", default=list(TEAM_COUNTS))
+    parser.add_argument("--stages", nargs="+", default=list(espn_fixtures.STAGES), choices=espn_fixtures.STAGES)
+    parser.add_argument("--fixtures", help="directory of recorded scoreboard JSON files")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="results file from an earlier run")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    baseline = json.loads(Path(args.compare).read_text())["results"] if args.compare else None
+    print_results(results, baseline)
+    if args.json:
+        meta = {"python": platform.python_version(), "numpy": scoring.np is not None,
+                "stream_parse": espn_client.stream_parse_enabled(), "fast_json": json_responses.fast_json_enabled(), "runs": args.runs,
+                "created_at": datetime.now(timezone.utc).isoformat()}
+        Path(args.json).write_text(json.dumps({"meta": meta, "results": results}, indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compare the pure-Python and NumPy tie-group kernels on synthetic fields.
+
+Each field has 156 players, ~70 making the cut, with integer scores to par.
+Both kernels are checked for identical output before timing. Usage:
+
+    python benchmarks/bench_scoring.py [--fields 200] [--players 156] [--repeat 5]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "api"))
+
+import scoring  # noqa: E402
+
+
+def make_field(rnd, players):
+    made_cut = int(players * 0.45)
+    field = []
+    for i in range(players):
+        field.append({"espn_id": str(1000 + i), "name": f"Player {i}",
+                      "score_int": rnd.randint(-18, 12) if i < made_cut else rnd.randint(0, 20),
+                      "is_cut": i >= made_cut})
+    return field
+
+
+def median_us(fn, items, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        runs.append((time.perf_counter() - start) / len(items) * 1e6)
+    return statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fields", type=int, default=200)
+    parser.add_argument("--players", type=int, default=156)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rnd = random.Random(7)
+    fields = [make_field(rnd, args.players) for _ in range(args.fields)]
+    kernels = [("python", scoring._group_stats_py)]
+    if scoring.np is not None:
+        kernels.append(("numpy", scoring._group_stats_np))
+    else:
+        print("numpy not installed; timing the pure-Python kernel only")
+
+    reference = None
+    for name, kernel in kernels:
+        scoring._group_stats = kernel
+        results = [scoring.calc_tied_scores(field) for field in fields]
+        if reference is None:
+            reference = results
+        elif results != reference:
+            raise SystemExit(f"{name} kernel disagrees with the pure-Python kernel")
+
+    sorted_scores = [[s["score_int"] for s in scoring._active_scores(field)] for field in fields]
+    print(f"{args.fields} fields x {args.players} players, median of {args.repeat} runs, us/field")
+    print(f"  {'kernel':<7} {'groups':>9} {'speedup':>8} {'calc_tied_scores':>17} {'speedup':>8}")
+    baseline = None
+    for name, kernel in kernels:
+        scoring._group_stats = kernel
+        groups_us = median_us(kernel, sorted_scores, args.repeat)
+        full_us = median_us(scoring.calc_tied_scores, fields, args.repeat)
+        baseline = baseline or (groups_us, full_us)
+        print(f"  {name:<7} {groups_us:9.1f} {baseline[0] / groups_us:7.2f}x {full_us:17.1f} {baseline[1] / full_us:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
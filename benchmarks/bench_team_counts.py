@@ -0,0 +1,100 @@
+"""Compare per-tournament count_documents with one grouped count query.
+
+Runs SupabaseMongoCompat against an in-process PostgREST stand-in that adds a
+fixed per-request latency, so the numbers reflect round trips rather than
+Postgres. Usage:
+
+    python benchmarks/bench_team_counts.py [--latency-ms 40] [--teams 200]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "api"))
+os.environ.setdefault("SUPABASE_URL", "http://postgrest.local")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench")
+
+from supabase_mongo_compat import SupabaseMongoCompat  # noqa: E402
+
+
+def make_transport(teams, latency):
+    stats = {"requests": 0, "bytes": 0}
+
+    async def handler(request: httpx.Request):
+        stats["requests"] += 1
+        await asyncio.sleep(latency)
+        params = request.url.params
+        rows = teams
+        flt = params.get("tournament_id", "")
+        if flt.startswith("eq."):
+            rows = [r for r in rows if r["tournament_id"] == flt[3:]]
+        elif flt.startswith("in.("):
+            wanted = {v.strip('"') for v in flt[4:-1].split(",")}
+            rows = [r for r in rows if r["tournament_id"] in wanted]
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", len(rows)))
+        page = rows[offset:offset + limit]
+        select = params.get("select", "*")
+        if select != "*":
+            cols = select.split(",")
+            page = [{c: r[c] for c in cols} for r in page]
+        body = json.dumps(page).encode()
+        stats["bytes"] += len(body)
+        return httpx.Response(200, content=body, headers={"content-range": f"0-{len(page)}/{len(rows)}"})
+
+    return httpx.MockTransport(handler), stats
+
+
+async def n_plus_one(db, tournament_ids):
+    return {tid: await db.teams.count_documents({"tournament_id": tid}) for tid in tournament_ids}
+
+
+async def grouped(db, tournament_ids):
+    return await db.teams.count_documents_grouped("tournament_id", {"tournament_id": {"$in": tournament_ids}})
+
+
+async def run(args):
+    tournament_ids = [f"t{slot}" for slot in range(1, args.slots + 1)]
+    teams = [{"id": f"{tid}-{i}", "tournament_id": tid, "user_id": f"u{i}"}
+             for tid in tournament_ids for i in range(args.teams)]
+    results = {}
+    for name, fn in (("count_documents_per_tournament", n_plus_one), ("count_documents_grouped", grouped)):
+        transport, stats = make_transport(teams, args.latency_ms / 1000)
+        db = SupabaseMongoCompat(cache_ttls={})
+        db.http_client = httpx.AsyncClient(transport=transport)
+        timings = []
+        counts = None
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            counts = await fn(db, tournament_ids)
+            timings.append((time.perf_counter() - start) * 1000)
+        await db.close()
+        results[name] = {
+            "p50_ms": round(statistics.median(timings), 2),
+            "max_ms": round(max(timings), 2),
+            "requests_per_call": stats["requests"] / args.iterations,
+            "bytes_per_call": stats["bytes"] // args.iterations,
+            "counts": {str(k): v for k, v in sorted(counts.items())},
+        }
+    assert results["count_documents_per_tournament"]["counts"] == results["count_documents_grouped"]["counts"]
+    print(json.dumps(results, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=4)
+    parser.add_argument("--teams", type=int, default=200, help="teams per tournament")
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="simulated PostgREST round trip")
+    parser.add_argument("--iterations", type=int, default=10)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""ESPN scoreboard fixtures for the benchmarks.
+
+scoreboard(stage) builds a deterministic synthetic response shaped like
+ESPN's golf scoreboard at one point of a tournament:
+
+  pre-tournament  field posted, no rounds played
+  mid-round       round 2 under way, golfers at different holes
+  post-cut        round 3 under way, missed-cut golfers stuck at two rounds
+  wd              round 2 under way, a few withdrawals with placeholder rounds
+  final           four rounds complete, event STATUS_FINAL
+
+Real responses can be recorded and replayed instead:
+
+    python benchmarks/espn_fixtures.py record --event-id 401580351 --out benchmarks/fixtures/post-cut.json
+
+load(directory) returns every recorded ``*.json`` keyed by file stem, so a
+recording named after a stage replaces the synthetic one.
+"""
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "api"))
+
+EVENT_ID = "401580351"
+STAGES = ("pre-tournament", "mid-round", "post-cut", "wd", "final")
+MADE_CUT = 70
+
+
+def _round(rnd, period, holes):
+    return {
+        "period": period, "value": float(rnd.randint(64, 80)) if holes else 0.0,
+        "displayValue": f"{rnd.randint(-6, 6):+d}" if holes else "-",
+        "linescores": [{"period": h, "value": float(rnd.choice((3, 4, 4, 4, 5))), "displayValue": "4",
+                        "scoreType": {"displayValue": "E"}} for h in range(1, holes + 1)],
+        "statistics": {"categories": []},
+    }
+
+
+def _placeholder(period):
+    return {"period": period, "value": 0.0, "displayValue": "-"}
+
+
+def competitor(rnd, i, stage):
+    status, short, score = "STATUS_IN_PROGRESS", "Thru 9", "E" if i % 13 == 0 else f"{rnd.randint(-15, 10):+d}"
+    if stage == "pre-tournament":
+        linescores, status, short, score = [], "STATUS_SCHEDULED", "Thu 8:00 AM", "E"
+    elif stage in ("mid-round", "wd"):
+        linescores = [_round(rnd, 1, 18), _round(rnd, 2, rnd.randint(0, 18))]
+        if stage == "wd" and i % 39 == 5:
+            linescores = [_round(rnd, 1, 18), _placeholder(2), _placeholder(3), _placeholder(4)]
+            status, short, score = "STATUS_WITHDRAWN", "WD", "WD"
+    else:
+        rounds = 4 if stage == "final" else 3
+        if i >= MADE_CUT:
+            linescores = [_round(rnd, 1, 18), _round(rnd, 2, 18)]
+            status, short = "STATUS_CUT", "CUT"
+        else:
+            linescores = [_round(rnd, r, 18) for r in range(1, rounds)]
+            linescores.append(_round(rnd, rounds, 18 if stage == "final" else rnd.randint(0, 18)))
+            if stage == "final":
+                status, short = "STATUS_FINISH", "F"
+    return {
+        "id": str(9000 + i), "uid": f"s:1100~a:{1000 + i}", "type": "athlete", "order": i + 1, "score": score,
+        "athlete": {"id": str(1000 + i), "fullName": f"Player {i} Name", "displayName": f"Player {i} Name",
+                    "shortName": f"P. Name{i}", "flag": {"href": "https://a.espncdn.com/i/teamlogos/countries/500/usa.png",
+                                                        "alt": "United States"}},
+        "status": {"type": {"name": status, "description": short, "shortDetail": short}},
+        "linescores": linescores,
+        "statistics": [{"name": "scoreToPar", "displayValue": "-4", "value": -4.0}] * 4,
+    }
+
+
+def event(stage: str, event_id: str = EVENT_ID, field: int = 156, seed: int = 0) -> Dict[str, Any]:
+    rnd = random.Random(f"{stage}:{event_id}:{seed}")
+    final = stage == "final"
+    return {
+        "id": event_id, "uid": f"s:1100~e:{event_id}", "date": "2026-04-09T04:00Z", "endDate": "2026-04-12T04:00Z",
+        "name": f"Event {event_id}", "shortName": f"E{event_id}",
+        "status": {"type": {"name": "STATUS_FINAL" if final else "STATUS_IN_PROGRESS", "state": "post" if final else "in"}},
+        "competitions": [{"id": event_id, "competitors": [competitor(rnd, i, stage) for i in range(field)]}],
+    }
+
+
+def scoreboard(stage: str, event_id: str = EVENT_ID, field: int = 156, seed: int = 0) -> Dict[str, Any]:
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage {stage}; expected one of {STAGES}")
+    return {"events": [event(stage, event_id, field, seed)]}
+
+
+def season(event_id: str = EVENT_ID, events: int = 12) -> Dict[str, Any]:
+    """A season-wide (``dates=YYYY``) response with the target event last."""
+    others = [event("final", str(401580300 + i), 144) for i in range(events - 1)]
+    return {"events": others + [event("post-cut", event_id)]}
+
+
+def serve(body: bytes, chunk_size: int = 16 * 1024):
+    """Point espn_client at an in-process transport that returns ``body`` for
+    every request, streamed in network-sized chunks."""
+    import httpx
+    import espn_client
+
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    def handler(request):
+        return httpx.Response(200, content=chunks(), headers={"content-type": "application/json"})
+
+    espn_client.upstream.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def load(directory) -> Dict[str, Dict[str, Any]]:
+    return {path.stem: json.loads(path.read_text()) for path in sorted(Path(directory).glob("*.json"))}
+
+
+def record(event_id: str, out: str, dates: str = ""):
+    import httpx
+    from espn_client import ESPN_BASE
+
+    params = {"dates": dates} if dates else {"event": event_id}
+    response = httpx.get(f"{ESPN_BASE}/scoreboard", params=params, timeout=30)
+    response.raise_for_status()
+    Path(out).parent.mkdir(parents=True, exist_ok=True)
+    Path(out).write_bytes(response.content)
+    print(f"saved {len(response.content)} bytes to {out}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="save a live ESPN scoreboard response")
+    rec.add_argument("--event-id", required=True)
+    rec.add_argument("--dates", default="", help="query by date (YYYYMMDD or YYYY) instead of event id")
+    rec.add_argument("--out", required=True)
+    args = parser.parse_args()
+    record(args.event_id, args.out, args.dates)
+
+
+if __name__ == "__main__":
+    main()
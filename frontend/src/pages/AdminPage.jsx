@@ -733,6 +733,7 @@ export default function AdminPage() {
                         <div className="flex items-center gap-1.5 shrink-0">
                           {m.confidence === 'high' && <Badge className="bg-emerald-100 text-emerald-700 text-[10px] px-1.5">exact</Badge>}
                           {m.confidence === 'medium' && <Badge className="bg-amber-100 text-amber-700 text-[10px] px-1.5">⚠ review</Badge>}
+                          {m.confidence === 'low' && <Badge className="bg-orange-100 text-orange-700 text-[10px] px-1.5">⚠ guess</Badge>}
                           {m.confidence === 'manual' && <Badge className="bg-blue-100 text-blue-700 text-[10px] px-1.5">manual</Badge>}
                           <button onClick={() => unmatchPair(m)} className="text-slate-300 hover:text-red-400 transition-colors" title="Unmatch">
                             <X className="w-3.5 h-3.5" />
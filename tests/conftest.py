@@ -0,0 +1,94 @@
+"""Shared fixtures. The api modules are imported the way api/index.py imports
+them, with server.py on SQLite and its ingest mode set so that no test
+reaches ESPN."""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+API_DIR = Path(__file__).resolve().parent.parent / "api"
+sys.path.insert(0, str(API_DIR))
+os.environ["STORAGE_BACKEND"] = "sqlite"
+os.environ["STORAGE_SQLITE_PATH"] = ":memory:"
+os.environ["SCORE_INGEST_MODE"] = "external"
+
+from starlette.requests import Request  # noqa: E402
+
+import scoring  # noqa: E402
+import server as server_module  # noqa: E402
+from live_stream import LeaderboardBroadcaster  # noqa: E402
+from records import ParsedGolfer  # noqa: E402
+from singleflight import SingleFlight  # noqa: E402
+from snapshots import SnapshotStore  # noqa: E402
+from sqlite_storage import SQLiteStorage  # noqa: E402
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """server.py on a fresh in-memory database, with empty snapshot and stream state."""
+    monkeypatch.setenv("SCORE_INGEST_MODE", "external")
+    db = SQLiteStorage(":memory:")
+    monkeypatch.setattr(server_module, "db", db)
+    monkeypatch.setattr(server_module, "client", db)
+    monkeypatch.setattr(server_module, "leaderboard_snapshots", SnapshotStore())
+    monkeypatch.setattr(server_module, "cup_race_snapshots", SnapshotStore(max_entries=1))
+    monkeypatch.setattr(server_module, "frozen_results", SnapshotStore(max_entries=16))
+    monkeypatch.setattr(server_module, "completed_cup_slots", {})
+    monkeypatch.setattr(server_module, "leaderboard_stream", LeaderboardBroadcaster())
+    monkeypatch.setattr(server_module, "stream_refreshes", SingleFlight())
+    monkeypatch.setattr(server_module, "stream_published_keys", {})
+    monkeypatch.setattr(server_module, "snapshot_builds", SingleFlight())
+    monkeypatch.setattr(server_module, "score_refreshes", SingleFlight())
+    monkeypatch.setattr(scoring, "_score_indexes", {})
+
+    async def no_espn(t):
+        raise AssertionError("tests never fetch from ESPN")
+    monkeypatch.setattr(server_module, "espn_field_for", no_espn)
+
+    async def admin_only(user_id):
+        return {"id": user_id, "is_admin": True}
+    monkeypatch.setattr(server_module, "check_admin", admin_only)
+    yield server_module
+    db.conn.close()
+
+
+def make_request(headers=()):
+    async def receive():
+        return {"type": "http.request", "body": b""}
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"",
+                    "headers": [(k.lower().encode(), v.encode()) for k, v in headers]}, receive)
+
+
+def field(scores):
+    """Parsed golfers "1".."n" with the given total scores, in leaderboard order."""
+    golfers = []
+    for i, score in enumerate(scores, start=1):
+        golfers.append(ParsedGolfer(
+            espn_id=str(i), name=f"Golfer {i}", short_name=f"G. {i}", order=i,
+            score="E" if score == 0 else f"{score:+d}", score_int=score,
+            rounds=[{"round": 1, "score": str(70 + score), "to_par": score}], is_cut=False, is_wd=False,
+            has_placeholder_rounds=False, status="STATUS_IN_PROGRESS", thru="F", is_active=False))
+    return golfers
+
+
+async def seed_tournament(db, tournament_id, slot, scores, teams, status="prices_set",
+                          last_updated="2026-04-10T12:00:00+00:00", name=None):
+    """A tournament with a score_cache for ``scores`` and one team per (user_id, golfer ids) in ``teams``."""
+    golfers = field(scores)
+    await db.tournaments.insert_one({
+        "id": tournament_id, "slot": slot, "name": name or f"Tournament {slot}", "status": status,
+        "espn_event_id": f"40158{slot}", "start_date": "2026-04-09T04:00Z", "end_date": "2026-04-12T04:00Z",
+        "deadline": "2026-04-09T04:00Z",
+        "golfers": [{"espn_id": g.espn_id, "name": g.name, "price": 100000} for g in golfers]})
+    await db.score_cache.insert_one({"tournament_id": tournament_id, "scores": scoring.build_score_rows(golfers),
+                                     "last_updated": last_updated})
+    by_id = {g.espn_id: g for g in golfers}
+    rows = []
+    for k, (user_id, picks) in enumerate(teams):
+        rows.append({"id": f"{tournament_id}-team{k}", "user_id": user_id, "user_name": f"Manager {user_id}",
+                     "user_email": f"{user_id}@example.com", "tournament_id": tournament_id, "team_number": 1,
+                     "golfers": [{"espn_id": i, "name": by_id[i].name, "price": 100000} for i in picks],
+                     "total_cost": 100000 * len(picks), "created_at": last_updated, "updated_at": last_updated})
+    if rows:
+        await db.teams.insert_many(rows)
@@ -0,0 +1,65 @@
+import asyncio
+import json
+import subprocess
+import sys
+
+from conftest import API_DIR, make_request, seed_tournament
+from live_stream import RETRY
+from sqlite_storage import SQLiteStorage
+
+# What a `python api/score_ingest.py` worker does to score_cache, minus ESPN
+EXTERNAL_INGEST = """
+import asyncio, sys
+from sqlite_storage import SQLiteStorage
+
+async def main():
+    db = SQLiteStorage(sys.argv[1])
+    cache = await db.score_cache.find_one({"tournament_id": "t1"})
+    scores = cache["scores"]
+    scores[2] = {**scores[2], "total_score": "-6", "score_int": -6}
+    await db.score_cache.update_one({"tournament_id": "t1"}, {"$set": {
+        "scores": scores, "last_updated": "2026-04-10T12:05:00+00:00"}})
+    await db.close()
+
+asyncio.run(main())
+"""
+
+
+def event(frame):
+    lines = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+    return lines["event"], json.loads(lines["data"])
+
+
+def test_stream_publishes_scores_written_by_an_external_ingestor(server, monkeypatch, tmp_path):
+    db_path = str(tmp_path / "steelsons.db")
+    db = SQLiteStorage(db_path)
+    monkeypatch.setattr(server, "db", db)
+    monkeypatch.setattr(server, "client", db)
+    monkeypatch.setattr(server, "STREAM_HEARTBEAT_SECONDS", 0.05)
+
+    async def run():
+        await seed_tournament(db, "t1", 1, [-5, -3, -1, 0, 2], [("u1", ["1", "3"]), ("u2", ["2", "4"])])
+        response = await server.stream_leaderboard("t1", make_request())
+        frames = response.body_iterator
+        try:
+            assert await frames.__anext__() == RETRY
+            kind, snapshot = event(await frames.__anext__())
+            assert kind == "snapshot"
+            assert [ts["user_name"] for ts in snapshot["team_standings"]] == ["Manager u1", "Manager u2"]
+
+            subprocess.run([sys.executable, "-c", EXTERNAL_INGEST, db_path], cwd=API_DIR, check=True)
+
+            for _ in range(100):
+                frame = await asyncio.wait_for(frames.__anext__(), timeout=5)
+                if not frame.startswith(b":"):
+                    break
+            kind, delta = event(frame)
+            assert kind == "delta"
+            assert delta["last_updated"] == "2026-04-10T12:05:00+00:00"
+            assert [(g["espn_id"], g["total_score"]) for g in delta["golfers"]] == [("3", "-6")]
+            assert [ts["user_name"] for ts in delta["teams"]][:1] == ["Manager u1"]
+        finally:
+            await frames.aclose()
+            await db.close()
+
+    asyncio.run(run())
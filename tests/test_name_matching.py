@@ -0,0 +1,72 @@
+import pytest
+
+from name_matching import NameMatcher, name_key, normalize_name
+
+FIELD = ["Ludvig Åberg", "Nicolai Højgaard", "Jordan Spieth", "Jordan Smith", "Justin Thomas",
+         "Min Woo Lee", "Sung Jae Kim", "Min Woo Park", "Min Woo Kim", "Matt Fitzpatrick"]
+
+
+@pytest.mark.parametrize("name, fuzzy, expected, confidence", [
+    # Accents, case, punctuation and spacing don't matter
+    ("Ludvig Aberg", False, "Ludvig Åberg", "high"),
+    ("ludvig åberg", False, "Ludvig Åberg", "high"),
+    ("Nicolai Hojgaard", False, "Nicolai Højgaard", "high"),
+    ("NICOLAI HØJGAARD", False, "Nicolai Højgaard", "high"),
+    ("Matt Fitz-patrick", False, "Matt Fitzpatrick", "high"),
+    ("MinWoo Lee", False, "Min Woo Lee", "high"),
+    # First initial and last name
+    ("J. Smith", False, "Jordan Smith", "medium"),
+    ("J Spieth", False, "Jordan Spieth", "medium"),
+    ("M. Fitzpatrick", False, "Matt Fitzpatrick", "medium"),
+    # Last names of three letters or fewer are too common for the initial rule
+    ("M. Lee", False, None, None),
+    ("T. Smith", False, None, None),
+    # Fuzzy token overlap: 2 shared of 3 and 3 tokens scores 0.67
+    ("Min Woo Lee Jr", True, "Min Woo Lee", "low"),
+    ("Sung Jae Im", True, "Sung Jae Kim", "low"),
+    ("Sung Jae Im", False, None, None),
+    # Tied best overlap (Min Woo Lee, Park and Kim all score 0.67): no match
+    ("Min Woo Choi", True, None, None),
+    # Near miss: 2 shared of 4 and 3 tokens scores 0.57, under the 0.6 threshold
+    ("Sung Jae Im Jr", True, None, None),
+    ("", True, None, None),
+])
+def test_match(name, fuzzy, expected, confidence):
+    matcher = NameMatcher(FIELD, name=lambda n: n, fuzzy=fuzzy)
+    assert matcher.match(name) == (expected, confidence)
+
+
+@pytest.mark.parametrize("name, exclude, expected", [
+    ("Jordan Smith", {"Jordan Smith"}, None),
+    ("J. Smith", {"Jordan Smith"}, None),
+    ("Min Woo Choi", {"Min Woo Lee", "Min Woo Kim"}, "Min Woo Park"),
+])
+def test_match_skips_excluded_candidates(name, exclude, expected):
+    matcher = NameMatcher(FIELD, name=lambda n: n, fuzzy=True)
+    assert matcher.match(name, exclude=exclude)[0] == expected
+
+
+def test_earlier_candidate_wins_within_a_bucket():
+    matcher = NameMatcher([{"id": 1, "name": "Jordan Smith"}, {"id": 2, "name": "Justin Smith"}], key=lambda c: c["id"])
+    assert matcher.match("J. Smith") == ({"id": 1, "name": "Jordan Smith"}, "medium")
+    assert matcher.match("J. Smith", exclude={1}) == ({"id": 2, "name": "Justin Smith"}, "medium")
+
+
+def test_fuzzy_argument_overrides_the_matcher_setting():
+    matcher = NameMatcher(FIELD, name=lambda n: n)
+    assert matcher.match("Sung Jae Im") == (None, None)
+    assert matcher.match("Sung Jae Im", fuzzy=True) == ("Sung Jae Kim", "low")
+
+
+@pytest.mark.parametrize("name, normalized, key", [
+    ("  Ludvig   Åberg ", "ludvig aberg", "ludvigaberg"),
+    ("Byeong-Hun An", "byeonghun an", "byeonghunan"),
+    ("Matt O'Meara", "matt omeara", "mattomeara"),
+    ("Thorbjørn Olesen", "thorbjorn olesen", "thorbjornolesen"),
+    ("Rasmus Højgaard", "rasmus hojgaard", "rasmushojgaard"),
+    ("J.T. Poston", "jt poston", "jtposton"),
+    (None, "", ""),
+])
+def test_normalize_name_and_name_key(name, normalized, key):
+    assert normalize_name(name) == normalized
+    assert name_key(name) == key
@@ -0,0 +1,198 @@
+import asyncio
+import json
+
+import pytest
+
+from conftest import make_request, seed_tournament
+
+SCORES = [-10, -8, -6, -4, -2, 0, 1, 2, 3, 4]
+TEAMS = [("u1", ["1", "2", "3", "4", "5"]), ("u2", ["2", "3", "4", "5", "6"]),
+         ("u3", ["3", "4", "5", "6", "7"]), ("u4", ["5", "7", "8", "9", "10"])]
+
+
+async def seed_completed(server):
+    await seed_tournament(server.db, "t1", 1, SCORES, TEAMS, status="completed", name="Valspar Championship")
+
+
+async def leaderboard(server):
+    response = await server.get_leaderboard("t1", make_request())
+    return response, json.loads(response.body)
+
+
+async def archived(server):
+    return await server.db.results_archive.find_one({"tournament_id": "t1"}, {"_id": 0})
+
+
+def test_completed_leaderboard_is_frozen_and_served_from_the_archive(server):
+    async def run():
+        await seed_completed(server)
+        response, payload = await leaderboard(server)
+        row = await archived(server)
+        assert row["tournament_name"] == "Valspar Championship"
+        assert row["year"] == 2026
+        assert row["winners"] == ["Manager u1", "Manager u2", "Manager u3"]
+        assert row["leaderboard"] == payload
+
+        frozen = await server.load_frozen_results("t1")
+        assert frozen.key == row["finalized_at"]
+        assert json.loads(frozen.body) == payload
+
+        # Later reads come from the frozen document, even with score_cache gone
+        await server.db.score_cache.delete_many({"tournament_id": "t1"})
+        again, again_payload = await leaderboard(server)
+        assert again_payload == payload
+        assert again.headers["cache-control"] == server.FINAL_CACHE_CONTROL
+        assert again.headers["etag"] != response.headers["etag"]
+    asyncio.run(run())
+
+
+def test_freeze_results_keeps_an_existing_document(server):
+    async def run():
+        await seed_completed(server)
+        await server.freeze_results("t1")
+        first = await archived(server)
+        await server.freeze_results("t1")
+        assert await archived(server) == first
+    asyncio.run(run())
+
+
+def test_freeze_results_skips_unfinished_tournaments(server):
+    async def run():
+        await seed_tournament(server.db, "t1", 1, SCORES, TEAMS)
+        await server.freeze_results("t1")
+        assert await archived(server) is None
+        assert await server.load_frozen_results("t1") is None
+    asyncio.run(run())
+
+
+async def rename_tournament(server):
+    await server.admin_update_tournament(1, server.TournamentSetup(name="The Players"), user_id="admin")
+
+
+async def swap_team_golfers(server):
+    team = await server.db.teams.find_one({"id": "t1-team0"}, {"golfers": 1})
+    golfers = [{**g, "espn_id": str(int(g["espn_id"]) + 5), "name": f"Golfer {int(g['espn_id']) + 5}"}
+               for g in team["golfers"]]
+    await server.admin_update_team("t1-team0", server.AdminTeamUpdate(golfers=golfers), user_id="admin")
+
+
+async def mark_paid(server):
+    await server.admin_set_team_paid("t1-team3", user_id="admin", paid=True)
+
+
+async def delete_team(server):
+    await server.admin_delete_team("t1-team1", user_id="admin")
+
+
+@pytest.mark.parametrize("edit, check", [
+    (rename_tournament, lambda row: row["tournament_name"] == "The Players"
+        and row["leaderboard"]["tournament"]["name"] == "The Players"),
+    (swap_team_golfers, lambda row: row["winners"] == ["Manager u2", "Manager u3", "Manager u4"]),
+    (mark_paid, lambda row: [ts["paid"] for ts in row["leaderboard"]["team_standings"]
+                             if ts["user_name"] == "Manager u4"] == [True]),
+    (delete_team, lambda row: row["winners"] == ["Manager u1", "Manager u3", "Manager u4"]),
+])
+def test_admin_edits_unfreeze_and_the_next_read_refreezes(server, edit, check):
+    async def run():
+        await seed_completed(server)
+        await leaderboard(server)
+        before = await archived(server)
+
+        await edit(server)
+        assert await archived(server) is None
+        assert await server.load_frozen_results("t1") is None
+
+        _, payload = await leaderboard(server)
+        after = await archived(server)
+        assert after["finalized_at"] != before["finalized_at"]
+        assert after["leaderboard"] == payload
+        assert check(after)
+        assert json.loads((await server.load_frozen_results("t1")).body) == payload
+    asyncio.run(run())
+
+
+async def cup_race(server):
+    return json.loads((await server.get_cup_race(make_request())).body)["standings"]
+
+
+async def rename_manager(server):
+    await server.update_profile("u4", server.UserUpdate(name="Renamed u4"))
+
+
+async def save_team_without_deadline(server):
+    await server.db.tournaments.update_one({"id": "t1"}, {"$set": {"deadline": ""}})
+    await server.save_team(server.TeamCreate(user_id="u5", tournament_id="t1", team_number=1, golfers=[
+        {"espn_id": str(i), "name": f"Golfer {i}", "price": 100000} for i in range(1, 6)]))
+
+
+async def delete_own_team(server):
+    await server.db.tournaments.update_one({"id": "t1"}, {"$set": {"deadline": "not a date"}})
+    await server.delete_team("t1-team3", user_id="u4")
+
+
+@pytest.mark.parametrize("edit, check", [
+    (rename_manager, lambda names: "Renamed u4" in names and "Manager u4" not in names),
+    (save_team_without_deadline, lambda names: "Manager u5" in names),
+    (delete_own_team, lambda names: "Manager u4" not in names),
+])
+def test_manager_writes_unfreeze_completed_results_and_cup_race_slots(server, edit, check):
+    async def run():
+        await seed_completed(server)
+        for user_id in ("u1", "u2", "u3", "u4", "u5"):
+            await server.db.users.insert_one({"id": user_id, "name": f"Manager {user_id}",
+                                              "email": f"{user_id}@example.com", "is_admin": False})
+        await leaderboard(server)
+        await cup_race(server)
+        assert await archived(server) is not None
+
+        await edit(server)
+        assert await archived(server) is None
+        assert check([row["user_name"] for row in await cup_race(server)])
+    asyncio.run(run())
+
+
+def test_profile_rename_refreezes_results_with_the_new_name(server):
+    async def run():
+        await seed_completed(server)
+        await server.db.users.insert_one({"id": "u1", "name": "Manager u1", "email": "u1@example.com"})
+        await leaderboard(server)
+
+        await server.update_profile("u1", server.UserUpdate(name="Renamed u1"))
+        assert await server.load_frozen_results("t1") is None
+        _, payload = await leaderboard(server)
+        assert payload["team_standings"][0]["user_name"] == "Renamed u1"
+        row = await archived(server)
+        assert row["winners"] == ["Renamed u1", "Manager u2", "Manager u3"]
+        assert json.loads((await server.load_frozen_results("t1")).body) == payload
+    asyncio.run(run())
+
+
+def test_history_backfills_finalized_tournaments(server):
+    async def run():
+        await seed_completed(server)
+        await leaderboard(server)
+        # Already listed in HISTORY: not repeated
+        await server.db.results_archive.insert_one({
+            "tournament_id": "t0", "tournament_name": "Masters", "year": 2026, "finalized_at": "2026-04-13",
+            "winners": ["A", "B", "C"], "leaderboard": {}})
+        await server.db.results_archive.insert_one({
+            "tournament_id": "t9", "tournament_name": "Masters", "year": 2027, "finalized_at": "2027-04-12",
+            "winners": ["D", "E", "F"], "leaderboard": {}})
+        history = await server.get_history()
+        assert [year["year"] for year in history][:3] == [2027, 2026, 2025]
+        assert history[0]["tournaments"] == [{"name": "Masters", "winners": ["D", "E", "F"]}]
+        assert history[1]["tournaments"][0] == {"name": "Valspar Championship",
+                                                "winners": ["Manager u1", "Manager u2", "Manager u3"]}
+        assert [t["name"] for t in history[1]["tournaments"]].count("Masters") == 1
+        assert history[1]["tournaments"][1:] == server.HISTORY[0]["tournaments"]
+    asyncio.run(run())
+
+
+def test_history_with_results_orders_new_tournaments_newest_first(server):
+    history = server.history_with_results([
+        {"tournament_name": "PGA Championship", "year": 2030, "finalized_at": "2030-05-20", "winners": ["B"]},
+        {"tournament_name": "Masters", "year": 2030, "finalized_at": "2030-04-13", "winners": ["A"]},
+        {"tournament_name": "U.S. Open", "year": 2030, "finalized_at": "2030-06-16", "winners": []},
+    ])
+    assert history[0] == {"year": 2030, "tournaments": [{"name": "PGA Championship", "winners": ["B"]},
+                                                       {"name": "Masters", "winners": ["A"]}]}
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+import scoring
+from scoring import ScoreIndex, calc_tied_scores
+
+
+def field(scores, cut=()):
+    return [{"espn_id": str(i), "name": f"Golfer {i}", "score_int": score, "is_cut": i in cut}
+            for i, score in enumerate(scores)]
+
+
+def moved(rows, rng, count):
+    rows = [dict(row) for row in rows]
+    for row in rng.sample(rows, count):
+        if row["score_int"] is not None:
+            row["score_int"] += rng.choice((-2, -1, 1, 2))
+    return rows
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_incremental_index_matches_full_recompute(seed):
+    rng = random.Random(seed)
+    rows = field([rng.randint(-8, 6) for _ in range(150)], cut=set(rng.sample(range(150), 10)))
+    index = ScoreIndex(rows)
+    for _ in range(30):
+        rows = moved(rows, rng, rng.choice((1, 2, 3, 10)))
+        index = ScoreIndex(rows, previous=index)
+        assert index.tied_map == calc_tied_scores(rows)
+
+
+@pytest.mark.parametrize("change, expected", [
+    # (golfer, new score): the kernel sees the field from the best moved score on
+    ({"6": 1}, 2),
+    ({"3": 2}, 4),
+    ({"5": -1}, 4),
+    ({}, 0),
+])
+def test_only_groups_from_the_best_moved_score_are_recomputed(monkeypatch, change, expected):
+    rows = field([-4, -3, -3, -1, 0, 1, 2])
+    previous = ScoreIndex(rows)
+    seen = []
+    kernel = scoring._group_stats
+    monkeypatch.setattr(scoring, "_group_stats", lambda scores, *args: seen.append(len(scores)) or kernel(scores, *args))
+    rows = [{**row, "score_int": change.get(row["espn_id"], row["score_int"])} for row in rows]
+    index = ScoreIndex(rows, previous=previous)
+    assert seen == [expected]
+    assert index.tied_map == calc_tied_scores(rows)
+
+
+def test_leader_change_recomputes_the_whole_field(monkeypatch):
+    rows = field([-4, -3, -3, -1])
+    previous = ScoreIndex(rows)
+    seen = []
+    kernel = scoring._group_stats
+    monkeypatch.setattr(scoring, "_group_stats", lambda scores, *args: seen.append(len(scores)) or kernel(scores, *args))
+    rows[0] = {**rows[0], "score_int": -2}
+    index = ScoreIndex(rows, previous=previous)
+    assert seen == [4]
+    assert index.tied_map == calc_tied_scores(rows)
+
+
+@pytest.mark.skipif(scoring.np is None, reason="numpy not installed")
+@pytest.mark.parametrize("first_pos", [1, 4, 60])
+def test_vectorized_group_stats_match_on_a_tail(first_pos):
+    rng = random.Random(first_pos)
+    tail = sorted(rng.randint(-3, 12) for _ in range(80))
+    assert scoring._group_stats_np(tail, -5, first_pos) == scoring._group_stats_py(tail, -5, first_pos)
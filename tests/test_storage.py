@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import httpx
+
+from sqlite_storage import SQLiteStorage
+from supabase_mongo_compat import SupabaseMongoCompat
+
+TEAM = {"user_id": "u1", "user_name": "Manager u1", "user_email": "u1@example.com", "tournament_id": "t1",
+        "team_number": 1, "golfers": [{"name": "Old"}], "paid": False}
+
+
+def test_sqlite_update_many_by_id_sets_only_given_columns_of_existing_rows():
+    async def run():
+        db = SQLiteStorage(":memory:")
+        await db.teams.insert_many([{**TEAM, "id": "a"}, {**TEAM, "id": "b", "team_number": 2}])
+        await db.teams.update_one({"id": "a"}, {"$set": {"paid": True}})
+        await db.teams.delete_one({"id": "b"})
+        await db.teams.update_many_by_id([{"id": "a", "golfers": [{"name": "New"}]},
+                                          {"id": "b", "golfers": [{"name": "New"}]}])
+        rows = await db.teams.find({}, {"_id": 0, "id": 1, "golfers": 1, "paid": 1}).to_list(None)
+        assert rows == [{"id": "a", "golfers": [{"name": "New"}], "paid": True}]
+    asyncio.run(run())
+
+
+def supabase(monkeypatch, handler):
+    monkeypatch.setenv("SUPABASE_URL", "http://supabase.test")
+    monkeypatch.setenv("SUPABASE_ANON_KEY", "test")
+    monkeypatch.delenv("SUPABASE_CACHE_TTLS", raising=False)
+    db = SupabaseMongoCompat()
+    db.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return db
+
+
+def test_supabase_update_many_by_id_calls_update_rows_by_id(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append((request.method, request.url.path, json.loads(request.content)))
+        return httpx.Response(200, json=1)
+
+    async def run():
+        db = supabase(monkeypatch, handler)
+        await db.teams.update_many_by_id([{"id": "a", "golfers": []}, {"id": "b", "golfers": []}])
+    asyncio.run(run())
+    assert calls == [("POST", "/rest/v1/rpc/update_rows_by_id",
+                      {"p_table": "teams", "p_rows": [{"id": "a", "golfers": []}, {"id": "b", "golfers": []}]})]
+
+
+def test_supabase_update_many_by_id_patches_rows_without_the_function(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append((request.method, request.url.path, request.url.params.get("id"), json.loads(request.content)))
+        if request.url.path.startswith("/rest/v1/rpc/"):
+            return httpx.Response(404, json={"message": "function not found"})
+        return httpx.Response(204)
+
+    async def run():
+        db = supabase(monkeypatch, handler)
+        await db.teams.update_many_by_id([{"id": "a", "golfers": []}, {"id": "b", "golfers": []}])
+        await db.teams.update_many_by_id([{"id": "c", "golfers": []}])
+    asyncio.run(run())
+    assert calls == [
+        ("POST", "/rest/v1/rpc/update_rows_by_id", None, {"p_table": "teams", "p_rows": [{"id": "a", "golfers": []},
+                                                                                          {"id": "b", "golfers": []}]}),
+        ("PATCH", "/rest/v1/teams", "eq.a", {"golfers": []}),
+        ("PATCH", "/rest/v1/teams", "eq.b", {"golfers": []}),
+        ("PATCH", "/rest/v1/teams", "eq.c", {"golfers": []}),
+    ]
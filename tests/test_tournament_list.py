@@ -0,0 +1,30 @@
+import asyncio
+import json
+
+from conftest import make_request, seed_tournament
+
+SCORES = [-4, -2, 0, 2, 4]
+
+
+def test_tournament_list_answers_a_matching_poll_before_building_the_list(server, monkeypatch):
+    async def run():
+        await seed_tournament(server.db, "t1", 1, SCORES, [("u1", ["1", "2", "3", "4", "5"])])
+        await seed_tournament(server.db, "t2", 2, SCORES, [])
+        response = await server.get_tournaments(make_request())
+        assert [(t["id"], t["team_count"], t["golfer_count"], t["has_prices"]) for t in json.loads(response.body)] == [
+            ("t1", 1, 5, True), ("t2", 0, 5, True)]
+        etag = response.headers["etag"]
+
+        encode_json = server.encode_json
+        encoded = []
+        monkeypatch.setattr(server, "encode_json", lambda content: encoded.append(content) or encode_json(content))
+        assert (await server.get_tournaments(make_request([("If-None-Match", etag)]))).status_code == 304
+        assert encoded == []
+
+        await server.db.teams.insert_one({"id": "t2-team0", "user_id": "u1", "user_name": "Manager u1",
+                                          "tournament_id": "t2", "team_number": 1, "golfers": [],
+                                          "updated_at": "2026-04-10T13:00:00+00:00"})
+        changed = await server.get_tournaments(make_request([("If-None-Match", etag)]))
+        assert changed.status_code == 200
+        assert [t["team_count"] for t in json.loads(changed.body)] == [1, 1]
+    asyncio.run(run())